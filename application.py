@@ -22,7 +22,10 @@ from core.interfaces.llm import LLMProvider
 from modules.llm.openai_provider import OpenAIProvider
 from modules.llm.composite_provider import CompositeLLMProvider
 from modules.speech.elevenlabs_provider import ElevenLabsProvider
+from modules.speech.local_tts_provider import LocalTTSProvider
 from modules.speech.composite_tts_provider import CompositeTTSProvider
+from modules.speech.tts_cache import CachedTTSProvider, TTSCache
+from modules.speech.fillers import FillerLibrary
 
 
 class Application:
@@ -106,7 +109,9 @@ class Application:
             stt_config = self.config.speech.stt.config.get(
                 self.config.speech.stt.provider_type, {}
             )
-            stt_provider = WhisperProvider()  # For now, just using Whisper
+            stt_provider = create_speech_provider(
+                self.config.speech.stt.provider_type, stt_config
+            )
             self.registry.register_provider(SpeechToTextProvider, stt_provider)
             print(
                 f">>> Registered STT provider: {self.config.speech.stt.provider_type}"
@@ -120,32 +125,65 @@ class Application:
             print(">>> Setting up ElevenLabs TTS provider")
             elevenlabs_config = self.config.speech.tts.config.get("elevenlabs", {})
             tts_providers["elevenlabs"] = ElevenLabsProvider(elevenlabs_config)
+            # Open the pooled connection before the first reply needs it
+            self.loop.create_task(tts_providers["elevenlabs"].warmup())
             print(">>> ElevenLabs TTS provider registered")
 
             # Register F5TTS provider
             print(">>> Setting up F5TTS provider")
             f5tts_config = self.config.speech.tts.config.get("f5tts", {})
-            provider_config = {
-                "model": f5tts_config.get("model", "F5-TTS"),
-                "reference_audio_dir": f5tts_config.get(
-                    "reference_audio_dir", "reference_audio"
-                ),
-            }
+            provider_config = dict(f5tts_config)
+            provider_config.setdefault("model", "F5-TTS")
+            provider_config.setdefault("reference_audio_dir", "reference_audio")
             tts_providers["f5tts"] = F5TTSProvider(config=provider_config)
+            if provider_config.get("preload", False):
+                # Load the model in the background so the first reply is fast
+                self.loop.create_task(tts_providers["f5tts"].warmup())
             print(">>> F5TTS provider registered")
 
+            # Register the offline provider when the machine has an engine
+            if LocalTTSProvider.is_available():
+                print(">>> Setting up local TTS provider")
+                local_config = self.config.speech.tts.config.get("local", {})
+                tts_providers["local"] = LocalTTSProvider(local_config)
+                self.loop.create_task(tts_providers["local"].warmup())
+                print(">>> Local TTS provider registered")
+            else:
+                print("!!! No local TTS engine found (install espeak-ng or pyttsx3)")
+
+            # Serve repeated phrases from the audio cache
+            tts_cache = TTSCache.from_config(
+                self.config.speech.tts.config.get("cache")
+            )
+            if tts_cache:
+                tts_providers = {
+                    name: CachedTTSProvider(provider, name, tts_cache)
+                    for name, provider in tts_providers.items()
+                }
+                print(">>> TTS audio cache enabled")
+
             # Create and register the composite TTS provider
             active_provider = self.config.speech.tts.provider_type
             print(
                 f">>> Setting up composite TTS with active provider: {active_provider}"
             )
             print(f">>> Available TTS providers: {list(tts_providers.keys())}")
-            composite_tts = CompositeTTSProvider(tts_providers, active_provider)
+            composite_tts = CompositeTTSProvider(
+                tts_providers,
+                active_provider,
+                chunking=self.config.speech.tts.config.get("chunking"),
+                routing=self.config.speech.tts.config.get("routing"),
+            )
             self.registry.register_provider(TextToSpeechProvider, composite_tts)
             print(
                 f">>> Registered composite TTS provider with active provider: {active_provider}"
             )
 
+            # Acknowledgement clips; TTS controls prepare them per voice
+            self.fillers = FillerLibrary.from_config(
+                self.config.speech.tts.config.get("fillers"), composite_tts
+            )
+
             # Assistant provider
             assistant_provider = create_assistant_provider(
                 self.config.assistant.provider_type
@@ -193,3 +231,24 @@ class Application:
         except Exception as e:
             print(f"Failed to start application: {e}", file=sys.stderr)
             return 1
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Close every provider that holds threads, processes or connections"""
+        print("\n=== Shutting down providers ===")
+        try:
+            self.registry.get_provider(SpeechToTextProvider).close()
+        except KeyError:
+            pass
+        except Exception as e:
+            print(f"!!! Error closing STT provider: {e}")
+
+        try:
+            tts_provider = self.registry.get_provider(TextToSpeechProvider)
+            self.loop.run_until_complete(tts_provider.aclose())
+        except KeyError:
+            pass
+        except Exception as e:
+            print(f"!!! Error closing TTS providers: {e}")
+        print(">>> Providers closed")
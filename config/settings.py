@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 import yaml
 import os
@@ -46,10 +46,20 @@ class LLMProviderConfig:
     models: List[str]
 
 
+DEFAULT_LLM_MEMORY = {
+    "enabled": True,
+    "max_history_tokens": 2000,
+    "summary_tokens": 300,
+    "summarize": True,
+}
+
+
 @dataclass
 class LLMConfig:
     providers: Dict[str, LLMProviderConfig]
     default_system_prompt: str = "You are a conversational AI, speak in short sentences and use natural language."
+    # Multi-turn history sent with each request, kept within a token budget
+    memory: Dict[str, Any] = field(default_factory=lambda: dict(DEFAULT_LLM_MEMORY))
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LLMConfig":
@@ -63,11 +73,13 @@ class LLMConfig:
                 "default_system_prompt",
                 "You are a conversational AI, speak in short sentences and use natural language.",
             ),
+            memory=data.get("memory", dict(DEFAULT_LLM_MEMORY)),
         )
 
     def save(self) -> Dict[str, Any]:
         return {
             "default_system_prompt": self.default_system_prompt,
+            "memory": self.memory,
             "providers": {
                 name: {
                     "default_model": provider.default_model,
@@ -282,13 +294,78 @@ class AppConfig:
                     provider_type="whisper",
                     config={
                         "whisper": {
-                            "model": "base",
+                            "model": "base.en",
+                            "device": "auto",
+                            "trim_silence": False,
+                            "batch_size": 16,
+                            "cpu_optimization": {
+                                "enabled": False,
+                                "quantize_int8": True,
+                                "intra_op_threads": 0,
+                                "inter_op_threads": 0,
+                                "quantized_cache_dir": "resources/models/whisper",
+                            },
+                            "cache": {
+                                "enabled": False,
+                                "path": "resources/cache/transcriptions.sqlite3",
+                                "memory_entries": 512,
+                                "max_bytes": 50 * 1024 * 1024,
+                            },
+                            "long_form": {
+                                "enabled": False,
+                                "min_duration_seconds": 60,
+                                "chunk_seconds": 30,
+                                "overlap_seconds": 0.5,
+                                "workers": 0,
+                            },
+                            "cascade": {
+                                "enabled": False,
+                                "draft_model": "tiny.en",
+                                "avg_logprob_threshold": -0.8,
+                                "no_speech_prob_threshold": 0.6,
+                                "compression_ratio_threshold": 2.4,
+                            },
+                            "deadline": {
+                                "enabled": False,
+                                "latency_budget_ms": 800,
+                                "strategies": [
+                                    {"model": "base.en", "beam_size": 5},
+                                    {"model": "base.en", "beam_size": 1},
+                                    {
+                                        "model": "base.en",
+                                        "beam_size": 1,
+                                        "parallel": True,
+                                    },
+                                    {"model": "tiny.en", "beam_size": 1},
+                                    {
+                                        "model": "tiny.en",
+                                        "beam_size": 1,
+                                        "parallel": True,
+                                    },
+                                ],
+                            },
+                        },
+                        "faster_whisper": {
+                            "model": "base.en",
+                            "device": "auto",
+                            "trim_silence": False,
+                            "compute_type": "int8",
+                            "cpu_threads": 0,
+                            "num_workers": 1,
+                            "cache": {
+                                "enabled": False,
+                                "path": "resources/cache/transcriptions.sqlite3",
+                                "memory_entries": 512,
+                                "max_bytes": 50 * 1024 * 1024,
+                            },
                         },
                         "deepgram": {
                             "model": "nova-2",
                             "language": "en",
                             "smart_format": True,
                             "encoding": "linear16",
+                            "interim_results": True,
+                            "keepalive_interval": 8,
                         },
                     },
                 ),
@@ -298,6 +375,9 @@ class AppConfig:
                         "elevenlabs": {
                             "model_id": "eleven_turbo_v2_5",
                             "voice_id": "Crm8VULvkVs5ZBDa1Ixm",
+                            "output_format": "pcm_22050",
+                            "http2": True,
+                            "max_connections": 4,
                             "voice_settings": {
                                 "stability": 0.49,
                                 "similarity_boost": 0.49,
@@ -308,6 +388,49 @@ class AppConfig:
                         "f5tts": {
                             "model": "F5-TTS",
                             "reference_audio_dir": "reference_audio",
+                            "engine": "in_process",
+                            "preload": False,
+                            "workers": 1,
+                            "batch_size": 4,
+                        },
+                        "local": {
+                            "engine": "auto",
+                            "rate": 175,
+                            "volume": 1.0,
+                            "pitch": 50,
+                        },
+                        "cache": {
+                            "enabled": False,
+                            "directory": "resources/cache/tts",
+                            "memory_entries": 64,
+                            "memory_bytes": 32 * 1024 * 1024,
+                            "max_bytes": 500 * 1024 * 1024,
+                        },
+                        "chunking": {
+                            "max_concurrency": 3,
+                            "max_chars": 250,
+                            "min_chars": 20,
+                        },
+                        "routing": {
+                            "enabled": False,
+                            "fallback_order": ["elevenlabs", "local", "f5tts"],
+                            "hedge": True,
+                            "hedge_min_ms": 800,
+                            "hedge_default_ms": 3000,
+                            "smoothing": 0.3,
+                            "window": 50,
+                            "failure_threshold": 3,
+                            "cooldown_seconds": 30,
+                        },
+                        "fillers": {
+                            "enabled": False,
+                            "phrases": [
+                                "Mm-hm.",
+                                "Okay.",
+                                "Let me think.",
+                                "One moment.",
+                            ],
+                            "crossfade_ms": 150,
                         },
                     },
                 ),
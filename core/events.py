@@ -13,6 +13,7 @@ class EventType(Enum):
     ASSISTANT_RESPONSE_STARTED = auto()
     ASSISTANT_RESPONSE_CHUNK = auto()
     ASSISTANT_RESPONSE_FINISHED = auto()
+    SYNTHESIS_PROGRESS = auto()  # data: {"provider": str, "percent": int}
     ERROR = auto()
 
 
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Optional, BinaryIO, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional, BinaryIO, Callable
 from dataclasses import dataclass
+from core.interfaces.speech import AudioChunk
+import asyncio
+import io
+import threading
 
 
 @dataclass
@@ -32,6 +37,60 @@ class AudioInputProvider(ABC):
         """Play audio data"""
         pass
 
+    async def play_stream(self, chunks: AsyncIterator[AudioChunk]) -> None:
+        """Play audio chunks while later ones are still being produced
+
+        Chunks are received on the event loop and played in order on a
+        worker thread, so playback overlaps synthesis and the loop never
+        blocks. Cancelling stops playback after the current write.
+        """
+        loop = asyncio.get_running_loop()
+        player = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playback")
+        cancelled = threading.Event()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def receive():
+            try:
+                async for chunk in chunks:
+                    await queue.put(chunk)
+            finally:
+                await queue.put(None)
+                if hasattr(chunks, "aclose"):
+                    await chunks.aclose()  # Lets the producer cancel its work
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                await loop.run_in_executor(
+                    player, self.write_audio_chunk, chunk, cancelled
+                )
+            await receiver  # Surface synthesis errors
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        finally:
+            receiver.cancel()
+            # Runs after any write still in progress on the same thread
+            player.submit(self.finish_audio_stream)
+            player.shutdown(wait=False)
+
+    def write_audio_chunk(self, chunk: AudioChunk, cancelled: threading.Event):
+        """Play one streamed chunk, blocking until the device has taken it
+
+        Runs on the playback thread. The default plays each chunk as its own
+        WAV; providers with a raw output stream should write the PCM to it
+        and return early once ``cancelled`` is set.
+        """
+        if not cancelled.is_set():
+            self.play_audio(io.BytesIO(AudioChunk.to_wav([chunk])))
+
+    def finish_audio_stream(self) -> None:
+        """Release whatever write_audio_chunk opened; runs on the playback thread"""
+        pass
+
     @abstractmethod
     def get_devices(self) -> list[dict]:
         """Get available audio input devices"""
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+import asyncio
 
 
 class LLMProvider(ABC):
@@ -20,11 +21,35 @@ class LLMProvider(ABC):
 
     @abstractmethod
     def generate_response(
-        self, message: str, system_prompt: Optional[str] = None
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
     ) -> str:
-        """Generate a response to the given message, optionally using a system prompt"""
+        """Generate a response to the given message, optionally using a system prompt
+
+        history holds earlier turns as {"role", "content"} dicts, oldest
+        first, starting with a user turn.
+        """
         pass
 
+    async def generate_stream(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """Generate a response as text deltas, yielded as they are produced
+
+        Providers with a streaming API should override this. The default
+        runs generate_response() on a worker thread and yields its result
+        in one piece.
+        """
+        loop = asyncio.get_running_loop()
+        yield await loop.run_in_executor(
+            None, self.generate_response, message, system_prompt, history
+        )
+
     @abstractmethod
     def get_providers(self) -> Dict[str, "LLMProvider"]:
         """Return dictionary of available providers"""
@@ -1,11 +1,142 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from array import array
+from typing import AsyncIterator, Callable, List, Optional
+import asyncio
+import io
+import sys
+import wave
+
+
+@dataclass
+class AudioChunk:
+    """A piece of decoded audio as produced by streaming synthesis"""
+
+    pcm: bytes  # Interleaved little-endian signed integer samples
+    sample_rate: int
+    channels: int = 1
+    sample_width: int = 2  # Bytes per sample
+
+    @classmethod
+    def from_wav(cls, wav_data: bytes) -> "AudioChunk":
+        """Decode a complete WAV file into a single chunk"""
+        with wave.open(io.BytesIO(wav_data), "rb") as wf:
+            return cls(
+                wf.readframes(wf.getnframes()),
+                wf.getframerate(),
+                wf.getnchannels(),
+                wf.getsampwidth(),
+            )
+
+    @staticmethod
+    def to_wav(chunks: List["AudioChunk"]) -> bytes:
+        """Encode chunks that share one format as a WAV file"""
+        first = chunks[0]
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(first.channels)
+            wf.setsampwidth(first.sample_width)
+            wf.setframerate(first.sample_rate)
+            for chunk in chunks:
+                wf.writeframes(chunk.pcm)
+        return buffer.getvalue()
+
+
+def load_wav_frames(path: str):
+    """Read a 16-bit WAV file as a single mono frame plus its sample rate"""
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Unsupported sample width in {path}: {wf.getsampwidth()}")
+        channels = wf.getnchannels()
+        sample_rate = wf.getframerate()
+        data = wf.readframes(wf.getnframes())
+
+    if channels > 1:
+        # Downmix to mono, truncating the mean toward zero
+        samples = array("h", data)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        columns = [samples[c::channels] for c in range(channels)]
+        mono = array("h", (int(sum(frame) / channels) for frame in zip(*columns)))
+        if sys.byteorder == "big":
+            mono.byteswap()
+        data = mono.tobytes()
+
+    return [data], sample_rate
 
 
 class SpeechToTextProvider(ABC):
     @abstractmethod
-    def transcribe(self, audio_data):
+    def transcribe(self, audio_data, sample_rate: int = 44100):
+        pass
+
+    def transcribe_batch(self, paths: List[str]) -> List[Optional[str]]:
+        """Transcribe a list of WAV files
+
+        Providers whose engine can decode several clips in one call should
+        override this; the default transcribes the files one at a time.
+
+        Args:
+            paths: Paths of 16-bit PCM WAV files; stereo files are downmixed
+
+        Returns:
+            list: Transcribed text per path, None where transcription failed
+        """
+        results = []
+        for path in paths:
+            try:
+                frames, sample_rate = load_wav_frames(path)
+                results.append(self.transcribe(frames, sample_rate=sample_rate))
+            except Exception as e:
+                print(f"!!! Error transcribing {path}: {e}")
+                results.append(None)
+        return results
+
+    def close(self) -> None:
+        """Release threads, processes or connections held by the provider"""
+        pass
+
+
+class StreamingSpeechToTextProvider(SpeechToTextProvider):
+    """Speech-to-text engine that transcribes while audio is still arriving"""
+
+    @abstractmethod
+    def start_utterance(
+        self,
+        sample_rate: int,
+        on_transcript: Optional[Callable[[str, bool], None]] = None,
+    ) -> None:
+        """Begin a new utterance
+
+        Args:
+            sample_rate: Sample rate of the 16-bit mono PCM that will be sent
+            on_transcript: Called with (text so far, is_final) as results
+                arrive. May be called from a background thread.
+        """
+        pass
+
+    @abstractmethod
+    def send_audio(self, chunk: bytes) -> None:
+        """Queue a chunk of 16-bit mono PCM for the current utterance"""
+        pass
+
+    @abstractmethod
+    def finish_utterance(self, timeout: float = 10.0) -> Optional[str]:
+        """Flush the current utterance and return its final transcript"""
         pass
 
+    async def finish_utterance_async(self, timeout: float = 10.0) -> str:
+        """Like finish_utterance, but awaitable from the event loop
+
+        Raises instead of returning None when the transcript could not be
+        produced. The default waits for finish_utterance on a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(None, self.finish_utterance, timeout)
+        if text is None:
+            raise RuntimeError("Streaming transcription failed")
+        return text
+
 
 class TextToSpeechProvider(ABC):
     @abstractmethod
@@ -20,3 +151,32 @@ class TextToSpeechProvider(ABC):
             bytes: Audio data in WAV format
         """
         pass
+
+    async def synthesize_stream(
+        self, text: str, ref_audio: str = None
+    ) -> AsyncIterator[AudioChunk]:
+        """Synthesize speech as PCM chunks that can be played as they arrive
+
+        Engines that produce audio incrementally should override this. The
+        default waits for synthesize() and yields its audio as one chunk.
+
+        Args:
+            text: Text to synthesize
+            ref_audio: Optional reference audio file path (provider-specific)
+
+        Yields:
+            AudioChunk: Consecutive pieces of the utterance
+        """
+        yield AudioChunk.from_wav(await self.synthesize(text, ref_audio))
+
+    def cache_identity(self, ref_audio: str = None) -> dict:
+        """Everything besides the text that determines the synthesized audio
+
+        Used to key cached audio, so providers should include their voice,
+        model and settings. The default only covers the reference audio path.
+        """
+        return {"ref_audio": ref_audio}
+
+    async def aclose(self) -> None:
+        """Release threads, processes or connections held by the provider"""
+        pass
@@ -2,8 +2,10 @@ import pyaudio
 import wave
 from typing import Optional, BinaryIO
 from core.interfaces.audio import AudioInputProvider, AudioOutputProvider, AudioConfig
+from core.interfaces.speech import AudioChunk
 import io
 import struct
+import threading
 import traceback
 import numpy as np
 import time
@@ -13,7 +15,12 @@ class PyAudioProvider(AudioInputProvider, AudioOutputProvider):
     def __init__(self):
         self._audio = pyaudio.PyAudio()
         self._stream = None
-        self._playback_stream = None
+        self._playback_stream = None  # Used by play_audio only
+        # Streamed playback has its own output stream; play_stream calls run
+        # on their own threads, so it is only touched under the lock
+        self._chunk_stream = None
+        self._chunk_lock = threading.Lock()
+        self._stream_format = None  # (rate, channels, width) of _chunk_stream
         self._config = None
         self._recorded_frames = []
         self._output_device_id = None
@@ -271,6 +278,53 @@ class PyAudioProvider(AudioInputProvider, AudioOutputProvider):
             self.stop_playback()
             raise
 
+    def write_audio_chunk(self, chunk: AudioChunk, cancelled: threading.Event):
+        """Write streamed PCM to one output stream, reopened only on format change"""
+        audio_format = (chunk.sample_rate, chunk.channels, chunk.sample_width)
+        with self._chunk_lock:
+            if self._chunk_stream is None or self._stream_format != audio_format:
+                self._close_chunk_stream()
+                print(
+                    f">>> Opening playback stream: {chunk.sample_rate}Hz, "
+                    f"{chunk.channels}ch, {chunk.sample_width * 8}-bit"
+                )
+                self._chunk_stream = self._audio.open(
+                    format=self._audio.get_format_from_width(chunk.sample_width),
+                    channels=chunk.channels,
+                    rate=chunk.sample_rate,
+                    output=True,
+                    output_device_index=self._output_device_id,
+                    frames_per_buffer=1024,
+                )
+                self._stream_format = audio_format
+
+        # Small writes so a cancelled stream stops within ~1024 frames
+        step = 1024 * chunk.channels * chunk.sample_width
+        for offset in range(0, len(chunk.pcm), step):
+            if cancelled.is_set():
+                return
+            with self._chunk_lock:
+                if self._chunk_stream is None:
+                    return  # Closed by another streamed playback
+                self._chunk_stream.write(chunk.pcm[offset : offset + step])
+
+    def finish_audio_stream(self) -> None:
+        """Let buffered audio drain, then close the stream"""
+        with self._chunk_lock:
+            self._close_chunk_stream()
+
+    def _close_chunk_stream(self) -> None:
+        """Close the streamed playback output; caller holds _chunk_lock"""
+        stream, self._chunk_stream = self._chunk_stream, None
+        self._stream_format = None
+        if stream is not None:
+            try:
+                if not stream.is_stopped():
+                    stream.stop_stream()
+                stream.close()
+            except Exception as e:
+                print(f"!!! Error closing playback stream: {e}")
+
     def stop_playback(self) -> None:
         """Stop current audio playback"""
         if self._playback_stream:
@@ -361,6 +415,7 @@ class PyAudioProvider(AudioInputProvider, AudioOutputProvider):
                 self.stop_stream()
             if self._playback_stream:
                 self.stop_playback()
+            self.finish_audio_stream()
             if self._audio:
                 self._audio.terminate()
         except Exception as e:
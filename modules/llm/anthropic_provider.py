@@ -1,9 +1,10 @@
 from core.interfaces.llm import LLMProvider
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 import os
 import traceback
 from dataclasses import dataclass
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
+from .streaming import publish_stream
 
 
 @dataclass
@@ -15,32 +16,25 @@ class LLMProviderConfig:
 class AnthropicProvider(LLMProvider):
     def __init__(self, config: LLMProviderConfig = None):
         self._client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+        self._async_client = AsyncAnthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
         self._current_model = (
             config.default_model if config else "claude-3-haiku-20240307"
         )
         print(f">>> Initialized Anthropic provider with model: {self._current_model}")
 
-    def generate_response(self, message: str, system_prompt: str = None) -> str:
+    def generate_response(
+        self,
+        message: str,
+        system_prompt: str = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> str:
         """Generate a response using the Anthropic API"""
         try:
             print(f"\n=== Generating response with {self._current_model} ===")
 
-            # Build the messages list
-            messages = []
-
-            # Add system prompt if provided
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-
-            # Add user message
-            messages.append({"role": "user", "content": message})
-
             # Make the API call
             response = self._client.messages.create(
-                model=self._current_model,
-                messages=messages,
-                max_tokens=1024,
-                temperature=0.7,
+                **self._request(message, system_prompt, history)
             )
 
             # Extract and return the response content
@@ -53,6 +47,42 @@ class AnthropicProvider(LLMProvider):
             print(traceback.format_exc())
             raise
 
+    def _request(
+        self,
+        message: str,
+        system_prompt: Optional[str],
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> dict:
+        """Messages API arguments; the system prompt is a top-level field"""
+        request = {
+            "model": self._current_model,
+            "messages": [*(history or []), {"role": "user", "content": message}],
+            "max_tokens": 1024,
+            "temperature": 0.7,
+        }
+        if system_prompt:
+            request["system"] = system_prompt
+        return request
+
+    async def generate_stream(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream the response from the Anthropic API as text deltas"""
+        print(f"\n=== Streaming response with {self._current_model} ===")
+
+        async def deltas():
+            async with self._async_client.messages.stream(
+                **self._request(message, system_prompt, history)
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+        async for delta in publish_stream("anthropic", self._current_model, deltas()):
+            yield delta
+
     def get_available_models(self) -> list:
         """Get list of available models"""
         return [
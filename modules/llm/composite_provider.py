@@ -1,5 +1,5 @@
 from core.interfaces.llm import LLMProvider
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 
 
 class CompositeLLMProvider(LLMProvider):
@@ -26,10 +26,27 @@ class CompositeLLMProvider(LLMProvider):
         self._current_model = model_name
 
     def generate_response(
-        self, message: str, system_prompt: Optional[str] = None
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
     ) -> str:
         """Generate response using current provider with optional system prompt"""
-        return self._current_provider.generate_response(message, system_prompt)
+        return self._current_provider.generate_response(
+            message, system_prompt, history
+        )
+
+    async def generate_stream(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream the response from the current provider"""
+        async for delta in self._current_provider.generate_stream(
+            message, system_prompt, history
+        ):
+            yield delta
 
     def get_providers(self) -> Dict[str, LLMProvider]:
         return self._providers
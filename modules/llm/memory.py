@@ -0,0 +1,160 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Role and formatting overhead each message adds to a request
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below in at most {words} words. Keep names, "
+    "facts, decisions and open questions; drop small talk. Reply with the "
+    "summary only.\n\n{transcript}"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English text"""
+    return (len(text) + 3) // 4 + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class Turn:
+    role: str  # "user" or "assistant"
+    content: str
+    tokens: int
+
+
+class ConversationMemory:
+    """Recent turns of the conversation, kept within a token budget
+
+    Each turn is counted once when it is added, and a running total tracks
+    the turns in the window, so adding a turn costs O(new text). When the
+    total exceeds the budget the oldest exchanges leave the window and are
+    folded into a running summary in the background; the summary then
+    travels with the system prompt. Until it lands, evicted turns are
+    briefly absent from the prompt rather than pushing it over budget.
+    """
+
+    def __init__(
+        self,
+        max_history_tokens: int = 2000,
+        summary_tokens: int = 300,
+        summarizer: Optional[Callable[[str], Awaitable[str]]] = None,
+    ):
+        """Initialize conversation memory
+
+        Args:
+            max_history_tokens: Budget for the turns sent with each request
+            summary_tokens: Target length of the summary of older turns
+            summarizer: Coroutine function that answers a prompt; without
+                one, turns that leave the window are dropped
+        """
+        self._max_tokens = max_history_tokens
+        self._summary_tokens = summary_tokens
+        self._summarizer = summarizer
+        self._turns: List[Turn] = []
+        self._window_tokens = 0
+        self._summary = ""
+        self._evicted: List[Turn] = []
+        self._summarizing: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[dict],
+        summarizer: Optional[Callable[[str], Awaitable[str]]] = None,
+    ) -> Optional["ConversationMemory"]:
+        """Create memory from the LLM ``memory`` config, or None if disabled"""
+        if not config or not config.get("enabled", False):
+            return None
+        return cls(
+            max_history_tokens=config.get("max_history_tokens", 2000),
+            summary_tokens=config.get("summary_tokens", 300),
+            summarizer=summarizer if config.get("summarize", True) else None,
+        )
+
+    @property
+    def summary(self) -> str:
+        return self._summary
+
+    def add(self, role: str, content: str) -> None:
+        """Append a turn and evict the oldest exchanges if over budget"""
+        turn = Turn(role, content, estimate_tokens(content))
+        self._turns.append(turn)
+        self._window_tokens += turn.tokens
+        self._trim()
+
+    def add_exchange(self, message: str, response: str) -> None:
+        """Record a user message and the assistant's reply"""
+        self.add("user", message)
+        self.add("assistant", response)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Turns in the window, oldest first, in chat API message format"""
+        return [{"role": turn.role, "content": turn.content} for turn in self._turns]
+
+    def system_prompt(self, base: Optional[str]) -> Optional[str]:
+        """The system prompt with the summary of older turns appended"""
+        if not self._summary:
+            return base
+        summary = f"Summary of the earlier conversation:\n{self._summary}"
+        return f"{base}\n\n{summary}" if base else summary
+
+    def clear(self) -> None:
+        """Forget the conversation, including any summary in progress"""
+        if self._summarizing and not self._summarizing.done():
+            self._summarizing.cancel()
+        self._summarizing = None
+        self._turns.clear()
+        self._evicted.clear()
+        self._window_tokens = 0
+        self._summary = ""
+
+    def _trim(self):
+        evicted = 0
+        while self._window_tokens > self._max_tokens and len(self._turns) > 1:
+            turn = self._turns.pop(0)
+            self._window_tokens -= turn.tokens
+            self._evicted.append(turn)
+            evicted += 1
+        # Chat APIs expect the history to open with a user turn
+        while self._turns and self._turns[0].role != "user":
+            turn = self._turns.pop(0)
+            self._window_tokens -= turn.tokens
+            self._evicted.append(turn)
+            evicted += 1
+        if not evicted:
+            return
+
+        print(
+            f">>> {evicted} turns left the conversation window "
+            f"({self._window_tokens}/{self._max_tokens} tokens kept)"
+        )
+        if not self._summarizer:
+            self._evicted.clear()
+        elif not self._summarizing or self._summarizing.done():
+            self._summarizing = asyncio.ensure_future(self._summarize())
+
+    async def _summarize(self):
+        # Turns evicted while a summary is in flight are picked up next pass
+        while self._evicted:
+            turns, self._evicted = self._evicted, []
+            transcript = "\n".join(f"{t.role}: {t.content}" for t in turns)
+            if self._summary:
+                transcript = f"Earlier summary: {self._summary}\n\n{transcript}"
+            prompt = SUMMARY_PROMPT.format(
+                words=self._summary_tokens * 3 // 4, transcript=transcript
+            )
+            try:
+                summary = (await self._summarizer(prompt) or "").strip()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"!!! Error summarizing conversation: {e}")
+                continue
+            if summary:
+                self._summary = summary
+                print(
+                    f">>> Conversation summary updated "
+                    f"(~{estimate_tokens(summary)} tokens)"
+                )
@@ -1,13 +1,15 @@
 from core.interfaces.llm import LLMProvider
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import os
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional
+from .streaming import publish_stream
 
 
 class OpenAIProvider(LLMProvider):
     def __init__(self, config):
         self._config = config
         self._client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        self._async_client = AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"])
         self._current_model = self.get_default_model()
 
     def get_available_models(self):
@@ -22,21 +24,55 @@ class OpenAIProvider(LLMProvider):
         self._current_model = model_name
 
     def generate_response(
-        self, message: str, system_prompt: Optional[str] = None
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
     ) -> str:
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": message})
-
             response = self._client.chat.completions.create(
-                model=self._current_model, messages=messages
+                model=self._current_model,
+                messages=self._messages(message, system_prompt, history),
             )
             return response.choices[0].message.content
         except Exception as e:
             print(f"!!! Error generating response: {str(e)}")
             raise
 
+    @staticmethod
+    def _messages(
+        message: str,
+        system_prompt: Optional[str],
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> list:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.extend(history or [])
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    async def generate_stream(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream the chat completion as text deltas"""
+        print(f"\n=== Streaming response with {self._current_model} ===")
+
+        async def deltas():
+            stream = await self._async_client.chat.completions.create(
+                model=self._current_model,
+                messages=self._messages(message, system_prompt, history),
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        async for delta in publish_stream("openai", self._current_model, deltas()):
+            yield delta
+
     def get_providers(self) -> Dict[str, "LLMProvider"]:
         return {"openai": self}
@@ -0,0 +1,45 @@
+import time
+from typing import AsyncIterator
+from core.events import Event, EventBus, EventType
+
+
+async def publish_stream(
+    provider: str, model: str, deltas: AsyncIterator[str]
+) -> AsyncIterator[str]:
+    """Relay text deltas while publishing them as assistant response events
+
+    Emits ASSISTANT_RESPONSE_STARTED, one ASSISTANT_RESPONSE_CHUNK per delta
+    and ASSISTANT_RESPONSE_FINISHED with the full text, or ERROR if the
+    stream fails.
+    """
+    event_bus = EventBus.get_instance()
+    await event_bus.emit(
+        Event(
+            EventType.ASSISTANT_RESPONSE_STARTED,
+            data={"provider": provider, "model": model},
+        )
+    )
+
+    start = time.perf_counter()
+    parts = []
+    try:
+        async for delta in deltas:
+            if not delta:
+                continue
+            if not parts:
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f">>> First token from {model} after {elapsed:.0f}ms")
+            parts.append(delta)
+            await event_bus.emit(Event(EventType.ASSISTANT_RESPONSE_CHUNK, data=delta))
+            yield delta
+    except Exception as e:
+        print(f"!!! Error streaming response: {e}")
+        await event_bus.emit(Event(EventType.ERROR, error=e))
+        raise
+
+    text = "".join(parts)
+    print(
+        f">>> Streamed {len(text)} characters from {model} in "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+    await event_bus.emit(Event(EventType.ASSISTANT_RESPONSE_FINISHED, data=text))
@@ -1,14 +1,19 @@
 from enum import Enum, auto
 from typing import Optional
 from .whisper_provider import WhisperProvider
+from .deepgram_provider import DeepgramProvider
 from .f5_provider import F5TTSProvider
 from .elevenlabs_provider import ElevenLabsProvider
+from .local_tts_provider import LocalTTSProvider
 
 
 class SpeechProviderType(Enum):
     WHISPER = "whisper"
+    FASTER_WHISPER = "faster_whisper"
+    DEEPGRAM = "deepgram"
     F5TTS = "f5tts"
     ELEVENLABS = "elevenlabs"  # Add this
+    LOCAL = "local"
 
 
 def create_speech_provider(provider_type: str, config: Optional[dict] = None):
@@ -27,10 +32,19 @@ def create_speech_provider(provider_type: str, config: Optional[dict] = None):
         raise ValueError(f"Unknown speech provider type: {provider_type}")
 
     if provider_type == SpeechProviderType.WHISPER:
-        return WhisperProvider()
+        return WhisperProvider(config)
+    elif provider_type == SpeechProviderType.FASTER_WHISPER:
+        # Imported here so faster_whisper is only needed when selected
+        from .faster_whisper_provider import FasterWhisperProvider
+
+        return FasterWhisperProvider(config)
+    elif provider_type == SpeechProviderType.DEEPGRAM:
+        return DeepgramProvider(config)
     elif provider_type == SpeechProviderType.F5TTS:
         return F5TTSProvider(config)
     elif provider_type == SpeechProviderType.ELEVENLABS:  # Add this
         return ElevenLabsProvider(config)
+    elif provider_type == SpeechProviderType.LOCAL:
+        return LocalTTSProvider(config)
     else:
         raise ValueError(f"Unsupported speech provider type: {provider_type}")
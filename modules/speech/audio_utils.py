@@ -0,0 +1,90 @@
+import io
+import numpy as np
+import wave
+from scipy import signal
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def frames_to_float32(
+    audio_frames, original_rate: int = 44100, target_rate: int = WHISPER_SAMPLE_RATE
+) -> np.ndarray:
+    """Convert recorded int16 frames to normalized float32 at the target rate"""
+    audio_data = np.frombuffer(b"".join(audio_frames), dtype=np.int16)
+    print(f">>> Audio data shape: {audio_data.shape}")
+    if len(audio_data):
+        print(f">>> Audio max value: {np.max(np.abs(audio_data))}")
+
+    # Convert to float32 and normalize
+    audio_float = audio_data.astype(np.float32) / 32768.0
+
+    if original_rate == target_rate:
+        return audio_float
+
+    new_samples = int(len(audio_float) * target_rate / original_rate)
+    audio_resampled = signal.resample(audio_float, new_samples).astype(np.float32)
+    print(f">>> Resampled audio shape: {audio_resampled.shape}")
+    return audio_resampled
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    threshold: float = 0.01,
+    frame_ms: int = 30,
+    padding_ms: int = 200,
+) -> np.ndarray:
+    """Trim leading and trailing silence using frame RMS energy
+
+    Args:
+        audio: Mono float32 audio in [-1, 1]
+        sample_rate: Sample rate of the audio
+        threshold: RMS level below which a frame counts as silence
+        frame_ms: Analysis frame length in milliseconds
+        padding_ms: Audio kept on either side of the detected speech
+
+    Returns:
+        The trimmed audio, or the input unchanged if no speech is found
+    """
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return audio
+
+    frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    voiced = np.flatnonzero(rms >= threshold)
+    if len(voiced) == 0:
+        return audio
+
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(0, voiced[0] * frame_length - padding)
+    end = min(len(audio), (voiced[-1] + 1) * frame_length + padding)
+    if start > 0 or end < len(audio):
+        print(
+            f">>> Trimmed silence: {start / sample_rate:.2f}s leading, "
+            f"{(len(audio) - end) / sample_rate:.2f}s trailing"
+        )
+    return audio[start:end]
+
+
+def prepare_audio(
+    audio_frames, sample_rate: int = 44100, trim: bool = True
+) -> np.ndarray:
+    """Shared STT input handling: resample to 16 kHz and trim silence"""
+    audio = frames_to_float32(audio_frames, sample_rate, WHISPER_SAMPLE_RATE)
+    if trim:
+        audio = trim_silence(audio, WHISPER_SAMPLE_RATE)
+    return audio
+
+
+def float32_to_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    """Encode mono float audio in [-1, 1] as a 16-bit WAV file in memory"""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue()
@@ -0,0 +1,108 @@
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+# Provider instance owned by each worker process
+_worker_provider = None
+
+
+def _init_worker(provider_type: str, config: dict, threads: int):
+    """Create the STT provider once per worker process"""
+    global _worker_provider
+
+    from modules.speech import create_speech_provider
+
+    # Split the cores between workers instead of letting each one claim all
+    config = dict(config)
+    if provider_type == "faster_whisper":
+        config["cpu_threads"] = threads
+    elif provider_type == "whisper":
+        import torch
+
+        torch.set_num_threads(threads)
+    # The pool already uses every core; workers must not start pools of their own
+    for key in ("long_form", "deadline"):
+        config[key] = {"enabled": False}
+
+    _worker_provider = create_speech_provider(provider_type, config)
+    print(f">>> Worker {os.getpid()} ready with {threads} thread(s)")
+
+
+def _transcribe_group(paths: List[str]) -> int:
+    """Transcribe a group of files and write each transcript next to its audio"""
+    written = 0
+    for path, text in zip(paths, _worker_provider.transcribe_batch(paths)):
+        if text is None:
+            print(f"!!! No transcript produced for {path}")
+            continue
+        with open(transcript_path(path), "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        written += 1
+    return written
+
+
+def transcript_path(audio_path: str) -> str:
+    """Path of the transcript written for an audio file"""
+    return os.path.splitext(audio_path)[0] + ".txt"
+
+
+def transcribe_directory(
+    directory: str,
+    provider_type: str,
+    config: Optional[dict] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 16,
+    overwrite: bool = False,
+) -> int:
+    """Transcribe every WAV file in a directory using a process pool
+
+    Args:
+        directory: Directory containing the recordings
+        provider_type: STT provider type, as accepted by create_speech_provider
+        config: Provider configuration
+        workers: Number of worker processes (default: one per core)
+        batch_size: Files handed to a worker per task
+        overwrite: Re-transcribe files that already have a transcript
+
+    Returns:
+        int: Number of transcripts written
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "*.wav")))
+    if not overwrite:
+        paths = [p for p in paths if not os.path.exists(transcript_path(p))]
+
+    print(f"\n=== Batch transcription of {len(paths)} files in {directory} ===")
+    if not paths:
+        return 0
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(paths)))
+    threads = max(1, cpu_count // workers)
+    groups = [paths[i : i + batch_size] for i in range(0, len(paths), batch_size)]
+    print(
+        f">>> Using {workers} worker(s), {len(groups)} group(s) of up to {batch_size}"
+    )
+
+    start_time = time.perf_counter()
+    written = 0
+    # Spawn keeps torch/CUDA state from leaking into the workers
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(provider_type, config or {}, threads),
+    ) as executor:
+        futures = [executor.submit(_transcribe_group, group) for group in groups]
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+                print(f">>> Progress: {written}/{len(paths)} transcripts written")
+            except Exception as e:
+                print(f"!!! Error in transcription worker: {e}")
+
+    elapsed = time.perf_counter() - start_time
+    print(f">>> Wrote {written} transcripts in {elapsed:.1f}s")
+    return written
@@ -1,13 +1,51 @@
-from core.interfaces.speech import TextToSpeechProvider
-from typing import Dict, Optional
+from core.interfaces.speech import AudioChunk, TextToSpeechProvider
+from .text_chunking import split_for_synthesis
+from .tts_routing import TTSRouter
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
 
 
 class CompositeTTSProvider(TextToSpeechProvider):
     def __init__(
-        self, providers: Dict[str, TextToSpeechProvider], active_provider: str
+        self,
+        providers: Dict[str, TextToSpeechProvider],
+        active_provider: str,
+        chunking: Optional[dict] = None,
+        routing: Optional[dict] = None,
     ):
+        """Initialize composite TTS provider
+
+        Args:
+            providers: Provider instances by name
+            active_provider: Name of the provider to start with
+            chunking: Optional dictionary that may contain:
+                - max_concurrency: Chunks synthesized at once (default: 3)
+                - max_chars: Longest chunk sent in one request (default: 250)
+                - min_chars: Shorter fragments are merged (default: 20)
+            routing: Optional dictionary that may contain:
+                - enabled: Fail over between providers (default: False)
+                - fallback_order: Provider names to try after the active one
+                - hedge: Start the next provider when the current one is
+                  slower than its p95 latency (default: True)
+                - hedge_min_ms: Never hedge sooner than this (default: 800)
+                - hedge_default_ms: Hedge delay before a provider has enough
+                  samples for a p95 (default: 3000)
+                - smoothing: EWMA weight of the newest latency (default: 0.3)
+                - window: Recent requests kept per provider (default: 50)
+                - failure_threshold: Consecutive failures that open the
+                  circuit (default: 3)
+                - cooldown_seconds: How long an open circuit skips the
+                  provider (default: 30)
+        """
+        if chunking is None:
+            chunking = {}
+
         self._providers = providers
         self._active_provider = active_provider
+        self._max_concurrency = max(1, chunking.get("max_concurrency", 3))
+        self._max_chars = chunking.get("max_chars", 250)
+        self._min_chars = chunking.get("min_chars", 20)
+        self._router = TTSRouter.from_config(routing, list(providers))
 
     def set_active_provider(self, provider_name: str):
         """Change the active provider"""
@@ -24,9 +62,245 @@ class CompositeTTSProvider(TextToSpeechProvider):
         """Get list of available provider names"""
         return list(self._providers.keys())
 
-    async def synthesize(self, text: str, ref_audio: Optional[str] = None) -> bytes:
-        """Synthesize speech using the active provider"""
+    def _get_active(self) -> TextToSpeechProvider:
         provider = self._providers.get(self._active_provider)
         if not provider:
             raise ValueError(f"No provider found for: {self._active_provider}")
-        return await provider.synthesize(text, ref_audio)
+        return provider
+
+    async def aclose(self) -> None:
+        """Close every provider, carrying on past any that fail"""
+        for name, provider in self._providers.items():
+            try:
+                await provider.aclose()
+            except Exception as e:
+                print(f"!!! Error closing TTS provider {name}: {e}")
+
+    def get_routing_stats(self) -> Optional[dict]:
+        """Per-provider latency and health, or None when routing is off"""
+        return self._router.snapshot() if self._router else None
+
+    async def synthesize(self, text: str, ref_audio: Optional[str] = None) -> bytes:
+        """Synthesize speech using the active provider"""
+        if self._router:
+            return await self._routed(
+                lambda provider: provider.synthesize(text, ref_audio)
+            )
+        return await self._get_active().synthesize(text, ref_audio)
+
+    async def _routed(
+        self, call: Callable[[TextToSpeechProvider], Awaitable[bytes]]
+    ) -> bytes:
+        """Run call against the healthiest providers until one succeeds
+
+        The first candidate runs alone. If it fails, the next one starts. If
+        it is still running past its hedge delay, the next one starts
+        alongside it and whichever finishes first wins; the other is
+        cancelled.
+        """
+        router = self._router
+        waiting = router.candidates(self._active_provider)
+        loop = asyncio.get_running_loop()
+        running = {}  # task -> (provider name, start time, is hedge)
+        last_error = None
+
+        def launch(hedge: bool = False):
+            name = waiting.pop(0)
+            router.record_start(name)
+            task = asyncio.ensure_future(call(self._providers[name]))
+            running[task] = (name, loop.time(), hedge)
+
+        launch()
+        try:
+            while running:
+                timeout = None
+                if waiting and len(running) == 1:
+                    name, started, _ = next(iter(running.values()))
+                    delay = router.hedge_delay(name)
+                    if delay is not None:
+                        timeout = max(0.0, started + delay - loop.time())
+
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    print(f">>> {name} past its hedge deadline, trying {waiting[0]}")
+                    router.stats["hedges"] += 1
+                    launch(hedge=True)
+                    continue
+
+                for task in done:
+                    name, started, hedge = running.pop(task)
+                    try:
+                        audio = task.result()
+                    except Exception as e:
+                        router.record_failure(name, e)
+                        last_error = e
+                        continue
+                    router.record_success(name, loop.time() - started)
+                    if hedge:
+                        router.stats["hedges_won"] += 1
+                    return audio
+
+                if not running and waiting:
+                    print(f">>> Failing over to TTS provider {waiting[0]}")
+                    router.stats["failovers"] += 1
+                    launch()
+
+            raise last_error
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def synthesize_chunked(
+        self, text: str, ref_audio: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Synthesize long text sentence by sentence, yielding WAV in order
+
+        Chunks are synthesized concurrently, at most ``max_concurrency`` at a
+        time, and each is yielded as soon as it and every chunk before it are
+        done. Playback can start once the first sentence is ready. Providers
+        that set ``supports_batch`` get the first chunk on its own and the
+        rest in one batched call.
+        """
+        provider = self._get_active()
+        chunks = split_for_synthesis(text, self._max_chars, self._min_chars)
+        if not chunks:
+            return
+
+        if getattr(provider, "supports_batch", False):
+            print(
+                f">>> Synthesizing {len(chunks)} chunks with "
+                f"{self._active_provider} in batches"
+            )
+            delivered = 0
+            try:
+                async for audio in self._first_then_batch(provider, chunks, ref_audio):
+                    delivered += 1
+                    yield audio
+                return
+            except Exception as e:
+                if not self._router:
+                    raise
+                # Finish the remaining chunks one by one through the router
+                self._router.record_failure(self._active_provider, e)
+                chunks = chunks[delivered:]
+
+        tasks = self._start_chunks(provider, chunks, ref_audio)
+        try:
+            for index, task in enumerate(tasks):
+                audio = await task
+                print(f">>> Chunk {index + 1}/{len(tasks)} ready")
+                yield audio
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _first_then_batch(
+        self,
+        provider: TextToSpeechProvider,
+        chunks: List[str],
+        ref_audio: Optional[str],
+    ) -> AsyncIterator[bytes]:
+        """Yield the first chunk from its own request, then the batched rest
+
+        A batch is only yielded once a whole forward pass is done, so the
+        first sentence is requested alone, ahead of the batch, to keep the
+        time to first audio at one sentence.
+        """
+        first = asyncio.ensure_future(provider.synthesize(chunks[0], ref_audio))
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def drain():
+            try:
+                if len(chunks) > 1:
+                    async for audio in provider.synthesize_batch(chunks[1:], ref_audio):
+                        await queue.put(audio)
+            finally:
+                await queue.put(None)
+
+        # Started after the first request, so a shared worker takes that first
+        batch = asyncio.ensure_future(drain())
+        try:
+            yield await first
+            while True:
+                audio = await queue.get()
+                if audio is None:
+                    break
+                yield audio
+            await batch  # Surface batch errors
+        finally:
+            first.cancel()
+            batch.cancel()
+
+    def _start_chunks(
+        self,
+        provider: TextToSpeechProvider,
+        chunks: List[str],
+        ref_audio: Optional[str],
+        reserved: int = 0,
+    ) -> List[asyncio.Future]:
+        """Start synthesizing every chunk, at most max_concurrency at a time
+
+        Args:
+            provider: Active provider
+            chunks: Texts to synthesize
+            ref_audio: Optional reference audio file path
+            reserved: Provider slots already in use by the caller
+        """
+        # Providers may cap how many requests they can serve at once
+        concurrency = min(
+            self._max_concurrency,
+            getattr(provider, "max_concurrency", self._max_concurrency),
+        )
+        concurrency = max(1, concurrency - reserved)
+        print(
+            f">>> Synthesizing {len(chunks)} chunks with {self._active_provider} "
+            f"(up to {concurrency} at once)"
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def synthesize_one(chunk: str) -> bytes:
+            async with semaphore:
+                if self._router:
+                    return await self._routed(
+                        lambda routed: routed.synthesize(chunk, ref_audio)
+                    )
+                return await provider.synthesize(chunk, ref_audio)
+
+        # Tasks start in order, so earlier chunks get the semaphore first
+        return [asyncio.ensure_future(synthesize_one(chunk)) for chunk in chunks]
+
+    async def synthesize_stream(
+        self, text: str, ref_audio: Optional[str] = None
+    ) -> AsyncIterator[AudioChunk]:
+        """Stream speech as PCM chunks, sentence by sentence
+
+        The first sentence streams straight from the active provider while
+        the rest are synthesized in the background, so audio starts as soon
+        as the provider produces its first frames. With routing or batching
+        enabled, whole sentences from synthesize_chunked() are yielded
+        instead, since failover and batches work on complete utterances.
+        """
+        provider = self._get_active()
+        chunks = split_for_synthesis(text, self._max_chars, self._min_chars)
+        if not chunks:
+            return
+
+        if self._router or getattr(provider, "supports_batch", False):
+            async for audio in self.synthesize_chunked(text, ref_audio):
+                yield AudioChunk.from_wav(audio)
+            return
+
+        tasks = []
+        if len(chunks) > 1:
+            tasks = self._start_chunks(provider, chunks[1:], ref_audio, reserved=1)
+        try:
+            async for chunk in provider.synthesize_stream(chunks[0], ref_audio):
+                yield chunk
+            for task in tasks:
+                yield AudioChunk.from_wav(await task)
+        finally:
+            for task in tasks:
+                task.cancel()
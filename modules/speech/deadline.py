@@ -0,0 +1,157 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Rough real-time factors for greedy decoding, used until measurements exist
+DEFAULT_RTF_PRIORS = {
+    "tiny": 0.04,
+    "base": 0.08,
+    "small": 0.25,
+    "medium": 0.7,
+    "large": 1.5,
+}
+
+
+@dataclass
+class DecodeStrategy:
+    model: str
+    beam_size: int = 1
+    parallel: bool = False  # Split into chunks across the long-form pool
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return (self.model, self.beam_size)
+
+    def describe(self) -> str:
+        mode = ", parallel" if self.parallel else ""
+        return f"{self.model} (beam={self.beam_size}{mode})"
+
+
+class DeadlinePlanner:
+    """Picks the best decode strategy that should finish within a latency budget
+
+    Strategies are tried in configured order, best quality first. Predicted
+    latency is clip duration times the measured real-time factor of the
+    strategy, divided by the chunk parallelism available to it. Measured
+    factors are tracked as an exponentially weighted moving average.
+
+    At least one strategy must decode without chunking, since a clip that
+    fits in one chunk has nothing to run in parallel.
+    """
+
+    def __init__(
+        self,
+        latency_budget_ms: float,
+        strategies: List[DecodeStrategy],
+        rtf_priors: Optional[Dict[str, float]] = None,
+        smoothing: float = 0.3,
+    ):
+        if not any(not s.parallel for s in strategies):
+            raise ValueError("Deadline strategies need at least one non-parallel entry")
+        self._budget = latency_budget_ms / 1000.0
+        self._strategies = strategies
+        self._priors = dict(DEFAULT_RTF_PRIORS, **(rtf_priors or {}))
+        self._smoothing = smoothing
+        self._rtf: Dict[Tuple[str, int], float] = {}
+        self.stats = {"met": 0, "missed": 0}
+
+    @property
+    def budget_seconds(self) -> float:
+        return self._budget
+
+    @property
+    def strategies(self) -> List[DecodeStrategy]:
+        return list(self._strategies)
+
+    def estimate_rtf(self, strategy: DecodeStrategy) -> float:
+        if strategy.key in self._rtf:
+            return self._rtf[strategy.key]
+        size = strategy.model.split(".")[0].split("-")[0]
+        prior = self._priors.get(strategy.model, self._priors.get(size, 0.5))
+        # Beam search costs roughly proportionally to the square root of width
+        return prior * math.sqrt(strategy.beam_size)
+
+    def predict(self, strategy: DecodeStrategy, duration: float, parallelism: int):
+        workers = parallelism if strategy.parallel else 1
+        return duration * self.estimate_rtf(strategy) / max(1, workers)
+
+    def choose(
+        self, duration: float, chunk_count: int, workers: int
+    ) -> Tuple[DecodeStrategy, int]:
+        """Return the chosen strategy and the number of chunks to run at once"""
+        parallelism = max(1, min(chunk_count, workers))
+        candidates = [
+            s for s in self._strategies if not s.parallel or parallelism > 1
+        ]
+        for strategy in candidates:
+            if self.predict(strategy, duration, parallelism) <= self._budget:
+                return strategy, parallelism if strategy.parallel else 1
+
+        # Nothing fits: take whatever is predicted to finish first
+        fastest = min(
+            candidates, key=lambda s: self.predict(s, duration, parallelism)
+        )
+        return fastest, parallelism if fastest.parallel else 1
+
+    def record(
+        self,
+        strategy: DecodeStrategy,
+        duration: float,
+        decode_seconds: float,
+        parallelism: int,
+        latency_seconds: float,
+        warm: bool = True,
+    ) -> bool:
+        """Update the strategy's measured speed and note whether it met the budget
+
+        Args:
+            strategy: Strategy that was used
+            duration: Clip duration in seconds
+            decode_seconds: Time spent decoding
+            parallelism: Chunks that were decoded at once
+            latency_seconds: Time from end of speech to final text
+            warm: False when the decode also loaded a model or started
+                workers; the time then says nothing about the strategy's
+                speed, so only the deadline outcome is recorded
+        """
+        if duration > 0 and warm:
+            measured = decode_seconds * parallelism / duration
+            previous = self._rtf.get(strategy.key)
+            self._rtf[strategy.key] = (
+                measured
+                if previous is None
+                else previous + self._smoothing * (measured - previous)
+            )
+
+        met = latency_seconds <= self._budget
+        self.stats["met" if met else "missed"] += 1
+        return met
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[dict], default_model: str
+    ) -> Optional["DeadlinePlanner"]:
+        """Create a planner from a provider's ``deadline`` config, or None"""
+        if not config or not config.get("enabled", False):
+            return None
+
+        strategies = [
+            DecodeStrategy(
+                model=s.get("model", default_model),
+                beam_size=s.get("beam_size", 1),
+                parallel=s.get("parallel", False),
+            )
+            for s in config.get("strategies", [])
+        ] or [
+            DecodeStrategy(default_model, beam_size=5),
+            DecodeStrategy(default_model, beam_size=1),
+            DecodeStrategy(default_model, beam_size=1, parallel=True),
+            # Smaller model on its own, for short clips that fit one chunk
+            DecodeStrategy("tiny.en", beam_size=1),
+            DecodeStrategy("tiny.en", beam_size=1, parallel=True),
+        ]
+        return cls(
+            latency_budget_ms=config.get("latency_budget_ms", 800),
+            strategies=strategies,
+            rtf_priors=config.get("rtf_priors"),
+        )
@@ -1,7 +1,306 @@
-from core.interfaces.speech import SpeechToTextProvider
+from core.interfaces.speech import StreamingSpeechToTextProvider
+from typing import AsyncIterator, Callable, Optional
+from urllib.parse import urlencode
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import websockets
 
 
-class DeepgramProvider(SpeechToTextProvider):
-    def transcribe(self, audio_data):
-        # Implementation specific to Deepgram
-        pass
+class DeepgramProvider(StreamingSpeechToTextProvider):
+    API_URL = "wss://api.deepgram.com/v1/listen"
+    KEEPALIVE_INTERVAL = 8.0  # Deepgram closes idle sockets after ~10 s
+    FINALIZE_TIMEOUT = 5.0
+
+    def __init__(self, config: dict = None):
+        """Initialize streaming Deepgram provider
+
+        The websocket lives on a private event loop thread and is reused
+        across utterances; it is only reopened when it drops or the sample
+        rate changes.
+
+        Args:
+            config: Dictionary that may contain:
+                - api_key: Deepgram API key (default: DEEPGRAM_API_KEY)
+                - url: Websocket endpoint (e.g. a local mock server)
+                - model: Model name (default: nova-2)
+                - language: Language code
+                - smart_format: Enable smart formatting
+                - encoding: Audio encoding (only linear16 is sent)
+                - interim_results: Request interim results (default: True)
+                - keepalive_interval: Seconds between KeepAlive messages
+        """
+        if config is None:
+            config = {}
+
+        self._config = config
+        self._url = config.get("url", self.API_URL)
+        self._api_key = os.getenv("DEEPGRAM_API_KEY") or config.get("api_key")
+        if not self._api_key and self._url == self.API_URL:
+            raise ValueError("Deepgram API key not found in environment or config")
+
+        self._params = {
+            "model": config.get("model", "nova-2"),
+            "language": config.get("language", "en"),
+            "smart_format": str(config.get("smart_format", True)).lower(),
+            "encoding": config.get("encoding", "linear16"),
+            "channels": 1,
+            "interim_results": str(config.get("interim_results", True)).lower(),
+        }
+        self._keepalive_interval = config.get(
+            "keepalive_interval", self.KEEPALIVE_INTERVAL
+        )
+
+        # Connection state, only touched from the provider loop
+        self._ws = None
+        self._sample_rate = None
+        self._receiver_task = None
+        self._last_send = 0.0
+        self._final_parts = []
+        self._on_transcript = None
+        self._finalize_future = None
+        self._utterance_error = None  # Why the current utterance has no socket
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="deepgram", daemon=True
+        )
+        self._thread.start()
+        self._outgoing = None
+        self._tasks = []
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        print(f">>> Deepgram provider ready ({self._url})")
+
+    async def _start(self):
+        self._outgoing = asyncio.Queue()
+        self._tasks = [
+            self._loop.create_task(self._sender()),
+            self._loop.create_task(self._keepalive()),
+        ]
+
+    def _submit(self, item: tuple) -> None:
+        self._loop.call_soon_threadsafe(self._outgoing.put_nowait, item)
+
+    # Public streaming API (thread-safe)
+
+    def start_utterance(
+        self,
+        sample_rate: int,
+        on_transcript: Optional[Callable[[str, bool], None]] = None,
+    ) -> None:
+        print(f"\n=== Starting Deepgram utterance at {sample_rate} Hz ===")
+        self._submit(("start", sample_rate, on_transcript))
+
+    def send_audio(self, chunk: bytes) -> None:
+        if chunk:
+            self._submit(("audio", chunk))
+
+    def finish_utterance(self, timeout: float = 10.0) -> Optional[str]:
+        future = concurrent.futures.Future()
+        self._submit(("finish", future))
+        try:
+            text = future.result(timeout)
+            print(f">>> Deepgram transcription complete: '{text}'")
+            return text
+        except Exception as e:
+            print(f"!!! Error finishing Deepgram utterance: {e}")
+            return None
+
+    async def finish_utterance_async(self, timeout: float = 10.0) -> str:
+        """Flush the utterance without blocking the caller's event loop"""
+        future = concurrent.futures.Future()
+        self._submit(("finish", future))
+        text = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        print(f">>> Deepgram transcription complete: '{text}'")
+        return text
+
+    def transcribe(self, audio_frames, sample_rate: int = 44100):
+        """Stream already-recorded frames and wait for the final transcript"""
+        self.start_utterance(sample_rate)
+        for frame in audio_frames:
+            self.send_audio(frame)
+        return self.finish_utterance()
+
+    async def transcribe_stream(
+        self, audio_chunks: AsyncIterator[bytes], sample_rate: int = 44100
+    ) -> AsyncIterator[str]:
+        """Yield the running transcript while chunks are streamed"""
+        caller_loop = asyncio.get_running_loop()
+        updates = asyncio.Queue()
+
+        def on_transcript(text: str, is_final: bool):
+            caller_loop.call_soon_threadsafe(updates.put_nowait, text)
+
+        async def pump():
+            try:
+                self.start_utterance(sample_rate, on_transcript)
+                async for chunk in audio_chunks:
+                    self.send_audio(chunk)
+                future = concurrent.futures.Future()
+                self._submit(("finish", future))
+                await asyncio.wrap_future(future)
+            finally:
+                updates.put_nowait(None)
+
+        pump_task = caller_loop.create_task(pump())
+        try:
+            while True:
+                text = await updates.get()
+                if text is None:
+                    break
+                yield text
+            await pump_task  # Surface connection errors
+        finally:
+            pump_task.cancel()
+
+    def close(self) -> None:
+        """Close the websocket and stop the provider loop"""
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        try:
+            future.result(5.0)
+        except Exception as e:
+            print(f"!!! Error closing Deepgram connection: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5.0)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    async def _shutdown(self):
+        await self._close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # Provider loop internals
+
+    async def _sender(self):
+        """Process queued control messages and audio strictly in order"""
+        while True:
+            item = await self._outgoing.get()
+            kind = item[0]
+            try:
+                if kind == "start":
+                    _, sample_rate, on_transcript = item
+                    self._final_parts = []
+                    self._on_transcript = on_transcript
+                    self._utterance_error = None
+                    await self._ensure_connected(sample_rate)
+                elif kind == "audio":
+                    if self._ws is not None:
+                        await self._ws.send(item[1])
+                        self._last_send = self._loop.time()
+                elif kind == "finish":
+                    future = item[1]
+                    if self._ws is None:
+                        if self._utterance_error is not None:
+                            future.set_exception(self._utterance_error)
+                        else:
+                            future.set_result(self._joined_transcript())
+                        continue
+                    self._finalize_future = future
+                    await self._ws.send(json.dumps({"type": "Finalize"}))
+                    self._last_send = self._loop.time()
+                    self._loop.call_later(
+                        self.FINALIZE_TIMEOUT, self._resolve_finalize, future
+                    )
+            except Exception as e:
+                print(f"!!! Deepgram {kind} failed: {e}")
+                if kind == "finish" and not item[1].done():
+                    item[1].set_exception(e)
+                else:
+                    self._utterance_error = e
+                await self._close()
+
+    async def _ensure_connected(self, sample_rate: int):
+        if self._ws is not None and self._sample_rate == sample_rate:
+            return
+        await self._close()
+
+        params = dict(self._params, sample_rate=sample_rate)
+        url = f"{self._url}?{urlencode(params)}"
+        headers = {"Authorization": f"Token {self._api_key}"} if self._api_key else {}
+        print(f">>> Connecting to Deepgram: {url}")
+        try:
+            self._ws = await websockets.connect(url, additional_headers=headers)
+        except TypeError:
+            # websockets < 14 names the argument extra_headers
+            self._ws = await websockets.connect(url, extra_headers=headers)
+        self._sample_rate = sample_rate
+        self._last_send = self._loop.time()
+        self._receiver_task = self._loop.create_task(self._receiver(self._ws))
+        print(">>> Deepgram connection open")
+
+    async def _receiver(self, ws):
+        try:
+            async for message in ws:
+                if isinstance(message, bytes):
+                    continue
+                self._handle_message(json.loads(message))
+        except websockets.ConnectionClosed as e:
+            print(f">>> Deepgram connection closed: {e}")
+        except Exception as e:
+            print(f"!!! Error receiving from Deepgram: {e}")
+        finally:
+            if self._ws is ws:
+                self._ws = None
+                self._sample_rate = None
+            if self._finalize_future is not None:
+                self._resolve_finalize(self._finalize_future)
+
+    def _handle_message(self, message: dict):
+        if message.get("type") != "Results":
+            return
+
+        alternatives = message.get("channel", {}).get("alternatives", [])
+        transcript = alternatives[0].get("transcript", "") if alternatives else ""
+        is_final = message.get("is_final", False)
+
+        if is_final and transcript:
+            self._final_parts.append(transcript)
+        if self._on_transcript and (transcript or is_final):
+            running = self._joined_transcript()
+            if not is_final and transcript:
+                running = f"{running} {transcript}".strip()
+            try:
+                self._on_transcript(running, is_final)
+            except Exception as e:
+                print(f"!!! Error in transcript callback: {e}")
+
+        if message.get("from_finalize") and self._finalize_future is not None:
+            self._resolve_finalize(self._finalize_future)
+
+    def _resolve_finalize(self, future: concurrent.futures.Future):
+        if not future.done():
+            future.set_result(self._joined_transcript())
+        if self._finalize_future is future:
+            self._finalize_future = None
+
+    def _joined_transcript(self) -> str:
+        return " ".join(self._final_parts).strip()
+
+    async def _keepalive(self):
+        """Keep the idle connection open between utterances"""
+        while True:
+            await asyncio.sleep(1.0)
+            idle = self._loop.time() - self._last_send
+            if self._ws is not None and idle >= self._keepalive_interval:
+                try:
+                    await self._ws.send(json.dumps({"type": "KeepAlive"}))
+                    self._last_send = self._loop.time()
+                except Exception as e:
+                    print(f"!!! Deepgram keep-alive failed: {e}")
+
+    async def _close(self):
+        ws, self._ws = self._ws, None
+        self._sample_rate = None
+        if ws is not None:
+            try:
+                await ws.send(json.dumps({"type": "CloseStream"}))
+                await ws.close()
+            except Exception:
+                pass
+        if self._receiver_task is not None:
+            self._receiver_task.cancel()
+            self._receiver_task = None
@@ -1,37 +1,71 @@
-from core.interfaces.speech import TextToSpeechProvider
-import requests
+from core.interfaces.speech import AudioChunk, TextToSpeechProvider
+from typing import AsyncIterator, Optional
+import httpx
 import os
 import asyncio
 import io
+import wave
 from pydub import AudioSegment
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class ElevenLabsProvider(TextToSpeechProvider):
     API_BASE = "https://api.elevenlabs.io/v1"
     CHUNK_SIZE = 1024
+    STREAM_SAMPLE_RATE = 44100  # Rate streamed MP3 is decoded to
+    PCM_READ_SIZE = 4096  # Decoded bytes per streamed chunk (~46 ms)
+    SECONDS_PER_CHAR = 0.08  # Rough speech duration, used to size buffers
 
     def __init__(self, config: dict = None):
         """Initialize ElevenLabs provider
 
+        The provider owns one pooled async HTTP client, so consecutive
+        utterances reuse a warm TCP/TLS connection (HTTP/2 when the h2
+        package is installed). Call warmup() at startup to open it early.
+
         Args:
             config: Dictionary containing:
                 - api_key: ElevenLabs API key
+                - api_base: API root URL (e.g. a local mock server)
                 - model_id: Model ID to use
                 - voice_id: Voice ID to use
                 - voice_settings: Dict of voice settings
+                - output_format: pcm_16000, pcm_22050, pcm_24000 or pcm_44100
+                  for raw PCM (default: pcm_22050); mp3_* formats are decoded
+                  with ffmpeg and only kept as a fallback
+                - http2: Use HTTP/2 when available (default: True)
+                - max_connections: Connection pool size (default: 4)
+                - timeout: Seconds to wait for connect and each read
         """
         if config is None:
             config = {}
 
         # Set API key from environment or config
+        self._api_base = config.get("api_base", self.API_BASE).rstrip("/")
         self._api_key = os.getenv("ELEVENLABS_API_KEY") or config.get("api_key")
-        if not self._api_key:
+        if not self._api_key and self._api_base == self.API_BASE:
             raise ValueError("ElevenLabs API key not found in environment or config")
 
         self._config = config
         self._model_id = config.get("model_id", "eleven_monolingual_v1")
         self._voice_id = config.get("voice_id")
 
+        self._output_format = config.get("output_format", "pcm_22050")
+        codec, _, rate = self._output_format.partition("_")
+        rate = rate.split("_")[0]  # mp3_44100_128 carries a bitrate too
+        if codec not in ("pcm", "mp3") or not rate.isdigit():
+            raise ValueError(
+                f"Unsupported ElevenLabs output format: {self._output_format}"
+            )
+        # Raw PCM needs no decoding; MP3 is decoded to STREAM_SAMPLE_RATE
+        self._pcm_rate = int(rate) if codec == "pcm" else None
+
         # Store voice settings
         voice_settings = config.get("voice_settings", {})
         self._voice_settings = {
@@ -41,6 +75,53 @@ class ElevenLabsProvider(TextToSpeechProvider):
             "use_speaker_boost": voice_settings.get("speaker_boost", True),
         }
 
+        self._http2 = config.get("http2", True) and HTTP2_AVAILABLE
+        self._limits = httpx.Limits(
+            max_connections=config.get("max_connections", 4),
+            max_keepalive_connections=config.get("max_connections", 4),
+            keepalive_expiry=60.0,
+        )
+        self._timeout = httpx.Timeout(config.get("timeout", 30.0))
+        # Created on first use so it binds to the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            headers = {"xi-api-key": self._api_key} if self._api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self._api_base,
+                headers=headers,
+                http2=self._http2,
+                limits=self._limits,
+                timeout=self._timeout,
+            )
+        return self._client
+
+    async def warmup(self) -> None:
+        """Open a pooled connection ahead of the first synthesis"""
+        try:
+            response = await self._get_client().get("/models")
+            print(
+                f">>> ElevenLabs connection ready ({response.http_version}, "
+                f"status {response.status_code})"
+            )
+        except Exception as e:
+            print(f"!!! ElevenLabs pre-connect failed: {e}")
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def cache_identity(self, ref_audio: str = None) -> dict:
+        return {
+            "voice_id": self._voice_id,
+            "model_id": self._model_id,
+            "voice_settings": self._voice_settings,
+            "output_format": self._output_format,
+        }
+
     async def synthesize(self, text: str, ref_audio: str = None) -> bytes:
         """Synthesize speech using ElevenLabs API
 
@@ -54,41 +135,163 @@ class ElevenLabsProvider(TextToSpeechProvider):
             print(f"    Similarity Boost: {self._voice_settings['similarity_boost']}")
             print(f"    Style: {self._voice_settings['style']}")
             print(f"    Speaker Boost: {self._voice_settings['use_speaker_boost']}")
+            print(f">>> Output format: {self._output_format}")
+
+            rate = self._pcm_rate or self.STREAM_SAMPLE_RATE
+            size_hint = int(len(text) * self.SECONDS_PER_CHAR * rate * 2)
 
-            # Set up request
-            url = f"{self.API_BASE}/text-to-speech/{self._voice_id}/stream"
-            headers = {"Accept": "application/json", "xi-api-key": self._api_key}
-            data = {
+            async with self._stream_request(text) as response:
+                await self._raise_for_status(response)
+                audio = await self._collect(
+                    response.aiter_bytes(self.CHUNK_SIZE), size_hint
+                )
+
+            if self._pcm_rate:
+                audio_data = self._pcm_to_wav(audio, self._pcm_rate)
+            else:
+                # Fallback: convert MP3 to WAV (ffmpeg, so off the event loop)
+                audio_data = await asyncio.get_running_loop().run_in_executor(
+                    None, self._mp3_to_wav, audio
+                )
+
+            print(f">>> ElevenLabs synthesis complete ({len(audio_data)} bytes WAV)")
+            return audio_data
+
+        except Exception as e:
+            print(f"!!! Error in ElevenLabs synthesis: {e}")
+            raise
+
+    @staticmethod
+    async def _collect(chunks: AsyncIterator[bytes], size_hint: int) -> memoryview:
+        """Gather streamed chunks into one buffer allocated up front
+
+        The buffer is sized from the expected audio length and doubled when
+        a response turns out longer, so a reply costs a handful of
+        allocations instead of a new bytes object per chunk.
+        """
+        buffer = bytearray(max(size_hint, 4096))
+        length = 0
+        async for chunk in chunks:
+            end = length + len(chunk)
+            if end > len(buffer):
+                buffer.extend(bytes(max(len(buffer), end - len(buffer))))
+            buffer[length:end] = chunk
+            length = end
+        return memoryview(buffer)[:length]
+
+    @staticmethod
+    def _pcm_to_wav(pcm, sample_rate: int) -> bytes:
+        """Wrap 16-bit mono PCM in a WAV header"""
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(pcm)
+        return wav_buffer.getvalue()
+
+    @staticmethod
+    def _mp3_to_wav(mp3) -> bytes:
+        audio_segment = AudioSegment.from_mp3(io.BytesIO(mp3))
+        wav_buffer = io.BytesIO()
+        audio_segment.export(wav_buffer, format="wav")
+        return wav_buffer.getvalue()
+
+    def _stream_request(self, text: str):
+        """Open a streamed POST to the /stream endpoint"""
+        return self._get_client().stream(
+            "POST",
+            f"/text-to-speech/{self._voice_id}/stream",
+            json={
                 "text": text,
                 "model_id": self._model_id,
                 "voice_settings": self._voice_settings,
-            }
-
-            # Make request in thread pool since it's blocking
-            def make_request():
-                response = requests.post(url, headers=headers, json=data, stream=True)
-                if not response.ok:
-                    raise RuntimeError(f"ElevenLabs API error: {response.text}")
-
-                # Read all chunks into bytes
-                audio_data = b""
-                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
-                    audio_data += chunk
-
-                # Convert MP3 to WAV
-                audio_segment = AudioSegment.from_mp3(io.BytesIO(audio_data))
-                wav_buffer = io.BytesIO()
-                audio_segment.export(wav_buffer, format="wav")
-                return wav_buffer.getvalue()
-
-            # Run in thread pool
-            audio_data = await asyncio.get_event_loop().run_in_executor(
-                None, make_request
+            },
+            params={"output_format": self._output_format},
+        )
+
+    @staticmethod
+    async def _raise_for_status(response: httpx.Response) -> None:
+        if response.is_error:
+            body = await response.aread()
+            raise RuntimeError(
+                f"ElevenLabs API error {response.status_code}: "
+                f"{body.decode(errors='replace')}"
             )
 
-            print(">>> Successfully converted audio to WAV format")
-            return audio_data
+    async def synthesize_stream(
+        self, text: str, ref_audio: str = None
+    ) -> AsyncIterator[AudioChunk]:
+        """Yield 16-bit mono PCM as soon as it arrives from the network stream
 
+        PCM output formats are passed straight through. MP3 bytes are piped
+        into an ffmpeg process as they arrive and decoded PCM is read back
+        from it. Either way playback can begin on the first frames instead of
+        after the whole response has been downloaded.
+
+        Note: ref_audio is ignored as ElevenLabs uses predefined voices
+        """
+        print(f">>> ElevenLabs streaming synthesis with voice_id: {self._voice_id}")
+        try:
+            async with self._stream_request(text) as response:
+                await self._raise_for_status(response)
+                network_chunks = response.aiter_bytes(self.CHUNK_SIZE)
+                if self._pcm_rate:
+                    pcm_chunks = network_chunks
+                else:
+                    pcm_chunks = self._decode_mp3_stream(network_chunks)
+
+                rate = self._pcm_rate or self.STREAM_SAMPLE_RATE
+                remainder = b""
+                first = True
+                async for pcm in pcm_chunks:
+                    # Only hand out whole 16-bit samples
+                    pcm = remainder + pcm
+                    usable = len(pcm) - len(pcm) % 2
+                    remainder = pcm[usable:]
+                    if not usable:
+                        continue
+                    if first:
+                        print(">>> ElevenLabs first audio received")
+                        first = False
+                    yield AudioChunk(pcm[:usable], rate)
+            print(">>> ElevenLabs streaming synthesis complete")
         except Exception as e:
-            print(f"!!! Error in ElevenLabs synthesis: {e}")
+            print(f"!!! Error in ElevenLabs streaming synthesis: {e}")
             raise
+
+    async def _decode_mp3_stream(
+        self, mp3_chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Decode an MP3 byte stream to PCM through an ffmpeg pipe"""
+        decoder = await asyncio.create_subprocess_exec(
+            AudioSegment.converter,
+            *("-loglevel", "error", "-f", "mp3", "-i", "pipe:0"),
+            *("-f", "s16le", "-ac", "1", "-ar", str(self.STREAM_SAMPLE_RATE)),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+
+        async def feed_decoder():
+            try:
+                async for chunk in mp3_chunks:
+                    decoder.stdin.write(chunk)
+                    await decoder.stdin.drain()
+            finally:
+                decoder.stdin.close()
+
+        feeder = asyncio.get_running_loop().create_task(feed_decoder())
+        try:
+            while True:
+                pcm = await decoder.stdout.read(self.PCM_READ_SIZE)
+                if not pcm:
+                    break
+                yield pcm
+            # Surface download errors that ended the stream early
+            await feeder
+        finally:
+            feeder.cancel()
+            if decoder.returncode is None:
+                decoder.kill()
+            await decoder.wait()
@@ -0,0 +1,451 @@
+import asyncio
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, List, Optional
+import numpy as np
+from utils.lru_cache import LRUCache
+from .audio_utils import float32_to_wav
+
+# Model names understood by the old CLI, as named by newer f5-tts releases
+LEGACY_MODEL_NAMES = {"F5-TTS": "F5TTS_Base", "E2-TTS": "E2TTS_Base"}
+
+
+@dataclass
+class ReferenceVoice:
+    """A reference clip prepared for conditioning, reused across utterances"""
+
+    path: str
+    ref_text: str
+    audio: Any  # Mono torch tensor at the model's sample rate, on its device
+    sample_rate: int
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+
+
+class ReferenceTranscripts:
+    """Persistent transcripts of reference clips, keyed by content hash
+
+    A ``<clip>.txt`` file next to the clip always wins. Otherwise the text
+    F5's own ASR produced the first time the clip was used is reused, so
+    each clip is only ever transcribed once.
+    """
+
+    def __init__(self, path: str = "resources/cache/f5_reference_text.json"):
+        self._path = path
+        self._lock = threading.Lock()
+        self._texts = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._texts = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"!!! Could not read reference transcripts: {e}")
+
+    def get(self, ref_file: str, digest: Optional[str] = None) -> str:
+        sidecar = os.path.splitext(ref_file)[0] + ".txt"
+        if os.path.exists(sidecar):
+            with open(sidecar, "r", encoding="utf-8") as f:
+                return f.read().strip()
+        return self._texts.get(digest or file_digest(ref_file), "")
+
+    def put(self, digest: str, text: str) -> None:
+        with self._lock:
+            if self._texts.get(digest) == text:
+                return
+            self._texts[digest] = text
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            with open(self._path, "w", encoding="utf-8") as f:
+                json.dump(self._texts, f, indent=2)
+
+
+def _is_out_of_memory(error: Exception) -> bool:
+    """Whether torch failed to allocate, on CUDA or on the CPU"""
+    message = str(error).lower()
+    return "out of memory" in message or "can't allocate memory" in message
+
+
+def cross_fade(waves: List[np.ndarray], sample_rate: int, seconds: float) -> np.ndarray:
+    """Join consecutive waves with a linear cross-fade, as F5's own joiner does"""
+    result = waves[0]
+    for wave in waves[1:]:
+        overlap = min(int(seconds * sample_rate), len(result), len(wave))
+        if overlap <= 0:
+            result = np.concatenate([result, wave])
+            continue
+        fade_in = np.linspace(0, 1, overlap, dtype=np.float32)
+        mixed = result[-overlap:] * (1 - fade_in) + wave[:overlap] * fade_in
+        result = np.concatenate([result[:-overlap], mixed, wave[overlap:]])
+    return result
+
+
+class SynthesisCancelled(Exception):
+    """Raised on the inference thread when the request was cancelled"""
+
+
+class _NoProgress:
+    """Stands in for tqdm in infer_batch_process so it prints no bar"""
+
+    @staticmethod
+    def tqdm(iterable, *args, **kwargs):
+        return iterable
+
+
+class F5Engine:
+    """Keeps one F5-TTS model and vocoder loaded in this process
+
+    Loading happens once, on first use or on warmup(), on dedicated
+    inference threads so the event loop never waits on torch. Reference
+    clips are trimmed, transcribed, resampled and moved to the model's
+    device once per file version and then reused. Synthesized audio is
+    returned as in-memory WAV.
+    """
+
+    def __init__(
+        self,
+        model: str = "F5-TTS",
+        device: Optional[str] = None,
+        transcripts: Optional[ReferenceTranscripts] = None,
+        max_voices: int = 8,
+        workers: int = 1,
+        batch_size: int = 4,
+    ):
+        self._model_name = model
+        self._device = device
+        self._tts = None
+        self._load_lock = threading.Lock()
+        self._transcripts = transcripts or ReferenceTranscripts()
+        # (path, mtime, size) -> ReferenceVoice
+        self._voices = LRUCache(max_entries=max_voices)
+        # Utterances sampled in one forward pass; lowered if memory runs out
+        self._batch_size = max(1, batch_size)
+        # Inference threads share the model; torch releases the GIL
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="f5tts"
+        )
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether the f5_tts package can be imported"""
+        return importlib.util.find_spec("f5_tts") is not None
+
+    def _load(self):
+        with self._load_lock:
+            if self._tts is not None:
+                return self._tts
+
+            from f5_tts.api import F5TTS
+
+            print(f">>> Loading F5-TTS model {self._model_name}")
+            start = time.perf_counter()
+            try:
+                # Older releases take model_type with the CLI-style name
+                self._tts = F5TTS(model_type=self._model_name, device=self._device)
+            except TypeError:
+                name = LEGACY_MODEL_NAMES.get(self._model_name, self._model_name)
+                self._tts = F5TTS(model=name, device=self._device)
+            print(
+                f">>> F5-TTS model loaded on {self._tts.device} "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+            return self._tts
+
+    async def warmup(self) -> None:
+        """Load the model ahead of the first synthesis"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._load)
+
+    def _reference(self, ref_file: str) -> ReferenceVoice:
+        """Prepare a reference clip, or return it from the cache"""
+        stat = os.stat(ref_file)
+        key = (os.path.abspath(ref_file), stat.st_mtime, stat.st_size)
+        voice = self._voices.get(key)
+        if voice is not None:
+            return voice
+
+        import torchaudio
+        from f5_tts.infer.utils_infer import preprocess_ref_audio_text
+
+        tts = self._load()
+        start = time.perf_counter()
+        digest = file_digest(ref_file)
+        known_text = self._transcripts.get(ref_file, digest)
+        clip_file, ref_text = preprocess_ref_audio_text(
+            ref_file, known_text, show_info=lambda *args: None
+        )
+        if not known_text:
+            self._transcripts.put(digest, ref_text)
+
+        audio, sample_rate = torchaudio.load(clip_file)
+        if audio.shape[0] > 1:
+            audio = audio.mean(dim=0, keepdim=True)
+        target_rate = getattr(tts, "target_sample_rate", 24000)
+        if sample_rate != target_rate:
+            audio = torchaudio.transforms.Resample(sample_rate, target_rate)(audio)
+        voice = ReferenceVoice(ref_file, ref_text, audio.to(tts.device), target_rate)
+        self._voices.put(key, voice)
+        print(
+            f">>> Prepared F5-TTS reference {os.path.basename(ref_file)} in "
+            f"{time.perf_counter() - start:.2f}s "
+            f"({'transcript cached' if known_text else 'transcribed'})"
+        )
+        return voice
+
+    @staticmethod
+    def _max_chars(voice: ReferenceVoice) -> int:
+        """Longest text piece generated alongside this reference clip
+
+        Same rule as f5_tts.infer.utils_infer.infer_process: reference plus
+        generated audio should stay within about 22 seconds.
+        """
+        ref_seconds = voice.audio.shape[-1] / voice.sample_rate
+        return int(
+            len(voice.ref_text.encode("utf-8")) / ref_seconds * (22 - ref_seconds)
+        )
+
+    def _infer(
+        self,
+        ref_file: str,
+        gen_text: str,
+        on_progress: Optional[Callable[[int], None]],
+        cancelled: threading.Event,
+    ) -> bytes:
+        from f5_tts.infer.utils_infer import (
+            chunk_text,
+            cross_fade_duration,
+            infer_batch_process,
+        )
+
+        tts = self._load()
+        voice = self._reference(ref_file)
+        start = time.perf_counter()
+
+        # One piece per call: how infer_batch_process walks its batches
+        # differs between f5_tts releases (newer ones run them all on a
+        # thread pool), so progress and cancellation are handled here
+        pieces = chunk_text(gen_text, max_chars=self._max_chars(voice))
+        waves = []
+        for index, piece in enumerate(pieces):
+            if cancelled.is_set():
+                raise SynthesisCancelled()
+            result = infer_batch_process(
+                (voice.audio, voice.sample_rate),
+                voice.ref_text,
+                [piece],
+                tts.ema_model,
+                tts.vocoder,
+                mel_spec_type=tts.mel_spec_type,
+                progress=_NoProgress,
+                device=tts.device,
+            )
+            if inspect.isgenerator(result):
+                # Newer releases return a generator so they can stream
+                result = next(result)
+            waves.append(result[0])
+            if on_progress:
+                on_progress(int(100 * (index + 1) / len(pieces)))
+
+        sample_rate = voice.sample_rate
+        wav = cross_fade(
+            waves or [np.zeros(0, dtype=np.float32)], sample_rate, cross_fade_duration
+        )
+
+        elapsed = time.perf_counter() - start
+        duration = len(wav) / sample_rate
+        print(
+            f">>> F5-TTS generated {duration:.1f}s of audio in {elapsed:.2f}s "
+            f"(RTF {elapsed / max(duration, 1e-6):.2f})"
+        )
+        return float32_to_wav(wav, sample_rate)
+
+    async def synthesize(
+        self,
+        ref_file: str,
+        gen_text: str,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> bytes:
+        """Generate speech for gen_text in the voice of ref_file, as WAV bytes
+
+        Args:
+            ref_file: Reference clip whose voice is cloned
+            gen_text: Text to speak
+            on_progress: Called with a percentage from the inference thread
+
+        Cancelling the awaiting task stops inference before the next piece.
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        try:
+            return await loop.run_in_executor(
+                self._executor, self._infer, ref_file, gen_text, on_progress, cancelled
+            )
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def _plan_batch(self, ref_file: str, texts: List[str]) -> tuple:
+        """Sample rate, and (text index, piece) for every model-sized piece"""
+        from f5_tts.infer.utils_infer import chunk_text
+
+        voice = self._reference(ref_file)
+        max_chars = self._max_chars(voice)
+        plan = [
+            (index, piece)
+            for index, text in enumerate(texts)
+            for piece in chunk_text(text, max_chars=max_chars)
+        ]
+        return voice.sample_rate, plan
+
+    def _sample(self, voice: ReferenceVoice, pieces: List[str]) -> List[np.ndarray]:
+        """Generate all pieces in one batched sampling pass
+
+        Mirrors the per-piece steps of infer_batch_process, but the reference
+        clip is repeated along the batch axis and every piece gets its own
+        duration, so the model pads to the longest and masks the rest.
+        """
+        import torch
+        from f5_tts.infer.utils_infer import (
+            cfg_strength,
+            convert_char_to_pinyin,
+            hop_length,
+            nfe_step,
+            sway_sampling_coef,
+            target_rms,
+        )
+
+        tts = self._load()
+        audio = voice.audio
+        rms = torch.sqrt(torch.mean(torch.square(audio)))
+        if rms < target_rms:
+            audio = audio * target_rms / rms
+        ref_text = voice.ref_text
+        if ref_text and len(ref_text[-1].encode("utf-8")) == 1:
+            ref_text += " "
+
+        ref_frames = audio.shape[-1] // hop_length
+        ref_bytes = max(1, len(ref_text.encode("utf-8")))
+        durations = [
+            ref_frames + int(ref_frames / ref_bytes * len(piece.encode("utf-8")))
+            for piece in pieces
+        ]
+
+        with torch.inference_mode():
+            generated, _ = tts.ema_model.sample(
+                cond=audio.repeat(len(pieces), 1),
+                text=convert_char_to_pinyin([ref_text + piece for piece in pieces]),
+                duration=torch.tensor(durations, device=tts.device),
+                steps=nfe_step,
+                cfg_strength=cfg_strength,
+                sway_sampling_coef=sway_sampling_coef,
+            )
+            waves = []
+            # Vocode one by one so padding never leaks into the audio
+            for row, frames in enumerate(durations):
+                mel = generated[row : row + 1, ref_frames:frames, :]
+                mel = mel.to(torch.float32).permute(0, 2, 1)
+                if tts.mel_spec_type == "vocos":
+                    wave = tts.vocoder.decode(mel)
+                else:
+                    wave = tts.vocoder(mel)
+                if rms < target_rms:
+                    wave = wave * rms / target_rms
+                waves.append(wave.squeeze().cpu().numpy())
+        return waves
+
+    def _sample_fitting(
+        self, ref_file: str, pieces: List[str], cancelled: threading.Event
+    ) -> List[np.ndarray]:
+        """Sample pieces, halving the batch for good when memory runs out"""
+        import torch
+
+        if cancelled.is_set():
+            raise SynthesisCancelled()
+        voice = self._reference(ref_file)
+        try:
+            return self._sample(voice, pieces)
+        except (RuntimeError, MemoryError) as e:
+            if len(pieces) == 1 or not _is_out_of_memory(e):
+                raise
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            half = (len(pieces) + 1) // 2
+            self._batch_size = min(self._batch_size, half)
+            print(f"!!! F5-TTS out of memory, batch size lowered to {half}")
+            return self._sample_fitting(
+                ref_file, pieces[:half], cancelled
+            ) + self._sample_fitting(ref_file, pieces[half:], cancelled)
+
+    async def synthesize_batch(
+        self,
+        ref_file: str,
+        texts: List[str],
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Generate several texts in one voice, yielding WAV bytes in order
+
+        Texts are cut into model-sized pieces as in synthesize(), and up to
+        ``batch_size`` pieces are sampled in one forward pass. Each text is
+        yielded as soon as it and every text before it are complete.
+        Cancelling the consumer stops after the current forward pass.
+        """
+        from f5_tts.infer.utils_infer import cross_fade_duration
+
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        try:
+            sample_rate, plan = await loop.run_in_executor(
+                self._executor, self._plan_batch, ref_file, texts
+            )
+            waves = [[] for _ in texts]
+            remaining = [0] * len(texts)
+            for index, _ in plan:
+                remaining[index] += 1
+
+            next_text = 0
+            done = 0
+            start = time.perf_counter()
+            while next_text < len(texts):
+                if remaining[next_text] == 0:
+                    pieces = waves[next_text] or [np.zeros(0, dtype=np.float32)]
+                    waves[next_text] = None
+                    next_text += 1
+                    yield float32_to_wav(
+                        cross_fade(pieces, sample_rate, cross_fade_duration),
+                        sample_rate,
+                    )
+                    continue
+
+                group = plan[done : done + self._batch_size]
+                group_waves = await loop.run_in_executor(
+                    self._executor,
+                    self._sample_fitting,
+                    ref_file,
+                    [piece for _, piece in group],
+                    cancelled,
+                )
+                for (index, _), wave in zip(group, group_waves):
+                    waves[index].append(wave)
+                    remaining[index] -= 1
+                done += len(group)
+                if on_progress:
+                    on_progress(int(100 * done / len(plan)))
+
+            elapsed = time.perf_counter() - start
+            print(
+                f">>> F5-TTS batch: {len(texts)} texts in {len(plan)} pieces, "
+                f"{elapsed:.2f}s"
+            )
+        finally:
+            cancelled.set()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -1,11 +1,23 @@
-import subprocess
+import asyncio
+import codecs
+import glob
 import os
+import re
+import shlex
 import shutil
-from typing import Optional
-import pipes  # For proper shell escaping
+import tempfile
+from typing import AsyncIterator, List, Optional
+from core.events import Event, EventBus, EventType
+from core.interfaces.speech import TextToSpeechProvider
+from .f5_engine import F5Engine, ReferenceTranscripts, file_digest
 
+# tqdm progress as printed by f5-tts_infer-cli, e.g. " 45%|████▌     | 9/20"
+PROGRESS_PATTERN = re.compile(r"(\d{1,3})%\|")
+# Reference transcript as echoed by the CLI after its ASR, e.g. "ref_text  Hi."
+REF_TEXT_PATTERN = re.compile(r"^ref_text\s*:?\s+(.+)$")
 
-class F5TTSProvider:
+
+class F5TTSProvider(TextToSpeechProvider):
     def __init__(self, config: dict = None, **kwargs):
         """Initialize F5TTS provider
 
@@ -13,6 +25,14 @@ class F5TTSProvider:
             config: Dictionary that may contain:
                 - model: Name of F5-TTS model to use
                 - reference_audio_dir: Directory containing reference audio files
+                - engine: "in_process" keeps the model loaded in this process
+                  (default, needs the f5_tts package); "cli" runs
+                  f5-tts_infer-cli for every utterance
+                - device: Torch device for the in-process engine
+                - workers: Requests synthesized at once (default: 1); the
+                  rest wait in a queue. In-process workers share one model.
+                - batch_size: Utterances the in-process engine samples in one
+                  forward pass for synthesize_batch (default: 4)
             **kwargs: Legacy support for direct parameters
         """
         if config is None:
@@ -32,94 +52,275 @@ class F5TTSProvider:
         self._ref_audio_dir = self._config.get("reference_audio_dir", "reference_audio")
         self._output_dir = "resources/audio/f5tts"
         os.makedirs(self._output_dir, exist_ok=True)
+        self._ref_digests = {}  # (path, mtime, size) -> content hash
+
+        # Requests beyond the worker count wait here in arrival order
+        self.max_concurrency = max(1, self._config.get("workers", 1))
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._waiting = 0
+
+        self._transcripts = ReferenceTranscripts()
+        self._engine = None
+        engine = self._config.get("engine", "in_process")
+        if engine == "in_process":
+            if F5Engine.is_available():
+                self._engine = F5Engine(
+                    self._model,
+                    self._config.get("device"),
+                    self._transcripts,
+                    workers=self.max_concurrency,
+                    batch_size=self._config.get("batch_size", 4),
+                )
+            else:
+                print("!!! f5_tts package not importable, falling back to the CLI")
+        print(f">>> F5-TTS using {'in-process engine' if self._engine else 'CLI'}")
+
+        # Only the in-process engine can sample several utterances at once
+        self.supports_batch = self._engine is not None
+
+    async def warmup(self) -> None:
+        """Load the in-process model ahead of the first synthesis"""
+        if self._engine:
+            await self._engine.warmup()
+
+    async def aclose(self) -> None:
+        """Stop the in-process engine's inference threads"""
+        if self._engine:
+            self._engine.close()
+
+    def _resolve_ref_audio(self, ref_audio: Optional[str]) -> Optional[str]:
+        if not ref_audio and os.path.exists(self._ref_audio_dir):
+            # Use first wav file in reference directory
+            wav_files = [
+                f for f in os.listdir(self._ref_audio_dir) if f.endswith(".wav")
+            ]
+            if wav_files:
+                ref_audio = os.path.join(self._ref_audio_dir, wav_files[0])
+        return ref_audio
+
+    def cache_identity(self, ref_audio: Optional[str] = None) -> dict:
+        """Model plus the reference audio contents and transcript"""
+        ref_audio = self._resolve_ref_audio(ref_audio)
+        digest = self._ref_digest(ref_audio)
+        ref_text = self._transcripts.get(ref_audio, digest) if digest else ""
+        return {"model": self._model, "ref_audio": digest, "ref_text": ref_text}
+
+    def _ref_digest(self, ref_audio: Optional[str]) -> Optional[str]:
+        """Content hash of a reference clip, computed once per file version"""
+        if not ref_audio or not os.path.exists(ref_audio):
+            return None
+        stat = os.stat(ref_audio)
+        signature = (ref_audio, stat.st_mtime, stat.st_size)
+        digest = self._ref_digests.get(signature)
+        if digest is None:
+            digest = file_digest(ref_audio)
+            self._ref_digests[signature] = digest
+        return digest
+
+    async def _acquire_slot(self) -> None:
+        if self._slots.locked():
+            print(f">>> F5-TTS busy, request queued ({self._waiting + 1} waiting)")
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
 
     async def synthesize(self, text: str, ref_audio: Optional[str] = None) -> bytes:
         """Synthesize speech from text using F5-TTS"""
         try:
-            if not ref_audio and os.path.exists(self._ref_audio_dir):
-                # Use first wav file in reference directory
-                wav_files = [
-                    f for f in os.listdir(self._ref_audio_dir) if f.endswith(".wav")
-                ]
-                if wav_files:
-                    ref_audio = os.path.join(self._ref_audio_dir, wav_files[0])
-                    print(f">>> Using reference audio: {ref_audio}")
-
-            # Remove existing output file
-            output_file = os.path.join(self._output_dir, "infer_cli_out.wav")
-            if os.path.exists(output_file):
-                print(">>> Removing existing output file")
-                os.remove(output_file)
-
-            print("\n=== Generating speech with F5-TTS ===")
-            print(f">>> Model: {self._model}")
+            ref_audio = self._resolve_ref_audio(ref_audio)
+            if ref_audio:
+                print(f">>> Using reference audio: {ref_audio}")
+
+            await self._acquire_slot()
+            try:
+                print("\n=== Generating speech with F5-TTS ===")
+                print(f">>> Model: {self._model}")
+                print(f">>> Reference audio: {ref_audio}")
+                print(f">>> Text: {text}")
+
+                if self._engine:
+                    if not ref_audio:
+                        raise ValueError("F5-TTS needs a reference audio file")
+                    audio_data = await self._engine.synthesize(
+                        ref_audio, text, self._progress_reporter()
+                    )
+                    print(f">>> Generated {len(audio_data)} bytes of audio in memory")
+                    return audio_data
+
+                return await self._synthesize_cli(text, ref_audio)
+            finally:
+                self._slots.release()
+
+        except asyncio.CancelledError:
+            print(">>> F5-TTS synthesis cancelled")
+            raise
+        except Exception as e:
+            print(f"!!! Error in F5-TTS synthesis: {e}")
+            raise
+
+    async def synthesize_batch(
+        self, texts: List[str], ref_audio: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Synthesize several texts in one voice, yielding WAV bytes in order
+
+        With the in-process engine the texts share batched forward passes
+        and occupy a single worker slot. Otherwise each text is synthesized
+        in turn.
+        """
+        if not self._engine:
+            for text in texts:
+                yield await self.synthesize(text, ref_audio)
+            return
+
+        ref_audio = self._resolve_ref_audio(ref_audio)
+        if not ref_audio:
+            raise ValueError("F5-TTS needs a reference audio file")
+
+        await self._acquire_slot()
+        try:
+            print(f"\n=== Generating {len(texts)} utterances with F5-TTS ===")
             print(f">>> Reference audio: {ref_audio}")
-            print(f">>> Text: {text}")
-            print(f">>> Output dir: {self._output_dir}")
+            async for audio_data in self._engine.synthesize_batch(
+                ref_audio, texts, self._progress_reporter()
+            ):
+                yield audio_data
+        finally:
+            self._slots.release()
 
-            # Properly escape the text and ref_audio path for shell
-            escaped_text = pipes.quote(text)
-            escaped_ref_audio = pipes.quote(ref_audio) if ref_audio else ""
+    def _progress_reporter(self):
+        """Return a thread-safe callback that emits SYNTHESIS_PROGRESS events"""
+        loop = asyncio.get_running_loop()
+        event_bus = EventBus.get_instance()
+        last = {"percent": None}
 
-            # Build command with properly escaped arguments
-            cmd = f"f5-tts_infer-cli --model {self._model}"
-            if ref_audio:
-                cmd += f" --ref_audio {escaped_ref_audio}"
-            cmd += f' --ref_text "" --gen_text {escaped_text} --output "{self._output_dir}"'
-
-            print(f">>> Executing command: {cmd}")
-
-            # Execute F5-TTS
-            process = subprocess.Popen(
-                cmd,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+        def report(percent: int):
+            if percent == last["percent"]:
+                return
+            last["percent"] = percent
+            event = Event(
+                EventType.SYNTHESIS_PROGRESS,
+                data={"provider": "f5tts", "percent": percent},
+            )
+            loop.call_soon_threadsafe(
+                lambda: loop.create_task(event_bus.emit(event))
             )
-            stdout, stderr = process.communicate()
 
-            if stdout:
-                print(f">>> F5-TTS stdout:\n{stdout}")
-            if stderr:
-                print(f">>> F5-TTS stderr:\n{stderr}")
+        return report
+
+    async def _synthesize_cli(self, text: str, ref_audio: Optional[str]) -> bytes:
+        """Run f5-tts_infer-cli into a private output directory
+
+        The child runs without a shell and without blocking the event loop.
+        Its progress bars are turned into SYNTHESIS_PROGRESS events, and
+        cancelling the calling task kills it.
+        """
+        # Each request gets its own directory so overlapping runs never
+        # overwrite or delete each other's output
+        output_dir = tempfile.mkdtemp(prefix="request_", dir=self._output_dir)
+        process = None
+        try:
+            print(f">>> Output dir: {output_dir}")
+
+            # A known transcript spares the CLI from running its own ASR
+            digest = self._ref_digest(ref_audio)
+            ref_text = self._transcripts.get(ref_audio, digest) if digest else ""
+
+            args = ["f5-tts_infer-cli", "--model", self._model]
+            if ref_audio:
+                args += ["--ref_audio", ref_audio]
+            args += ["--ref_text", ref_text, "--gen_text", text]
+            args += ["--output_dir", output_dir]
+            print(f">>> Executing command: {shlex.join(args)}")
+
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            report = self._progress_reporter()
+            stdout, stderr = await asyncio.gather(
+                self._read_output(process.stdout, "stdout", report),
+                self._read_output(process.stderr, "stderr", report),
+            )
+            await process.wait()
 
             print(f">>> Process completed with return code: {process.returncode}")
 
             if process.returncode != 0:
                 raise RuntimeError(
-                    f"F5-TTS failed with code {process.returncode}: {stderr}"
+                    f"F5-TTS failed with code {process.returncode}: "
+                    + "\n".join(stderr[-10:])
                 )
 
-            # Check if output file exists
-            print(f">>> Checking for output file at: {output_file}")
-            if not os.path.exists(output_file):
+            if digest and not ref_text:
+                # Keep what the CLI's ASR heard so the next run can skip it
+                heard = self._heard_ref_text(stdout + stderr)
+                if heard:
+                    self._transcripts.put(digest, heard)
+
+            # The file name differs between CLI versions; it is the only WAV
+            print(f">>> Checking for output file in: {output_dir}")
+            output_files = glob.glob(os.path.join(output_dir, "*.wav"))
+            if not output_files:
                 raise FileNotFoundError(
-                    f"F5-TTS did not create output file at {output_file}"
+                    f"F5-TTS did not create an output file in {output_dir}"
                 )
 
             # Read the audio data
-            with open(output_file, "rb") as f:
+            with open(output_files[0], "rb") as f:
                 audio_data = f.read()
             print(f">>> Successfully read {len(audio_data)} bytes of audio data")
 
             return audio_data
-
-        except Exception as e:
-            print(f"!!! Error in F5-TTS synthesis: {e}")
+        except asyncio.CancelledError:
+            if process is not None and process.returncode is None:
+                print(">>> Killing F5-TTS process")
+                process.kill()
+                await process.wait()
             raise
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    @staticmethod
+    def _heard_ref_text(lines: List[str]) -> Optional[str]:
+        """Reference transcript the CLI printed, if this version prints it"""
+        for line in lines:
+            match = REF_TEXT_PATTERN.match(line)
+            if match:
+                return match.group(1).strip()
+        return None
 
+    @staticmethod
+    async def _read_output(
+        stream: asyncio.StreamReader, name: str, report
+    ) -> List[str]:
+        """Echo a child stream line by line, turning progress bars into events
+
+        tqdm redraws with carriage returns, so both \\r and \\n end a line.
+        """
+        lines = []
+        pending = ""
+        # A multi-byte character may be split across reads
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        finished = False
+        while not finished:
+            data = await stream.read(1024)
+            finished = not data
+            pending += decoder.decode(data, final=finished)
+            *complete, pending = re.split(r"[\r\n]", pending)
+            if finished:
+                complete.append(pending)
+            for line in complete:
+                line = line.strip()
+                if not line:
+                    continue
+                match = PROGRESS_PATTERN.search(line)
+                if match:
+                    report(min(100, int(match.group(1))))
+                    continue
+                print(f">>> F5-TTS {name}: {line}")
+                lines.append(line)
+        return lines
 
-# TODO: F5-TTS Provider Status
-# - Basic provider structure is in place
-# - CLI command execution is set up but not producing output
-# - Need to verify:
-#   1. F5-TTS model installation
-#   2. CUDA/CPU compatibility
-#   3. Audio format compatibility
-#   4. Reference audio requirements
-# - Consider adding:
-#   1. Model download/verification
-#   2. Voice profile management
-#   3. Audio preprocessing for reference files
-#   4. Progress callbacks during generation
@@ -0,0 +1,101 @@
+from core.interfaces.speech import SpeechToTextProvider
+from .audio_utils import prepare_audio, WHISPER_SAMPLE_RATE
+from .transcription_cache import TranscriptionCache
+from faster_whisper import WhisperModel
+import time
+
+
+class FasterWhisperProvider(SpeechToTextProvider):
+    def __init__(self, config: dict = None):
+        """Initialize faster-whisper (CTranslate2) provider
+
+        Args:
+            config: Dictionary that may contain:
+                - model: Whisper model name or path (default: base.en)
+                - device: "auto", "cpu" or "cuda"
+                - compute_type: CTranslate2 compute type (default: int8)
+                - cpu_threads: Threads per decode on CPU (0 = library default)
+                - num_workers: Concurrent decodes the model supports
+                - trim_silence: Trim leading/trailing silence (default: False)
+                - cache: Transcription cache settings (see TranscriptionCache)
+        """
+        if config is None:
+            config = {}
+
+        self._config = config
+        self._model_name = config.get("model", "base.en")
+        self._trim_silence = config.get("trim_silence", False)
+
+        device = config.get("device", "auto")
+        compute_type = config.get("compute_type", "int8")
+        self.model = WhisperModel(
+            self._model_name,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=config.get("cpu_threads", 0),
+            num_workers=config.get("num_workers", 1),
+        )
+        self.last_real_time_factor = None
+
+        self._model_id = f"faster_whisper:{self._model_name}-{compute_type}"
+        self._decode_options = {
+            "language": "en",
+            "task": "transcribe",
+            "temperature": 0.0,
+            "best_of": 1,
+            "beam_size": 1,
+            "no_speech_threshold": 0.3,
+        }
+        self._cache = TranscriptionCache.from_config(config.get("cache"))
+        print(
+            f">>> faster-whisper model {self._model_name} loaded "
+            f"(device={device}, compute_type={compute_type})"
+        )
+
+    def close(self) -> None:
+        """Release the transcription cache"""
+        if self._cache:
+            self._cache.close()
+
+    def transcribe(self, audio_frames, sample_rate: int = 44100):
+        try:
+            print("\n=== Starting faster-whisper transcription ===")
+            print(f">>> Received {len(audio_frames)} audio frames")
+
+            # Same input handling as WhisperProvider
+            audio = prepare_audio(audio_frames, sample_rate, trim=self._trim_silence)
+            print(f">>> Prepared audio shape: {audio.shape}")
+
+            cache_key = None
+            if self._cache is not None:
+                cache_key = TranscriptionCache.make_key(
+                    audio, self._model_id, self._decode_options
+                )
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    print(f">>> Transcription complete: '{cached}'")
+                    return cached
+
+            start_time = time.perf_counter()
+            segments, _ = self.model.transcribe(audio, **self._decode_options)
+            # Segments are generated lazily, decoding happens while joining
+            transcribed_text = "".join(segment.text for segment in segments).strip()
+            elapsed = time.perf_counter() - start_time
+
+            duration = len(audio) / WHISPER_SAMPLE_RATE
+            if duration > 0:
+                self.last_real_time_factor = elapsed / duration
+                print(
+                    f">>> Real-time factor: {self.last_real_time_factor:.3f} "
+                    f"({elapsed:.2f}s for {duration:.2f}s of audio)"
+                )
+
+            if cache_key:
+                self._cache.put(cache_key, transcribed_text)
+
+            print(f">>> Transcription complete: '{transcribed_text}'")
+            return transcribed_text
+
+        except Exception as e:
+            print(f"!!! Error in faster-whisper transcription: {e}")
+            return None
@@ -0,0 +1,174 @@
+import asyncio
+import random
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import numpy as np
+from core.interfaces.speech import AudioChunk, TextToSpeechProvider
+
+DEFAULT_PHRASES = ["Mm-hm.", "Okay.", "Let me think.", "One moment."]
+
+
+class FillerLibrary:
+    """Short acknowledgement clips that play while the real reply is prepared
+
+    Clips are synthesized once per voice through the TTS provider and kept
+    in memory, so one can start the instant speech recognition finishes.
+    A voice is the active provider name plus the reference audio.
+    """
+
+    def __init__(
+        self,
+        provider: TextToSpeechProvider,
+        phrases: Optional[List[str]] = None,
+        crossfade_ms: int = 150,
+    ):
+        self._provider = provider
+        self._phrases = phrases or DEFAULT_PHRASES
+        self._crossfade = crossfade_ms / 1000.0
+        self._clips: Dict[Tuple[str, str], List[AudioChunk]] = {}
+        self._preparing: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._last: Optional[AudioChunk] = None
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[dict], provider: TextToSpeechProvider
+    ) -> Optional["FillerLibrary"]:
+        """Create a library from the TTS ``fillers`` config, or None if disabled"""
+        if not config or not config.get("enabled", False):
+            return None
+        return cls(
+            provider,
+            phrases=config.get("phrases"),
+            crossfade_ms=config.get("crossfade_ms", 150),
+        )
+
+    def _voice(self, ref_audio: Optional[str]) -> Tuple[str, str]:
+        active = getattr(self._provider, "get_active_provider", lambda: "")()
+        return (active, ref_audio or "")
+
+    def prepare(self, ref_audio: Optional[str] = None) -> asyncio.Task:
+        """Synthesize the clips for the current voice in the background"""
+        voice = self._voice(ref_audio)
+        task = self._preparing.get(voice)
+        if task is None:
+            task = asyncio.ensure_future(self._synthesize_all(voice, ref_audio))
+            self._preparing[voice] = task
+        return task
+
+    async def _synthesize_all(self, voice: Tuple[str, str], ref_audio: Optional[str]):
+        print(f">>> Preparing {len(self._phrases)} filler clips for {voice[0]}")
+        clips = []
+        for phrase in self._phrases:
+            try:
+                audio = await self._provider.synthesize(phrase, ref_audio)
+                clips.append(AudioChunk.from_wav(audio))
+            except Exception as e:
+                print(f"!!! Could not prepare filler '{phrase}': {e}")
+        if clips:
+            self._clips[voice] = clips
+            print(f">>> {len(clips)} filler clips ready for {voice[0]}")
+        else:
+            # Allow another attempt later, e.g. once the network is back
+            self._preparing.pop(voice, None)
+
+    def pick(self, ref_audio: Optional[str] = None) -> Optional[AudioChunk]:
+        """A random clip for the current voice, never the same one twice in a row
+
+        Returns None, and starts preparing, if the voice has no clips yet.
+        """
+        clips = self._clips.get(self._voice(ref_audio))
+        if not clips:
+            self.prepare(ref_audio)
+            return None
+        choices = [clip for clip in clips if clip is not self._last] or clips
+        self._last = random.choice(choices)
+        return self._last
+
+    async def lead_into(
+        self, filler: AudioChunk, reply: AsyncIterator[AudioChunk]
+    ) -> AsyncIterator[AudioChunk]:
+        """Yield the filler, then the reply, cross-faded where they meet
+
+        The filler's last ``crossfade_ms`` are held back until the reply's
+        first chunk arrives and mixed with it. If the reply is not ready by
+        the time the rest of the filler has played, the tail plays alone
+        and the reply follows whenever it starts.
+        """
+        frame_bytes = filler.channels * filler.sample_width
+        tail_frames = int(self._crossfade * filler.sample_rate)
+        tail_frames = min(tail_frames, len(filler.pcm) // frame_bytes // 2)
+        split = len(filler.pcm) - tail_frames * frame_bytes
+        tail = AudioChunk(
+            filler.pcm[split:],
+            filler.sample_rate,
+            filler.channels,
+            filler.sample_width,
+        )
+
+        yield AudioChunk(
+            filler.pcm[:split],
+            filler.sample_rate,
+            filler.channels,
+            filler.sample_width,
+        )
+        body_seconds = split / frame_bytes / filler.sample_rate
+
+        first = asyncio.ensure_future(reply.__anext__())
+        try:
+            done, _ = await asyncio.wait({first}, timeout=body_seconds)
+            if not done:
+                print(">>> Reply not ready, letting the filler finish")
+                yield tail
+                tail = None
+            try:
+                head = await first
+            except StopAsyncIteration:
+                if tail:
+                    yield tail
+                return
+
+            if tail and self._compatible(tail, head):
+                yield self._mix(tail, head)
+            else:
+                if tail:
+                    yield tail
+                yield head
+            async for chunk in reply:
+                yield chunk
+        finally:
+            if not first.done():
+                first.cancel()
+                # The reply generator must stop running before it can close
+                await asyncio.wait({first})
+            if hasattr(reply, "aclose"):
+                await reply.aclose()
+
+    @staticmethod
+    def _compatible(a: AudioChunk, b: AudioChunk) -> bool:
+        return (
+            a.sample_rate == b.sample_rate
+            and a.channels == b.channels
+            and a.sample_width == b.sample_width == 2
+        )
+
+    @staticmethod
+    def _mix(tail: AudioChunk, head: AudioChunk) -> AudioChunk:
+        """Fade the tail out while the head fades in over the tail's length"""
+        fading_out = np.frombuffer(tail.pcm, dtype="<i2").astype(np.float32)
+        fading_in = np.frombuffer(head.pcm, dtype="<i2").astype(np.float32)
+        overlap = min(len(fading_out), len(fading_in))
+        ramp = np.repeat(
+            np.linspace(0.0, 1.0, overlap // tail.channels, dtype=np.float32),
+            tail.channels,
+        )
+        overlap = len(ramp)
+        if not overlap:
+            return AudioChunk(
+                tail.pcm + head.pcm, head.sample_rate, head.channels, 2
+            )
+        mixed = fading_out.copy()
+        mixed[-overlap:] = (
+            fading_out[-overlap:] * (1.0 - ramp) + fading_in[:overlap] * ramp
+        )
+        pcm = np.concatenate([mixed, fading_in[overlap:]])
+        pcm = np.clip(pcm, -32768, 32767).astype("<i2").tobytes()
+        return AudioChunk(pcm, head.sample_rate, head.channels, head.sample_width)
@@ -0,0 +1,181 @@
+from core.interfaces.speech import TextToSpeechProvider
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import asyncio
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+import time
+import wave
+
+ESPEAK_BINARIES = ("espeak-ng", "espeak")
+
+
+class LocalTTSProvider(TextToSpeechProvider):
+    """Offline speech from the platform's own synthesizer
+
+    Sounds robotic next to the cloud voices, but needs no network and
+    answers in tens of milliseconds. That makes it a fallback when other
+    providers fail, and a quick voice for short fillers.
+    """
+
+    def __init__(self, config: dict = None):
+        """Initialize local TTS provider
+
+        Args:
+            config: Dictionary that may contain:
+                - engine: "espeak" reads WAV straight from espeak-ng's
+                  stdout; "pyttsx3" uses the platform engine (SAPI5,
+                  NSSpeechSynthesizer or eSpeak) through a temporary file;
+                  "auto" (default) prefers espeak when it is installed
+                - voice: Voice name or id (default: engine default)
+                - rate: Speaking rate in words per minute (default: 175)
+                - volume: 0.0 to 1.0 (default: 1.0)
+                - pitch: espeak pitch from 0 to 99 (default: 50)
+        """
+        if config is None:
+            config = {}
+
+        self._voice = config.get("voice")
+        self._rate = config.get("rate", 175)
+        self._volume = config.get("volume", 1.0)
+        self._pitch = config.get("pitch", 50)
+
+        engine = config.get("engine", "auto")
+        self._espeak = None
+        if engine in ("auto", "espeak"):
+            self._espeak = next(
+                (path for path in map(shutil.which, ESPEAK_BINARIES) if path), None
+            )
+            if engine == "espeak" and not self._espeak:
+                print("!!! espeak not found, falling back to pyttsx3")
+        self._engine_name = "espeak" if self._espeak else "pyttsx3"
+
+        # Every espeak call is its own process; pyttsx3 is single-threaded
+        self.max_concurrency = 4 if self._espeak else 1
+        self._pyttsx3 = None  # Created on, and only used from, the executor thread
+        self._executor = None
+        if not self._espeak:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pyttsx3"
+            )
+        print(f">>> Local TTS using {self._engine_name}")
+
+    async def aclose(self) -> None:
+        """Stop the pyttsx3 thread"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether espeak or pyttsx3 can be used on this machine"""
+        return any(map(shutil.which, ESPEAK_BINARIES)) or (
+            importlib.util.find_spec("pyttsx3") is not None
+        )
+
+    def cache_identity(self, ref_audio: Optional[str] = None) -> dict:
+        """Engine and voice settings; reference audio is not used"""
+        return {
+            "engine": self._engine_name,
+            "voice": self._voice,
+            "rate": self._rate,
+            "volume": self._volume,
+            "pitch": self._pitch,
+        }
+
+    async def warmup(self) -> None:
+        """Load the engine and its voice data ahead of the first reply"""
+        await self.synthesize("Ready.")
+
+    async def synthesize(self, text: str, ref_audio: Optional[str] = None) -> bytes:
+        """Synthesize speech from text; ref_audio is ignored"""
+        start = time.perf_counter()
+        if self._espeak:
+            audio_data = await self._synthesize_espeak(text)
+        else:
+            loop = asyncio.get_running_loop()
+            audio_data = await loop.run_in_executor(
+                self._executor, self._synthesize_pyttsx3, text
+            )
+        print(
+            f">>> Local TTS generated {len(audio_data)} bytes in "
+            f"{(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return audio_data
+
+    async def _synthesize_espeak(self, text: str) -> bytes:
+        args = [
+            self._espeak,
+            "--stdout",
+            "--stdin",
+            "-s",
+            str(self._rate),
+            "-a",
+            str(int(self._volume * 100)),
+            "-p",
+            str(self._pitch),
+        ]
+        if self._voice:
+            args += ["-v", self._voice]
+
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await process.communicate(text.encode("utf-8"))
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"espeak failed with code {process.returncode}: "
+                f"{stderr.decode(errors='replace').strip()}"
+            )
+        return self._fix_wav_header(stdout)
+
+    @staticmethod
+    def _fix_wav_header(data: bytes) -> bytes:
+        """Rewrite a streamed WAV whose header has placeholder sizes
+
+        espeak cannot seek on a pipe, so its header claims a huge data
+        chunk. Reading to the end and writing again gives exact sizes.
+        """
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            params = wf.getparams()
+            pcm = wf.readframes(wf.getnframes())
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(params.nchannels)
+            wf.setsampwidth(params.sampwidth)
+            wf.setframerate(params.framerate)
+            wf.writeframes(pcm)
+        return buffer.getvalue()
+
+    def _synthesize_pyttsx3(self, text: str) -> bytes:
+        import pyttsx3
+
+        if self._pyttsx3 is None:
+            self._pyttsx3 = pyttsx3.init()
+            self._pyttsx3.setProperty("rate", self._rate)
+            self._pyttsx3.setProperty("volume", self._volume)
+            if self._voice:
+                self._pyttsx3.setProperty("voice", self._voice)
+
+        # pyttsx3 can only render to a file
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self._pyttsx3.save_to_file(text, path)
+            self._pyttsx3.runAndWait()
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+from . import batch
+from .audio_utils import WHISPER_SAMPLE_RATE
+
+# How far back from a chunk's nominal end to look for a quiet boundary
+SEARCH_SECONDS = 5.0
+
+
+def find_chunks(
+    audio: np.ndarray,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    chunk_seconds: float = 30.0,
+    search_seconds: float = SEARCH_SECONDS,
+    overlap_seconds: float = 0.5,
+    frame_ms: int = 30,
+) -> List[Tuple[int, int, int]]:
+    """Split audio into chunks of about ``chunk_seconds`` at quiet points
+
+    Each boundary is placed at the quietest frame in the ``search_seconds``
+    before the nominal chunk end, so words are rarely cut in half. Chunks
+    extend ``overlap_seconds`` past their boundary to cover any word that is.
+
+    Returns:
+        list: (start, boundary, end) sample indices per chunk, where
+        [start, boundary) is the chunk's own span and end includes the overlap
+    """
+    total = len(audio)
+    chunk_length = int(chunk_seconds * sample_rate)
+    if total <= chunk_length:
+        return [(0, total, total)]
+
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    search_length = int(search_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+
+    chunks = []
+    start = 0
+    while total - start > chunk_length:
+        # Never search before the chunk start, so every chunk makes progress
+        window_start = max(start + 1, start + chunk_length - search_length)
+        window = audio[window_start : start + chunk_length]
+        n_frames = len(window) // frame_length
+        if n_frames:
+            frames = window[: n_frames * frame_length].reshape(n_frames, frame_length)
+            rms = np.sqrt(np.mean(np.square(frames), axis=1))
+            quietest = int(np.argmin(rms))
+            boundary = window_start + quietest * frame_length + frame_length // 2
+        else:
+            boundary = start + chunk_length
+
+        chunks.append((start, boundary, min(total, boundary + overlap)))
+        start = boundary
+
+    chunks.append((start, total, total))
+    return chunks
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def merge_overlap(previous: str, current: str, max_words: int = 8) -> str:
+    """Drop words at the start of ``current`` that repeat the end of ``previous``"""
+    previous_words = [_normalize_word(w) for w in previous.split()[-max_words:]]
+    current_words = current.split()
+    normalized = [_normalize_word(w) for w in current_words[:max_words]]
+
+    for size in range(min(len(previous_words), len(normalized)), 0, -1):
+        if previous_words[-size:] == normalized[:size]:
+            return " ".join(current_words[size:])
+    return current
+
+
+def stitch_segments(
+    chunk_segments: List[Tuple[int, List[dict]]], chunks
+) -> List[dict]:
+    """Combine per-chunk segments into one timeline without overlap repeats
+
+    Args:
+        chunk_segments: (chunk index, segments) pairs with chunk-relative times
+        chunks: Chunk spans as returned by find_chunks
+
+    Returns:
+        list: Segments with absolute start/end times in seconds
+    """
+    stitched = []
+    for index, segments in sorted(chunk_segments, key=lambda item: item[0]):
+        start, boundary, _ = chunks[index]
+        offset = start / WHISPER_SAMPLE_RATE
+        boundary_time = boundary / WHISPER_SAMPLE_RATE
+        first_in_chunk = True
+        for segment in segments:
+            segment_start = segment["start"] + offset
+            # Anything starting in the overlap belongs to the next chunk
+            if segment_start >= boundary_time and index < len(chunks) - 1:
+                continue
+            text = segment["text"].strip()
+            if stitched and first_in_chunk:
+                # Words from the shared overlap can appear in both chunks
+                text = merge_overlap(stitched[-1]["text"], text)
+            first_in_chunk = False
+            if not text:
+                continue
+            stitched.append(
+                {
+                    "start": segment_start,
+                    "end": min(segment["end"] + offset, boundary_time),
+                    "text": text,
+                }
+            )
+    return stitched
+
+
+def _transcribe_chunk(
+    index: int,
+    audio: np.ndarray,
+    model_name: Optional[str] = None,
+    decode_options: Optional[dict] = None,
+) -> Tuple[int, List[dict]]:
+    """Worker task: transcribe one chunk with the worker's provider"""
+    segments = batch._worker_provider.transcribe_segments(
+        audio, model_name=model_name, decode_options=decode_options
+    )
+    return index, segments
+
+
+class LongFormTranscriber:
+    """Transcribes long recordings in parallel across a process pool
+
+    The pool is started on first use and kept alive, so each worker loads its
+    model once rather than once per recording.
+    """
+
+    def __init__(self, provider_type: str, config: dict, long_form_config: dict):
+        self._chunk_seconds = long_form_config.get("chunk_seconds", 30.0)
+        if self._chunk_seconds <= SEARCH_SECONDS:
+            raise ValueError(
+                f"long_form.chunk_seconds must be longer than {SEARCH_SECONDS:g}s, "
+                f"got {self._chunk_seconds}"
+            )
+
+        # Workers must decode their chunk directly instead of splitting again,
+        # and are told which model to use, so they skip the other strategies
+        self._provider_type = provider_type
+        self._provider_config = dict(config)
+        for key in ("long_form", "cache", "cascade", "deadline"):
+            self._provider_config[key] = {"enabled": False}
+
+        self._overlap_seconds = long_form_config.get("overlap_seconds", 0.5)
+        self._workers = long_form_config.get("workers") or os.cpu_count() or 1
+        self._pool = None
+        self._warm_models = set()
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def chunk_seconds(self) -> float:
+        return self._chunk_seconds
+
+    def is_warm(self, model_name: Optional[str] = None) -> bool:
+        """Whether the pool has already run, and loaded, this model"""
+        return model_name in self._warm_models
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            threads = max(1, (os.cpu_count() or 1) // self._workers)
+            print(f">>> Starting {self._workers} long-form transcription workers")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=batch._init_worker,
+                initargs=(self._provider_type, self._provider_config, threads),
+            )
+        return self._pool
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_name: Optional[str] = None,
+        decode_options: Optional[dict] = None,
+    ) -> List[dict]:
+        """Transcribe prepared 16 kHz audio, returning absolute-time segments
+
+        Args:
+            audio: Prepared 16 kHz float32 audio
+            model_name: Model the workers should use (default: their own)
+            decode_options: Whisper decode options (default: the worker's)
+        """
+        chunks = find_chunks(
+            audio,
+            chunk_seconds=self._chunk_seconds,
+            overlap_seconds=self._overlap_seconds,
+        )
+        print(
+            f">>> Long-form transcription: {len(audio) / WHISPER_SAMPLE_RATE:.1f}s "
+            f"in {len(chunks)} chunks across {self._workers} workers"
+        )
+
+        pool = self._get_pool()
+        futures = [
+            pool.submit(
+                _transcribe_chunk, index, audio[start:end], model_name, decode_options
+            )
+            for index, (start, _, end) in enumerate(chunks)
+        ]
+        segments = stitch_segments([future.result() for future in futures], chunks)
+        self._warm_models.add(model_name)
+        return segments
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._warm_models.clear()
@@ -0,0 +1,70 @@
+import re
+from typing import List
+
+# A sentence: text up to terminal punctuation plus any closing quotes/brackets
+_SENTENCE = re.compile(r"\S.*?(?:[.!?…]+[\"')\]]*(?=\s|$)|$)", re.DOTALL)
+# Clause breaks used to split sentences that are still too long
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:—–])\s+")
+
+
+def _split_long(piece: str, max_chars: int) -> List[str]:
+    """Split an over-long sentence at clause breaks, then at spaces"""
+    if len(piece) <= max_chars:
+        return [piece]
+
+    parts = []
+    current = ""
+    for clause in _CLAUSE_BREAK.split(piece):
+        candidate = f"{current} {clause}".strip()
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            parts.append(current)
+        # A single clause can still be too long: fall back to word wrapping
+        while len(clause) > max_chars:
+            cut = clause.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            parts.append(clause[:cut].strip())
+            clause = clause[cut:].strip()
+        current = clause
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_for_synthesis(
+    text: str, max_chars: int = 250, min_chars: int = 20
+) -> List[str]:
+    """Split text into chunks that can be synthesized independently
+
+    Chunks end at sentence boundaries where possible and at clause boundaries
+    otherwise, and stay under ``max_chars``. Fragments shorter than
+    ``min_chars`` are joined to the following chunk so each request carries
+    enough context for natural prosody.
+    """
+    pieces = []
+    for sentence in _SENTENCE.findall(text):
+        sentence = " ".join(sentence.split())
+        if sentence:
+            pieces.extend(_split_long(sentence, max_chars))
+
+    chunks = []
+    pending = ""
+    for piece in pieces:
+        combined = f"{pending} {piece}".strip()
+        if len(combined) < min_chars:
+            pending = combined
+        elif pending and len(combined) > max_chars:
+            chunks.extend([pending, piece])
+            pending = ""
+        else:
+            chunks.append(combined)
+            pending = ""
+    if pending:
+        if chunks and len(chunks[-1]) + len(pending) < max_chars:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
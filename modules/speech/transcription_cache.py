@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Optional
+import numpy as np
+from utils.lru_cache import LRUCache
+
+
+class TranscriptionCache:
+    """Content-addressed cache of transcripts
+
+    Keys are a hash of the prepared (16 kHz, trimmed) PCM together with the
+    model name and decode options, so the same audio decoded the same way is
+    only ever transcribed once. Lookups hit an in-memory LRU first, then a
+    sqlite file that is trimmed least-recently-used first to ``max_bytes``.
+    The file size is kept as a running total and read back from the file
+    every ``RESYNC_WRITES`` writes and before evicting, so the cap holds when
+    several worker processes share it. Disk hits only note their access time
+    in memory; the times are written along with the next write.
+    """
+
+    RESYNC_WRITES = 64
+    TOUCH_BATCH = 32
+
+    def __init__(
+        self,
+        path: Optional[str] = "resources/cache/transcriptions.sqlite3",
+        memory_entries: int = 512,
+        max_bytes: int = 50 * 1024 * 1024,
+    ):
+        self._memory = LRUCache(max_entries=memory_entries)
+        self._max_bytes = max_bytes
+        self._lock = Lock()
+        self._db = None
+        self._total_bytes = 0
+        self._writes_since_sync = 0
+        self._pending_access = {}
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS transcripts_last_access "
+                "ON transcripts (last_access)"
+            )
+            self._db.commit()
+            self._sync_total()
+            print(
+                f">>> Transcription cache at {path} "
+                f"({self._total_bytes} of {self._max_bytes} bytes used)"
+            )
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> Optional["TranscriptionCache"]:
+        """Create a cache from a provider's ``cache`` config, or None if disabled"""
+        if not config or not config.get("enabled", False):
+            return None
+        return cls(
+            path=config.get("path", "resources/cache/transcriptions.sqlite3"),
+            memory_entries=config.get("memory_entries", 512),
+            max_bytes=config.get("max_bytes", 50 * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(audio: np.ndarray, model: str, options: dict) -> str:
+        """Hash normalized PCM together with the model and decode options"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+        digest.update(model.encode("utf-8"))
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        text = self._memory.get(key)
+        if text is not None:
+            print(">>> Transcription cache hit (memory)")
+            return text
+
+        if self._db is None:
+            return None
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._pending_access[key] = time.time()
+            if len(self._pending_access) >= self.TOUCH_BATCH:
+                self._flush_access()
+                self._db.commit()
+
+        print(">>> Transcription cache hit (disk)")
+        self._memory.put(key, row[0])
+        return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        self._memory.put(key, text)
+        if self._db is None:
+            return
+
+        size = len(key) + len(text.encode("utf-8"))
+        with self._lock:
+            self._pending_access.pop(key, None)
+            self._flush_access()
+            replaced = self._db.execute(
+                "SELECT size FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcripts (key, text, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time()),
+            )
+            self._total_bytes += size - (replaced[0] if replaced else 0)
+            self._writes_since_sync += 1
+            if (
+                self._writes_since_sync >= self.RESYNC_WRITES
+                or self._total_bytes > self._max_bytes
+            ):
+                # The insert holds the write lock, so no other process can
+                # change the total before this transaction commits
+                self._sync_total()
+                self._evict()
+            self._db.commit()
+
+    def _sync_total(self) -> None:
+        """Read the file size back, picking up writes from other processes"""
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+        ).fetchone()[0]
+        self._writes_since_sync = 0
+
+    def _flush_access(self) -> None:
+        """Write the access times noted by disk hits since the last write"""
+        if self._pending_access:
+            self._db.executemany(
+                "UPDATE transcripts SET last_access = ? WHERE key = ?",
+                [(at, key) for key, at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until the file is under its size cap"""
+        if self._total_bytes <= self._max_bytes:
+            return
+        while self._total_bytes > self._max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM transcripts ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self._max_bytes:
+                    break
+        print(f">>> Transcription cache size: {self._total_bytes} bytes")
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._flush_access()
+                self._db.commit()
+            self._db.close()
+            self._db = None
@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from threading import Lock
+from typing import AsyncIterator, List, Optional
+from core.interfaces.speech import AudioChunk, TextToSpeechProvider
+from utils.lru_cache import LRUCache
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of text for cache keys
+
+    Only differences that cannot change the spoken result are removed:
+    Unicode composition and runs of whitespace. Case and punctuation are
+    kept because they affect prosody.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TTSCache:
+    """Content-addressed store of synthesized WAV audio
+
+    Lookups hit an in-memory LRU first, then one file per key in
+    ``directory``. File modification times record last use, and the least
+    recently used files are deleted once the directory exceeds ``max_bytes``.
+    ``get_async`` and ``put_async`` do the file I/O on the default executor so
+    callers on the event loop are not blocked by the disk.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = "resources/cache/tts",
+        memory_entries: int = 64,
+        memory_bytes: int = 32 * 1024 * 1024,
+        max_bytes: int = 500 * 1024 * 1024,
+    ):
+        self._memory = LRUCache(
+            max_entries=memory_entries, max_bytes=memory_bytes, sizeof=len
+        )
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = Lock()
+        self._total_bytes = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._total_bytes = sum(size for _, size, _ in self._files())
+            print(
+                f">>> TTS cache at {directory} "
+                f"({self._total_bytes} of {self._max_bytes} bytes used)"
+            )
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> Optional["TTSCache"]:
+        """Create a cache from the TTS ``cache`` config, or None if disabled"""
+        if not config or not config.get("enabled", False):
+            return None
+        return cls(
+            directory=config.get("directory", "resources/cache/tts"),
+            memory_entries=config.get("memory_entries", 64),
+            memory_bytes=config.get("memory_bytes", 32 * 1024 * 1024),
+            max_bytes=config.get("max_bytes", 500 * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(provider: str, identity: dict, text: str) -> str:
+        """Hash the provider, its voice identity and the normalized text"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(provider.encode("utf-8"))
+        digest.update(json.dumps(identity, sort_keys=True).encode("utf-8"))
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.wav")
+
+    def _files(self):
+        """(path, size, mtime) of every cached file"""
+        for entry in os.scandir(self._directory):
+            if entry.is_file() and entry.name.endswith(".wav"):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            print(">>> TTS cache hit (memory)")
+            return audio
+
+        return self._read(key)
+
+    async def get_async(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            print(">>> TTS cache hit (memory)")
+            return audio
+        if not self._directory:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._read, key
+        )
+
+    def _read(self, key: str) -> Optional[bytes]:
+        if not self._directory:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+
+        print(">>> TTS cache hit (disk)")
+        self._memory.put(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        self._memory.put(key, audio)
+        if self._directory:
+            self._write(key, audio)
+
+    async def put_async(self, key: str, audio: bytes) -> None:
+        self._memory.put(key, audio)
+        if self._directory:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, key, audio
+            )
+
+    def _write(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            # Write then rename so readers never see a partial file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+            self._total_bytes += len(audio) - previous
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files until under the size cap"""
+        if self._total_bytes <= self._max_bytes:
+            return
+        for path, size, _ in sorted(self._files(), key=lambda item: item[2]):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._total_bytes -= size
+            if self._total_bytes <= self._max_bytes:
+                break
+        print(f">>> TTS cache size: {self._total_bytes} bytes")
+
+
+class CachedTTSProvider(TextToSpeechProvider):
+    """Serves repeated phrases from a TTSCache instead of re-synthesizing
+
+    Wraps any TextToSpeechProvider. The cache key includes the provider's
+    ``cache_identity`` (voice, model, settings, reference audio hash), so
+    changing any of those never returns stale audio. Other attributes are
+    forwarded to the wrapped provider.
+    """
+
+    def __init__(self, provider, name: str, cache: TTSCache):
+        self._provider = provider
+        self._name = name
+        self._cache = cache
+
+    def __getattr__(self, attribute):
+        return getattr(self._provider, attribute)
+
+    async def aclose(self) -> None:
+        await self._provider.aclose()
+
+    def _key(self, text: str, ref_audio: Optional[str]) -> str:
+        identity = self._provider.cache_identity(ref_audio)
+        return TTSCache.make_key(self._name, identity, text)
+
+    async def synthesize(self, text: str, ref_audio: Optional[str] = None) -> bytes:
+        key = self._key(text, ref_audio)
+        audio = await self._cache.get_async(key)
+        if audio is not None:
+            return audio
+
+        audio = await self._provider.synthesize(text, ref_audio)
+        await self._cache.put_async(key, audio)
+        return audio
+
+    async def synthesize_stream(
+        self, text: str, ref_audio: Optional[str] = None
+    ) -> AsyncIterator[AudioChunk]:
+        """Stream from the cache on a hit, otherwise relay and record the stream"""
+        key = self._key(text, ref_audio)
+        audio = await self._cache.get_async(key)
+        if audio is not None:
+            yield AudioChunk.from_wav(audio)
+            return
+
+        chunks = []
+        async for chunk in self._provider.synthesize_stream(text, ref_audio):
+            chunks.append(chunk)
+            yield chunk
+
+        # Only complete streams are stored
+        if chunks:
+            await self._cache.put_async(key, AudioChunk.to_wav(chunks))
+
+    async def synthesize_batch(
+        self, texts: List[str], ref_audio: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Serve cached texts directly and batch only the misses, in order"""
+        keys = [self._key(text, ref_audio) for text in texts]
+        cached = [await self._cache.get_async(key) for key in keys]
+        misses = [text for text, audio in zip(texts, cached) if audio is None]
+        generated = self._provider.synthesize_batch(misses, ref_audio)
+
+        try:
+            for key, audio in zip(keys, cached):
+                if audio is None:
+                    audio = await generated.__anext__()
+                    await self._cache.put_async(key, audio)
+                yield audio
+        finally:
+            await generated.aclose()
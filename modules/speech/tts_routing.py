@@ -0,0 +1,207 @@
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+class ProviderHealth:
+    """Latency and failure statistics for one TTS provider, with a circuit breaker
+
+    Latency is tracked as an exponentially weighted moving average and as a
+    window of recent samples for percentiles. After ``failure_threshold``
+    consecutive failures the circuit opens and the provider is skipped for
+    ``cooldown`` seconds. After that a single trial request is let through,
+    and its outcome closes the circuit again or reopens it. A trial that
+    never reports back, e.g. a cancelled hedge, is given up after another
+    cooldown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        smoothing: float = 0.3,
+        window: int = 50,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.ewma: Optional[float] = None
+        self._smoothing = smoothing
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)  # True for success
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+        self._clock = clock
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile over the window, once enough samples exist"""
+        if len(self._latencies) < 5:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def circuit_open(self) -> bool:
+        return self._opened_at is not None
+
+    def available(self, now: float) -> bool:
+        """Closed circuit, or half-open with no trial request running"""
+        if self._opened_at is None:
+            return True
+        if now - self._opened_at < self._cooldown:
+            return False
+        return (
+            self._trial_started is None
+            or now - self._trial_started >= self._cooldown
+        )
+
+    def record_start(self) -> None:
+        """Note a request being sent; on a half-open circuit it is the trial"""
+        now = self._clock()
+        if self._opened_at is not None and now - self._opened_at >= self._cooldown:
+            self._trial_started = now
+
+    def record_success(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._outcomes.append(True)
+        self.ewma = (
+            latency
+            if self.ewma is None
+            else self.ewma + self._smoothing * (latency - self.ewma)
+        )
+        self._consecutive_failures = 0
+        self._trial_started = None
+        if self._opened_at is not None:
+            print(f"=== TTS provider {self.name} recovered, circuit closed ===")
+            self._opened_at = None
+
+    def record_failure(self, error: Exception) -> None:
+        self._outcomes.append(False)
+        self._consecutive_failures += 1
+        self._trial_started = None
+        print(f"!!! TTS provider {self.name} failed: {error}")
+        if self._consecutive_failures >= self._failure_threshold:
+            if self._opened_at is None:
+                print(
+                    f"=== TTS provider {self.name} circuit opened for "
+                    f"{self._cooldown:g}s ==="
+                )
+            # A failed half-open trial restarts the cooldown
+            self._opened_at = self._clock()
+
+    def snapshot(self) -> dict:
+        return {
+            "ewma_ms": None if self.ewma is None else round(self.ewma * 1000),
+            "p95_ms": (
+                None
+                if self.percentile(0.95) is None
+                else round(self.percentile(0.95) * 1000)
+            ),
+            "error_rate": round(self.error_rate, 3),
+            "circuit_open": self.circuit_open,
+        }
+
+
+class TTSRouter:
+    """Chooses which TTS providers to try, in what order, and when to hedge
+
+    The preferred provider is tried first, then the others in fallback
+    order. Providers with an open circuit are skipped unless nothing else
+    is left. A hedge starts the next provider when the current one has not
+    finished within its own p95 latency.
+    """
+
+    def __init__(
+        self,
+        providers: List[str],
+        fallback_order: Optional[List[str]] = None,
+        hedge: bool = True,
+        hedge_min_ms: float = 800,
+        hedge_default_ms: float = 3000,
+        smoothing: float = 0.3,
+        window: int = 50,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        fallback_order = [name for name in fallback_order or [] if name in providers]
+        self._order = fallback_order + [
+            name for name in providers if name not in fallback_order
+        ]
+        self._hedge = hedge
+        self._hedge_min = hedge_min_ms / 1000.0
+        self._hedge_default = hedge_default_ms / 1000.0
+        self._health: Dict[str, ProviderHealth] = {
+            name: ProviderHealth(
+                name, smoothing, window, failure_threshold, cooldown_seconds, clock
+            )
+            for name in providers
+        }
+        self._clock = clock
+        self.stats = {"failovers": 0, "hedges": 0, "hedges_won": 0}
+
+    def candidates(self, preferred: str) -> List[str]:
+        """Providers to try for one request, best first"""
+        now = self._clock()
+        order = [preferred] + [name for name in self._order if name != preferred]
+        healthy = [name for name in order if self._health[name].available(now)]
+        if not healthy:
+            print("!!! All TTS providers have open circuits, trying anyway")
+            return order
+        if healthy[0] != preferred:
+            print(f">>> Skipping unhealthy TTS provider {preferred}")
+        return healthy
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """Seconds to wait for ``name`` before starting a second provider"""
+        if not self._hedge:
+            return None
+        p95 = self._health[name].percentile(0.95)
+        if p95 is None:
+            return self._hedge_default
+        return max(self._hedge_min, p95)
+
+    def record_start(self, name: str) -> None:
+        self._health[name].record_start()
+
+    def record_success(self, name: str, latency: float) -> None:
+        self._health[name].record_success(latency)
+
+    def record_failure(self, name: str, error: Exception) -> None:
+        self._health[name].record_failure(error)
+
+    def snapshot(self) -> dict:
+        return {
+            "providers": {
+                name: health.snapshot() for name, health in self._health.items()
+            },
+            **self.stats,
+        }
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[dict], providers: List[str]
+    ) -> Optional["TTSRouter"]:
+        """Create a router from the TTS ``routing`` config, or None if disabled"""
+        if not config or not config.get("enabled", False):
+            return None
+        return cls(
+            providers,
+            fallback_order=config.get("fallback_order"),
+            hedge=config.get("hedge", True),
+            hedge_min_ms=config.get("hedge_min_ms", 800),
+            hedge_default_ms=config.get("hedge_default_ms", 3000),
+            smoothing=config.get("smoothing", 0.3),
+            window=config.get("window", 50),
+            failure_threshold=config.get("failure_threshold", 3),
+            cooldown_seconds=config.get("cooldown_seconds", 30.0),
+        )
@@ -1,57 +1,230 @@
-from core.interfaces.speech import SpeechToTextProvider
+from core.interfaces.speech import SpeechToTextProvider, load_wav_frames
+from .audio_utils import prepare_audio, WHISPER_SAMPLE_RATE
+from .transcription_cache import TranscriptionCache
+from .long_form import LongFormTranscriber
+from .deadline import DeadlinePlanner
+from typing import List, Optional
 import whisper
 import numpy as np
 import io
+import math
+import os
+import time
 import wave
 import torch
 
 
 class WhisperProvider(SpeechToTextProvider):
-    def __init__(self):
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model = whisper.load_model("base.en", device=device)
-        print(f">>> Whisper model loaded on {device}")
+    NO_SPEECH_THRESHOLD = 0.3
+    LOGPROB_THRESHOLD = -1.0
 
-    def transcribe(self, audio_frames):
+    def __init__(self, config: dict = None):
+        """Initialize Whisper provider
+
+        Args:
+            config: Dictionary that may contain:
+                - model: Whisper model name (default: base.en)
+                - device: "auto", "cpu" or "cuda"
+                - trim_silence: Trim leading/trailing silence (default: False)
+                - batch_size: Clips per decoder call in transcribe_batch
+                - cache: Transcription cache settings (see TranscriptionCache)
+                - long_form: Parallel transcription of long recordings
+                    - enabled: Split long recordings across a worker pool
+                    - min_duration_seconds: Shortest recording to split
+                    - chunk_seconds: Target chunk length
+                    - overlap_seconds: Audio shared by neighbouring chunks
+                    - workers: Worker processes (default: one per core)
+                - cascade: Decode with a small model first, escalate if unsure
+                    - enabled: Use the cascade
+                    - draft_model: Small model tried first (default: tiny.en)
+                    - avg_logprob_threshold: Escalate below this avg_logprob
+                    - no_speech_prob_threshold: Escalate when text comes with
+                      a no_speech_prob above this
+                    - compression_ratio_threshold: Escalate above this ratio
+                - deadline: Pick the decode strategy from a latency budget
+                    (takes precedence over the cascade when enabled)
+                    - enabled: Use deadline-aware decoding
+                    - latency_budget_ms: Time allowed from end of speech to text
+                    - strategies: Ordered best-first list of {model, beam_size,
+                      parallel}; parallel strategies use the long_form pool
+                    - rtf_priors: Starting real-time factors per model
+                - cpu_optimization: Opt-in CPU inference settings
+                    - enabled: Apply the CPU optimizations below
+                    - quantize_int8: Dynamic int8 quantization of linear layers
+                    - intra_op_threads: torch intra-op thread count (0 = default)
+                    - inter_op_threads: torch inter-op thread count (0 = default)
+                    - quantized_cache_dir: Where to cache quantized weights
+        """
+        if config is None:
+            config = {}
+
+        self._config = config
+        self._model_name = config.get("model", "base.en")
+
+        device = config.get("device", "auto")
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._device = device
+        self._trim_silence = config.get("trim_silence", False)
+        self._batch_size = config.get("batch_size", 16)
+
+        cpu_config = config.get("cpu_optimization", {})
+        self._cpu_mode = device == "cpu" and cpu_config.get("enabled", False)
+        self._quantize = self._cpu_mode and cpu_config.get("quantize_int8", True)
+        self._quantized_cache_dir = cpu_config.get("quantized_cache_dir")
+        if self._cpu_mode:
+            self._configure_threads(
+                cpu_config.get("intra_op_threads", 0),
+                cpu_config.get("inter_op_threads", 0),
+            )
+
+        self.model = self._load_model(self._model_name)
+        self._models = {self._model_name: self.model}
+        self.last_real_time_factor = None
+
+        cascade_config = config.get("cascade", {})
+        self._cascade = cascade_config.get("enabled", False)
+        self._draft_model_name = cascade_config.get("draft_model", "tiny.en")
+        self._avg_logprob_threshold = cascade_config.get("avg_logprob_threshold", -0.8)
+        self._no_speech_prob_threshold = cascade_config.get(
+            "no_speech_prob_threshold", 0.6
+        )
+        self._compression_ratio_threshold = cascade_config.get(
+            "compression_ratio_threshold", 2.4
+        )
+        self._cascade_stats = {"draft": 0, "escalated": 0}
+        if self._cascade:
+            self._get_model(self._draft_model_name)
+
+        # Everything besides the audio that changes the decoded text. Paths
+        # that bypass the cascade (batch, long-form) cache under the plain id.
+        self._model_id = f"whisper:{self._model_name}"
+        if self._quantize:
+            self._model_id += "-int8"
+        self._decode_options = {
+            "language": "en",
+            "task": "transcribe",
+            "temperature": 0.0,
+            "best_of": 1,
+            "beam_size": 1,
+            "no_speech_threshold": self.NO_SPEECH_THRESHOLD,
+        }
+        # transcribe_batch decodes short clips in one pass without timestamps
+        # or temperature fallback, so its text is cached separately
+        self._batch_decode_options = {
+            "language": "en",
+            "task": "transcribe",
+            "temperature": 0.0,
+            "without_timestamps": True,
+        }
+        self._cache = TranscriptionCache.from_config(config.get("cache"))
+
+        long_form_config = config.get("long_form", {})
+        self._long_form = None
+        self._long_form_min_samples = int(
+            long_form_config.get("min_duration_seconds", 60) * WHISPER_SAMPLE_RATE
+        )
+        if long_form_config.get("enabled", False):
+            self._long_form = LongFormTranscriber("whisper", config, long_form_config)
+        self.last_segments = []
+
+        self._deadline = DeadlinePlanner.from_config(
+            config.get("deadline"), self._model_name
+        )
+        if self._deadline:
+            # Load strategy models now, so a strategy's first use is not
+            # timed together with loading its model
+            for strategy in self._deadline.strategies:
+                if not strategy.parallel:
+                    self._get_model(strategy.model)
+        self._request_started = None
+        self.last_deadline_met = None
+        print(f">>> Whisper model {self._model_name} loaded on {device}")
+
+    @staticmethod
+    def _configure_threads(intra_op_threads: int, inter_op_threads: int):
+        """Apply torch threading settings for CPU inference"""
+        if intra_op_threads:
+            torch.set_num_threads(intra_op_threads)
+        if inter_op_threads:
+            try:
+                # Only allowed before any inter-op parallel work has started
+                torch.set_num_interop_threads(inter_op_threads)
+            except RuntimeError as e:
+                print(f"!!! Could not set inter-op threads: {e}")
+        print(
+            f">>> Torch threads: intra-op={torch.get_num_threads()}, "
+            f"inter-op={torch.get_num_interop_threads()}"
+        )
+
+    def _get_model(self, model_name: str):
+        """Return a loaded model, loading it on first use"""
+        if model_name not in self._models:
+            print(f">>> Loading Whisper model {model_name}")
+            self._models[model_name] = self._load_model(model_name)
+        return self._models[model_name]
+
+    def _load_model(self, model_name: str):
+        """Load a Whisper model, applying int8 quantization in CPU mode"""
+        if not self._quantize:
+            return whisper.load_model(model_name, device=self._device)
+
+        cache_path = None
+        if self._quantized_cache_dir:
+            os.makedirs(self._quantized_cache_dir, exist_ok=True)
+            cache_path = os.path.join(
+                self._quantized_cache_dir,
+                f"{model_name}-int8-torch{torch.__version__.split('+')[0]}.pt",
+            )
+            if os.path.exists(cache_path):
+                try:
+                    print(f">>> Loading quantized Whisper model from {cache_path}")
+                    return torch.load(
+                        cache_path, map_location="cpu", weights_only=False
+                    )
+                except Exception as e:
+                    print(f"!!! Failed to load quantized model cache: {e}")
+
+        print(f">>> Quantizing Whisper model {model_name} to int8")
+        model = self._quantize_int8(whisper.load_model(model_name, device="cpu"))
+
+        if cache_path:
+            try:
+                torch.save(model, cache_path)
+                print(f">>> Cached quantized Whisper model at {cache_path}")
+            except Exception as e:
+                print(f"!!! Failed to cache quantized model: {e}")
+
+        return model
+
+    @staticmethod
+    def _quantize_int8(model):
+        """Dynamically quantize all linear layers of a Whisper model to int8"""
+        for module in model.modules():
+            # Whisper subclasses nn.Linear only to cast weights to the input
+            # dtype, which quantize_dynamic does not recognise. In fp32 the
+            # base class is equivalent.
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+        model.eval()
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    def transcribe(self, audio_frames, sample_rate: int = 44100):
         try:
+            # End of speech, as far as the latency budget is concerned
+            self._request_started = time.perf_counter()
             print("\n=== Starting Whisper transcription ===")
 
             # Debug audio data
             print(f">>> Received {len(audio_frames)} audio frames")
 
-            # Convert audio frames to numpy array directly
-            audio_data = np.frombuffer(b"".join(audio_frames), dtype=np.int16)
-            print(f">>> Audio data shape: {audio_data.shape}")
-            print(f">>> Audio max value: {np.max(np.abs(audio_data))}")
-
-            # Convert to float32 and normalize
-            audio_float = audio_data.astype(np.float32) / 32768.0
-
-            # Resample to 16kHz
-            from scipy import signal
-
-            original_rate = 44100
-            target_rate = 16000
-            samples = len(audio_float)
-            new_samples = int(samples * target_rate / original_rate)
-            audio_resampled = signal.resample(audio_float, new_samples)
-
-            print(f">>> Resampled audio shape: {audio_resampled.shape}")
-            print(f">>> Resampled max value: {np.max(np.abs(audio_resampled))}")
-
-            # Transcribe using Whisper
-            result = self.model.transcribe(
-                audio_resampled,
-                language="en",
-                task="transcribe",
-                fp16=False,
-                temperature=0.0,
-                best_of=1,
-                beam_size=1,
-                no_speech_threshold=0.3,
-            )
+            # Resample to 16kHz and trim leading/trailing silence
+            audio = prepare_audio(audio_frames, sample_rate, trim=self._trim_silence)
+            print(f">>> Prepared audio shape: {audio.shape}")
 
-            transcribed_text = result["text"].strip()
+            transcribed_text = self._transcribe_audio(audio)
             print(f">>> Transcription complete: '{transcribed_text}'")
 
             return transcribed_text
@@ -59,3 +232,245 @@ class WhisperProvider(SpeechToTextProvider):
         except Exception as e:
             print(f"!!! Error in Whisper transcription: {e}")
             return None
+
+    def _transcribe_audio(self, audio: np.ndarray) -> str:
+        """Run Whisper on prepared 16 kHz float32 audio"""
+        long_form = (
+            not self._deadline
+            and self._long_form
+            and len(audio) >= self._long_form_min_samples
+        )
+        model_id = self._model_id
+        if self._deadline:
+            model_id += "+deadline"
+        elif self._cascade and not long_form:
+            model_id += f"+cascade:{self._draft_model_name}"
+
+        cache_key = self._cache_key(audio, model_id=model_id)
+        if cache_key:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        start_time = time.perf_counter()
+        if self._deadline:
+            segments = self._transcribe_within_deadline(audio)
+            result = {"text": " ".join(segment["text"] for segment in segments)}
+        elif long_form:
+            segments = self._long_form.transcribe(audio)
+            result = {"text": " ".join(segment["text"] for segment in segments)}
+        else:
+            result = self._decode(audio)
+            segments = [
+                {"start": s["start"], "end": s["end"], "text": s["text"].strip()}
+                for s in result["segments"]
+            ]
+        self.last_segments = segments
+        elapsed = time.perf_counter() - start_time
+
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        if duration > 0:
+            self.last_real_time_factor = elapsed / duration
+            print(
+                f">>> Real-time factor: {self.last_real_time_factor:.3f} "
+                f"({elapsed:.2f}s for {duration:.2f}s of audio)"
+            )
+
+        text = result["text"].strip()
+        if cache_key:
+            self._cache.put(cache_key, text)
+        return text
+
+    def _transcribe_within_deadline(self, audio: np.ndarray) -> List[dict]:
+        """Decode with the best strategy predicted to fit the latency budget"""
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        chunk_count, workers = 1, 1
+        if self._long_form:
+            chunk_count = math.ceil(duration / self._long_form.chunk_seconds)
+            workers = self._long_form.workers
+
+        strategy, parallelism = self._deadline.choose(duration, chunk_count, workers)
+        predicted = self._deadline.predict(strategy, duration, parallelism)
+        print(
+            f">>> Deadline plan for {duration:.1f}s clip: {strategy.describe()}, "
+            f"predicted {predicted * 1000:.0f} ms of "
+            f"{self._deadline.budget_seconds * 1000:.0f} ms budget"
+        )
+
+        options = dict(self._decode_options, beam_size=strategy.beam_size)
+        decode_start = time.perf_counter()
+        if strategy.parallel and self._long_form:
+            # The pool starts, and its workers load models, on first use
+            warm = self._long_form.is_warm(strategy.model)
+            segments = self._long_form.transcribe(audio, strategy.model, options)
+        else:
+            warm = strategy.model in self._models
+            segments = self.transcribe_segments(audio, strategy.model, options)
+            for segment in segments:
+                segment["text"] = segment["text"].strip()
+        now = time.perf_counter()
+
+        latency = now - (self._request_started or decode_start)
+        met = self._deadline.record(
+            strategy, duration, now - decode_start, parallelism, latency, warm
+        )
+        self.last_deadline_met = met
+        stats = self._deadline.stats
+        print(
+            f">>> Deadline {'met' if met else 'MISSED'}: {latency * 1000:.0f} ms "
+            f"({stats['met']} met, {stats['missed']} missed so far)"
+        )
+        return segments
+
+    def _decode(self, audio: np.ndarray) -> dict:
+        """Decode with the configured model, via the draft model in cascade mode"""
+        if not self._cascade:
+            return self.model.transcribe(audio, fp16=False, **self._decode_options)
+
+        draft_model = self._get_model(self._draft_model_name)
+        result = draft_model.transcribe(audio, fp16=False, **self._decode_options)
+        if self._is_confident(result):
+            self._cascade_stats["draft"] += 1
+            print(f">>> Cascade: accepted {self._draft_model_name} result")
+        else:
+            self._cascade_stats["escalated"] += 1
+            print(f">>> Cascade: low confidence, re-decoding with {self._model_name}")
+            result = self.model.transcribe(audio, fp16=False, **self._decode_options)
+
+        print(
+            f">>> Cascade totals: {self._cascade_stats['draft']} draft, "
+            f"{self._cascade_stats['escalated']} escalated"
+        )
+        return result
+
+    def _is_confident(self, result: dict) -> bool:
+        """Check a Whisper result's segment statistics against the thresholds"""
+        segments = [s for s in result["segments"] if s["text"].strip()]
+        if not segments:
+            # The draft heard nothing; let the larger model confirm
+            return False
+
+        total_tokens = sum(max(1, len(s["tokens"])) for s in segments)
+        avg_logprob = (
+            sum(s["avg_logprob"] * max(1, len(s["tokens"])) for s in segments)
+            / total_tokens
+        )
+        no_speech_prob = max(s["no_speech_prob"] for s in segments)
+        compression_ratio = max(s["compression_ratio"] for s in segments)
+        print(
+            f">>> Draft confidence: avg_logprob={avg_logprob:.2f}, "
+            f"no_speech_prob={no_speech_prob:.2f}, "
+            f"compression_ratio={compression_ratio:.2f}"
+        )
+
+        return (
+            avg_logprob >= self._avg_logprob_threshold
+            and no_speech_prob <= self._no_speech_prob_threshold
+            and compression_ratio <= self._compression_ratio_threshold
+        )
+
+    def transcribe_segments(
+        self,
+        audio: np.ndarray,
+        model_name: Optional[str] = None,
+        decode_options: Optional[dict] = None,
+    ) -> List[dict]:
+        """Transcribe prepared audio, returning timestamped segments"""
+        model = self._get_model(model_name) if model_name else self.model
+        options = decode_options or self._decode_options
+        result = model.transcribe(audio, fp16=False, **options)
+        return [
+            {"start": s["start"], "end": s["end"], "text": s["text"]}
+            for s in result["segments"]
+        ]
+
+    def close(self) -> None:
+        """Release the long-form worker pool and cache"""
+        if self._long_form:
+            self._long_form.close()
+        if self._cache:
+            self._cache.close()
+
+    def _cache_key(
+        self,
+        audio: np.ndarray,
+        options: Optional[dict] = None,
+        model_id: Optional[str] = None,
+    ) -> Optional[str]:
+        if self._cache is None:
+            return None
+        return TranscriptionCache.make_key(
+            audio, model_id or self._model_id, options or self._decode_options
+        )
+
+    def transcribe_batch(self, paths: List[str]) -> List[Optional[str]]:
+        """Transcribe WAV files, decoding clips up to 30 s in shared batches"""
+        print(f"\n=== Starting Whisper batch transcription of {len(paths)} files ===")
+        results: List[Optional[str]] = [None] * len(paths)
+        short_clips = []
+
+        for index, path in enumerate(paths):
+            try:
+                frames, sample_rate = load_wav_frames(path)
+                audio = prepare_audio(frames, sample_rate, trim=self._trim_silence)
+                if len(audio) > whisper.audio.N_SAMPLES:
+                    # Long clips need Whisper's sliding-window transcription
+                    results[index] = self._transcribe_audio(audio)
+                    continue
+                cache_key = self._cache_key(audio, self._batch_decode_options)
+                cached = self._cache.get(cache_key) if cache_key else None
+                if cached is not None:
+                    results[index] = cached
+                else:
+                    short_clips.append((index, audio))
+            except Exception as e:
+                print(f"!!! Error transcribing {path}: {e}")
+
+        for start in range(0, len(short_clips), self._batch_size):
+            batch = short_clips[start : start + self._batch_size]
+            try:
+                texts = self._decode_batch([audio for _, audio in batch])
+                for (index, audio), text in zip(batch, texts):
+                    results[index] = text
+                    cache_key = self._cache_key(audio, self._batch_decode_options)
+                    if cache_key:
+                        self._cache.put(cache_key, text)
+            except Exception as e:
+                print(f"!!! Error decoding batch of {len(batch)} clips: {e}")
+
+        return results
+
+    def _decode_batch(self, clips: List[np.ndarray]) -> List[str]:
+        """Decode several clips of at most 30 s in a single decoder call"""
+        start_time = time.perf_counter()
+        mels = torch.stack(
+            [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(torch.from_numpy(audio)),
+                    n_mels=self.model.dims.n_mels,
+                )
+                for audio in clips
+            ]
+        ).to(self.model.device)
+
+        options = whisper.DecodingOptions(fp16=False, **self._batch_decode_options)
+        decoded = whisper.decode(self.model, mels, options)
+        elapsed = time.perf_counter() - start_time
+
+        total_duration = sum(len(audio) for audio in clips) / WHISPER_SAMPLE_RATE
+        print(
+            f">>> Decoded {len(clips)} clips ({total_duration:.1f}s of audio) "
+            f"in {elapsed:.2f}s"
+        )
+
+        texts = []
+        for result in decoded:
+            # Same silence rule Whisper's transcribe() applies per segment
+            if (
+                result.no_speech_prob > self.NO_SPEECH_THRESHOLD
+                and result.avg_logprob < self.LOGPROB_THRESHOLD
+            ):
+                texts.append("")
+            else:
+                texts.append(result.text.strip())
+        return texts
@@ -0,0 +1,107 @@
+"""Local stand-in for Deepgram's streaming websocket API
+
+Speaks enough of the live transcription protocol for DeepgramProvider to be
+exercised without network access or an API key: binary audio in, interim
+and final Results messages out, plus KeepAlive, Finalize and CloseStream.
+Transcripts are deterministic ("audio N" per second of audio received).
+
+Run standalone with:
+    python -m tests.mock_deepgram_server --port 8765
+and point the provider at it with ``url: ws://127.0.0.1:8765/v1/listen``.
+"""
+
+import asyncio
+import json
+from urllib.parse import parse_qs, urlparse
+import websockets
+from tests.mock_server import MockServer
+
+
+class MockDeepgramServer(MockServer):
+    NAME = "Deepgram"
+    URL = "ws://{host}:{port}/v1/listen"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(host, port)
+        self._loop = None
+        self._server = None
+        self.keepalives = 0
+        self.bytes_received = 0
+
+    def _open(self) -> int:
+        # The server runs on its own loop so tests can block on the provider
+        self._loop = asyncio.new_event_loop()
+
+        async def serve():
+            return await websockets.serve(self._handle, self._host, self._port)
+
+        self._server = self._loop.run_until_complete(serve())
+        return next(iter(self._server.sockets)).getsockname()[1]
+
+    def _serve(self) -> None:
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def _close(self) -> None:
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _handle(self, websocket, path: str = None):
+        self.connections += 1
+        request_path = path or websocket.request.path
+        query = parse_qs(urlparse(request_path).query)
+        sample_rate = int(query.get("sample_rate", ["16000"])[0])
+        bytes_per_second = sample_rate * 2
+
+        pending = 0  # Bytes not yet covered by a final result
+        seconds = 0  # Seconds already reported as final
+
+        async for message in websocket:
+            if isinstance(message, bytes):
+                self.bytes_received += len(message)
+                pending += len(message)
+                await websocket.send(self._results(f"audio {seconds + 1}", False))
+                if pending >= bytes_per_second:
+                    seconds += 1
+                    pending -= bytes_per_second
+                    await websocket.send(self._results(f"audio {seconds}", True))
+                continue
+
+            control = json.loads(message).get("type")
+            if control == "KeepAlive":
+                self.keepalives += 1
+            elif control == "Finalize":
+                transcript = ""
+                if pending:
+                    seconds += 1
+                    pending = 0
+                    transcript = f"audio {seconds}"
+                await websocket.send(
+                    self._results(transcript, True, from_finalize=True)
+                )
+            elif control == "CloseStream":
+                await websocket.send(json.dumps({"type": "Metadata"}))
+                await websocket.close()
+                return
+
+    @staticmethod
+    def _results(transcript: str, is_final: bool, from_finalize: bool = False) -> str:
+        return json.dumps(
+            {
+                "type": "Results",
+                "is_final": is_final,
+                "speech_final": is_final,
+                "from_finalize": from_finalize,
+                "channel": {"alternatives": [{"transcript": transcript}]},
+            }
+        )
+
+
+if __name__ == "__main__":
+    MockDeepgramServer.main(__doc__, 8765)
@@ -0,0 +1,116 @@
+"""Local stand-in for the ElevenLabs text-to-speech HTTP API
+
+Implements the streaming synthesis endpoint closely enough for
+ElevenLabsProvider to be exercised without network access or an API key.
+Responses are chunked, connections are kept alive, and the audio is a
+deterministic tone whose length follows the text. Only pcm_* output formats
+are produced.
+
+Run standalone with:
+    python -m tests.mock_elevenlabs_server --port 8766
+and point the provider at it with ``api_base: http://127.0.0.1:8766/v1``.
+"""
+
+import json
+import math
+import re
+import struct
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from tests.mock_server import MockServer
+
+STREAM_PATH = re.compile(r"^/v1/text-to-speech/([^/]+)/stream$")
+
+
+class MockElevenLabsServer(MockServer):
+    NAME = "ElevenLabs"
+    URL = "http://{host}:{port}/v1"
+    SECONDS_PER_CHAR = 0.06
+    CHUNK_BYTES = 4096
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(host, port)
+        self._server = None
+        self.requests = 0
+
+    def _open(self) -> int:
+        self._server = ThreadingHTTPServer((self._host, self._port), self._handler())
+        self._server.daemon_threads = True
+        return self._server.server_address[1]
+
+    def _serve(self) -> None:
+        self._server.serve_forever()
+
+    def _close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def synthesize(self, text: str, sample_rate: int) -> bytes:
+        """Deterministic 16-bit mono tone lasting about as long as the text"""
+        n_samples = int(max(1, len(text)) * self.SECONDS_PER_CHAR * sample_rate)
+        return struct.pack(
+            f"<{n_samples}h",
+            *(
+                int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate))
+                for i in range(n_samples)
+            ),
+        )
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if urlparse(self.path).path == "/v1/models":
+                    self._send_json(200, [{"model_id": "mock"}])
+                else:
+                    self._send_json(404, {"detail": "Not found"})
+
+            def do_POST(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not STREAM_PATH.match(url.path):
+                    self._send_json(404, {"detail": "Not found"})
+                    return
+
+                output_format = parse_qs(url.query).get("output_format", ["pcm"])[0]
+                codec, _, rate = output_format.partition("_")
+                if codec != "pcm" or not rate.isdigit():
+                    self._send_json(422, {"detail": "Mock serves pcm_* only"})
+                    return
+
+                text = json.loads(body or b"{}").get("text", "")
+                audio = server.synthesize(text, int(rate))
+
+                self.send_response(200)
+                self.send_header("Content-Type", "audio/pcm")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for offset in range(0, len(audio), server.CHUNK_BYTES):
+                    chunk = audio[offset : offset + server.CHUNK_BYTES]
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _send_json(self, status: int, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    MockElevenLabsServer.main(__doc__, 8766)
@@ -0,0 +1,66 @@
+"""Lifecycle shared by the local stand-ins for remote speech APIs"""
+
+import argparse
+import threading
+
+
+class MockServer:
+    """A local server run from a daemon thread, usable as a context manager
+
+    Subclasses bind their listening socket in ``_open`` and return the port,
+    serve it in ``_serve`` (which runs on the thread) and make ``_serve``
+    return from ``_close``. Port 0 picks a free ephemeral port.
+    """
+
+    NAME = "mock"
+    URL = "http://{host}:{port}"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._host = host
+        self._port = port
+        self._thread = None
+        self.connections = 0
+
+    @property
+    def url(self) -> str:
+        return self.URL.format(host=self._host, port=self._port)
+
+    def start(self) -> "MockServer":
+        self._port = self._open()
+        self._thread = threading.Thread(
+            target=self._serve, name=f"mock-{self.NAME.lower()}", daemon=True
+        )
+        self._thread.start()
+        print(f">>> Mock {self.NAME} server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._close()
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _open(self) -> int:
+        raise NotImplementedError
+
+    def _serve(self) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def main(cls, doc: str, default_port: int) -> None:
+        """Run the server in the foreground until interrupted"""
+        parser = argparse.ArgumentParser(description=doc.splitlines()[0])
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=default_port)
+        args = parser.parse_args()
+        with cls(args.host, args.port):
+            threading.Event().wait()
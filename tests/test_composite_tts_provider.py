@@ -0,0 +1,114 @@
+import asyncio
+import io
+import wave
+import pytest
+from core.interfaces.speech import AudioChunk, TextToSpeechProvider
+from modules.speech.composite_tts_provider import CompositeTTSProvider
+
+SAMPLE_RATE = 16000
+
+
+def tone(text: str) -> bytes:
+    """One 16-bit sample per character, so each sentence is recognisable"""
+    return b"".join(ord(c).to_bytes(2, "little") for c in text)
+
+
+class WholeClipProvider(TextToSpeechProvider):
+    """Provider that only implements synthesize(), like the F5 engine"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def synthesize(self, text: str, ref_audio: str = None) -> bytes:
+        self.requests.append(text)
+        await asyncio.sleep(0)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(SAMPLE_RATE)
+            wf.writeframes(tone(text))
+        return buffer.getvalue()
+
+
+class BatchProvider(WholeClipProvider):
+    """Batching provider that holds its batch until the test releases it"""
+
+    supports_batch = True
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.release = asyncio.Event()
+
+    async def synthesize_batch(self, texts, ref_audio=None):
+        self.batches.append(list(texts))
+        await self.release.wait()
+        for text in texts:
+            yield await WholeClipProvider.synthesize(self, text, ref_audio)
+
+
+def stream(composite: CompositeTTSProvider, text: str):
+    async def run():
+        return [chunk async for chunk in composite.synthesize_stream(text)]
+
+    return asyncio.run(run())
+
+
+def test_non_streaming_provider_streams_sentence_by_sentence():
+    provider = WholeClipProvider()
+    composite = CompositeTTSProvider(
+        {"whole": provider}, "whole", chunking={"min_chars": 1}
+    )
+    text = "The first sentence is here. And this is the second one."
+
+    chunks = stream(composite, text)
+
+    assert provider.requests == [
+        "The first sentence is here.",
+        "And this is the second one.",
+    ]
+    assert [chunk.pcm for chunk in chunks] == [tone(t) for t in provider.requests]
+    assert all(chunk.sample_rate == SAMPLE_RATE for chunk in chunks)
+    assert AudioChunk.to_wav(chunks)
+
+
+def test_empty_text_streams_nothing():
+    provider = WholeClipProvider()
+    composite = CompositeTTSProvider({"whole": provider}, "whole")
+
+    assert stream(composite, "   ") == []
+    assert provider.requests == []
+
+
+def test_batching_provider_plays_first_sentence_before_the_batch():
+    provider = BatchProvider()
+    composite = CompositeTTSProvider(
+        {"batch": provider}, "batch", chunking={"min_chars": 1}
+    )
+    text = "One sentence first. Then a second. And a third one."
+
+    async def run():
+        chunks = composite.synthesize_stream(text)
+        first = await asyncio.wait_for(chunks.__anext__(), 1)
+        # The batch is still held back, yet the first sentence is out
+        assert not provider.release.is_set()
+        provider.release.set()
+        return [first] + [chunk async for chunk in chunks]
+
+    chunks = asyncio.run(run())
+
+    assert provider.batches == [["Then a second.", "And a third one."]]
+    assert [chunk.pcm for chunk in chunks] == [
+        tone("One sentence first."),
+        tone("Then a second."),
+        tone("And a third one."),
+    ]
+
+
+def test_f5_provider_inherits_the_default_stream():
+    pytest.importorskip("numpy")
+    from modules.speech.f5_provider import F5TTSProvider
+
+    assert issubclass(F5TTSProvider, TextToSpeechProvider)
+    assert F5TTSProvider.synthesize_stream is TextToSpeechProvider.synthesize_stream
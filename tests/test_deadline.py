@@ -0,0 +1,90 @@
+import pytest
+from modules.speech.deadline import DeadlinePlanner, DecodeStrategy
+
+BASE_BEAM = DecodeStrategy("base.en", beam_size=5)
+BASE = DecodeStrategy("base.en")
+BASE_PARALLEL = DecodeStrategy("base.en", parallel=True)
+TINY = DecodeStrategy("tiny.en")
+
+
+def planner(budget_ms: float, *strategies: DecodeStrategy) -> DeadlinePlanner:
+    return DeadlinePlanner(budget_ms, list(strategies), rtf_priors={})
+
+
+def test_best_strategy_within_budget_is_chosen():
+    plan = planner(2000, BASE_BEAM, BASE, TINY)
+
+    # base beam 5 predicts 0.08 * sqrt(5) * 5 s = 0.89 s
+    assert plan.choose(5.0, 1, 4) == (BASE_BEAM, 1)
+    # ...but not for a 20 s clip, where base greedy (1.6 s) still fits
+    assert plan.choose(20.0, 1, 4) == (BASE, 1)
+
+
+def test_short_clip_falls_back_to_smaller_model():
+    plan = planner(100, BASE_BEAM, BASE, BASE_PARALLEL, TINY)
+
+    # One chunk, so parallel decoding cannot help; tiny is the only fit
+    assert plan.choose(2.0, 1, 4) == (TINY, 1)
+
+
+def test_parallel_strategy_uses_available_chunks():
+    plan = planner(1000, BASE_BEAM, BASE, BASE_PARALLEL, TINY)
+
+    # base greedy predicts 2.4 s for 30 s of audio, 0.8 s over three chunks
+    assert plan.choose(30.0, 3, 4) == (BASE_PARALLEL, 3)
+
+
+def test_fastest_strategy_when_nothing_fits():
+    plan = planner(10, BASE_BEAM, BASE)
+
+    assert plan.choose(10.0, 1, 4) == (BASE, 1)
+
+
+def test_all_parallel_strategies_are_rejected():
+    with pytest.raises(ValueError):
+        DeadlinePlanner.from_config(
+            {"enabled": True, "strategies": [{"model": "tiny.en", "parallel": True}]},
+            "base.en",
+        )
+
+
+def test_default_strategies_include_a_single_chunk_fallback():
+    plan = DeadlinePlanner.from_config(
+        {"enabled": True, "latency_budget_ms": 100}, "base.en"
+    )
+
+    strategy, parallelism = plan.choose(2.0, 1, 4)
+    assert strategy.model == "tiny.en" and not strategy.parallel
+    assert parallelism == 1
+
+
+def test_disabled_config_gives_no_planner():
+    assert DeadlinePlanner.from_config({"enabled": False}, "base.en") is None
+    assert DeadlinePlanner.from_config(None, "base.en") is None
+
+
+def test_record_tracks_measured_speed_and_budget():
+    plan = planner(500, BASE)
+
+    assert plan.record(BASE, 10.0, 0.4, 1, 0.45) is True
+    assert plan.estimate_rtf(BASE) == pytest.approx(0.04)
+    assert plan.record(BASE, 10.0, 0.6, 1, 0.65) is False
+    # Exponentially weighted: 0.04 + 0.3 * (0.06 - 0.04)
+    assert plan.estimate_rtf(BASE) == pytest.approx(0.046)
+    assert plan.stats == {"met": 1, "missed": 1}
+
+
+def test_record_scales_parallel_decodes_by_worker_count():
+    plan = planner(500, BASE, BASE_PARALLEL)
+
+    plan.record(BASE_PARALLEL, 30.0, 1.0, 3, 1.0)
+
+    assert plan.estimate_rtf(BASE_PARALLEL) == pytest.approx(0.1)
+
+
+def test_cold_decodes_do_not_move_the_estimate():
+    plan = planner(500, BASE)
+
+    assert plan.record(BASE, 5.0, 4.0, 1, 4.1, warm=False) is False
+    assert plan.estimate_rtf(BASE) == pytest.approx(0.08)
+    assert plan.stats == {"met": 0, "missed": 1}
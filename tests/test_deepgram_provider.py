@@ -0,0 +1,121 @@
+import asyncio
+import time
+import pytest
+from modules.speech.deepgram_provider import DeepgramProvider
+from tests.mock_deepgram_server import MockDeepgramServer
+
+SAMPLE_RATE = 16000
+FRAME = b"\x00\x00" * (SAMPLE_RATE // 10)  # 100 ms of silence
+
+
+@pytest.fixture
+def server():
+    with MockDeepgramServer() as mock:
+        yield mock
+
+
+@pytest.fixture
+def provider(server):
+    provider = DeepgramProvider({"url": server.url, "keepalive_interval": 0.5})
+    yield provider
+    provider.close()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+
+def test_connection_is_reused_across_utterances(server, provider):
+    first = provider.transcribe([FRAME] * 15, sample_rate=SAMPLE_RATE)
+    second = provider.transcribe([FRAME] * 5, sample_rate=SAMPLE_RATE)
+
+    assert first == "audio 1 audio 2"
+    assert second == "audio 3"
+    assert server.connections == 1
+
+
+def test_new_sample_rate_opens_a_new_connection(server, provider):
+    provider.transcribe([FRAME] * 5, sample_rate=SAMPLE_RATE)
+    provider.transcribe([FRAME] * 5, sample_rate=8000)
+
+    assert server.connections == 2
+
+
+def test_keepalive_sent_while_idle(server, provider):
+    provider.transcribe([FRAME] * 5, sample_rate=SAMPLE_RATE)
+
+    assert wait_for(lambda: server.keepalives >= 1)
+    # The idle connection is still the one the next utterance uses
+    assert provider.transcribe([FRAME] * 5, sample_rate=SAMPLE_RATE)
+    assert server.connections == 1
+
+
+def test_finalize_returns_transcript_of_pending_audio(server, provider):
+    provider.start_utterance(SAMPLE_RATE)
+    for _ in range(5):  # Half a second, too short for a final of its own
+        provider.send_audio(FRAME)
+
+    assert provider.finish_utterance(timeout=5) == "audio 1"
+    assert wait_for(lambda: server.bytes_received == 5 * len(FRAME))
+
+
+def test_interim_results_reach_the_callback(server, provider):
+    updates = []
+    provider.start_utterance(
+        SAMPLE_RATE, lambda text, is_final: updates.append((text, is_final))
+    )
+    for _ in range(12):
+        provider.send_audio(FRAME)
+    final = provider.finish_utterance(timeout=5)
+
+    assert final == "audio 1 audio 2"
+    interim = [text for text, is_final in updates if not is_final]
+    assert interim and interim[0] == "audio 1"
+    # Interim text builds on what is already final
+    assert "audio 1 audio 2" in interim
+    assert updates[-1] == ("audio 1 audio 2", True)
+
+
+def test_async_finish_does_not_block_the_caller_loop(server, provider):
+    async def run():
+        provider.start_utterance(SAMPLE_RATE)
+        for _ in range(5):
+            provider.send_audio(FRAME)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        try:
+            return await provider.finish_utterance_async(timeout=5), ticks
+        finally:
+            ticker.cancel()
+
+    text, ticks = asyncio.run(run())
+
+    assert text == "audio 1"
+    assert ticks > 0
+
+
+def test_failed_connection_is_reported_not_empty():
+    # Nothing listens on port 9 (discard) here
+    provider = DeepgramProvider({"url": "ws://127.0.0.1:9"})
+    try:
+        provider.start_utterance(SAMPLE_RATE)
+        provider.send_audio(FRAME)
+        assert provider.finish_utterance(timeout=5) is None
+
+        provider.start_utterance(SAMPLE_RATE)
+        with pytest.raises(Exception):
+            asyncio.run(provider.finish_utterance_async(timeout=5))
+    finally:
+        provider.close()
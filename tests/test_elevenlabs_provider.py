@@ -0,0 +1,83 @@
+import asyncio
+import io
+import wave
+import pytest
+from modules.speech.elevenlabs_provider import ElevenLabsProvider
+from tests.mock_elevenlabs_server import MockElevenLabsServer
+
+SAMPLE_RATE = 22050
+
+
+@pytest.fixture
+def server():
+    with MockElevenLabsServer() as mock:
+        yield mock
+
+
+def make_provider(server, **config) -> ElevenLabsProvider:
+    return ElevenLabsProvider(
+        dict(
+            api_base=server.url,
+            voice_id="mock-voice",
+            output_format=f"pcm_{SAMPLE_RATE}",
+            http2=False,
+            **config,
+        )
+    )
+
+
+def test_warmup_and_requests_share_one_connection(server):
+    provider = make_provider(server)
+    texts = ["Hello there.", "How are you today?", "Fine, thanks.", "Bye."]
+
+    async def run():
+        await provider.warmup()
+        try:
+            return [await provider.synthesize(text) for text in texts]
+        finally:
+            await provider.aclose()
+
+    results = asyncio.run(run())
+
+    assert server.connections == 1
+    assert server.requests == len(texts)
+    for text, audio in zip(texts, results):
+        with wave.open(io.BytesIO(audio), "rb") as wf:
+            assert wf.getframerate() == SAMPLE_RATE
+            assert wf.getnframes() == len(server.synthesize(text, SAMPLE_RATE)) // 2
+
+
+def test_streamed_requests_reuse_the_warm_connection(server):
+    provider = make_provider(server)
+
+    async def run():
+        await provider.warmup()
+        try:
+            for text in ["First sentence.", "Second sentence."]:
+                chunks = [chunk async for chunk in provider.synthesize_stream(text)]
+                assert chunks
+                assert all(chunk.sample_rate == SAMPLE_RATE for chunk in chunks)
+        finally:
+            await provider.aclose()
+
+    asyncio.run(run())
+
+    assert server.connections == 1
+    assert server.requests == 2
+
+
+def test_concurrent_requests_stay_within_the_pool(server):
+    provider = make_provider(server, max_connections=2)
+
+    async def run():
+        try:
+            await asyncio.gather(
+                *(provider.synthesize(f"Sentence number {i}.") for i in range(6))
+            )
+        finally:
+            await provider.aclose()
+
+    asyncio.run(run())
+
+    assert server.requests == 6
+    assert server.connections <= 2
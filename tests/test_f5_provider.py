@@ -0,0 +1,30 @@
+import asyncio
+import pytest
+
+pytest.importorskip("numpy")
+
+from modules.speech.f5_provider import F5TTSProvider
+
+
+class TrickleStream:
+    """Hands out one byte per read, so every multi-byte character is split"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def read(self, size: int) -> bytes:
+        await asyncio.sleep(0)
+        chunk, self._data = self._data[:1], self._data[1:]
+        return chunk
+
+
+def test_output_split_inside_a_character_is_decoded_whole():
+    progress = []
+    data = "ref_text: Grüße aus Köln\r 50%|█████\r100%|██████████\n"
+
+    async def run():
+        stream = TrickleStream(data.encode())
+        return await F5TTSProvider._read_output(stream, "stdout", progress.append)
+
+    assert asyncio.run(run()) == ["ref_text: Grüße aus Köln"]
+    assert progress == [50, 100]
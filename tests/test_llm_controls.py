@@ -0,0 +1,94 @@
+import asyncio
+import os
+from types import SimpleNamespace
+import pytest
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from core.interfaces.llm import LLMProvider
+from modules.llm.memory import ConversationMemory
+from ui.components.llm_controls import LLMControls
+
+
+class EchoProvider(LLMProvider):
+    """Streams the message back word by word, yielding to the loop in between"""
+
+    def get_available_models(self):
+        return ["echo"]
+
+    def get_default_model(self):
+        return "echo"
+
+    def set_model(self, model_name):
+        pass
+
+    def get_providers(self):
+        return {"echo": self}
+
+    def generate_response(self, message, system_prompt=None, history=None):
+        return f"reply to {message}"
+
+    async def generate_stream(self, message, system_prompt=None, history=None):
+        for word in f"reply to {message}".split(" "):
+            await asyncio.sleep(0.01)
+            yield word if word == "reply" else f" {word}"
+
+
+@pytest.fixture(scope="module")
+def qt_app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def controls(qt_app):
+    controls = LLMControls()
+    controls._app = SimpleNamespace(_llm_providers={"echo": EchoProvider()})
+    controls.model_combo.addItem("echo: echo")
+    return controls
+
+
+def test_overlapping_sends_each_get_their_own_reply(controls):
+    broadcast = []
+    controls.response_ready.connect(broadcast.append)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        first, second = loop.create_future(), loop.create_future()
+        controls.send_message("first", first.set_result)
+        controls.send_message("second", second.set_result)  # Queued behind first
+        return await asyncio.wait_for(asyncio.gather(first, second), 5)
+
+    assert asyncio.run(run()) == ["reply to first", "reply to second"]
+    assert broadcast == ["reply to first", "reply to second"]
+
+
+def test_rejected_message_reaches_its_callback(controls):
+    replies = []
+
+    async def run():
+        controls.send_message("   ", replies.append)
+
+    asyncio.run(run())
+
+    assert replies == ["Message cannot be empty"]
+
+
+def test_new_persona_or_model_starts_a_new_conversation(controls):
+    controls._memory = ConversationMemory()
+
+    async def send(message):
+        reply = asyncio.get_running_loop().create_future()
+        controls.send_message(message, reply.set_result)
+        return await asyncio.wait_for(reply, 5)
+
+    asyncio.run(send("first"))
+    asyncio.run(send("second"))
+    assert len(controls._memory.messages()) == 4
+
+    controls.system_prompt_edit.setPlainText("You are a pirate.")
+    asyncio.run(send("third"))
+    assert controls._memory.messages()[0]["content"] == "third"
+
+    controls._on_model_changed("echo: echo")
+    assert controls._memory.messages() == []
@@ -0,0 +1,100 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from modules.speech.long_form import find_chunks, merge_overlap, stitch_segments
+
+RATE = 16000
+
+
+def speech_with_pauses(seconds: float, pauses) -> "np.ndarray":
+    """Loud noise with silent gaps at the given (start, end) times in seconds"""
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, int(seconds * RATE)).astype(np.float32)
+    for start, end in pauses:
+        audio[int(start * RATE) : int(end * RATE)] = 0
+    return audio
+
+
+def test_short_audio_is_one_chunk():
+    audio = np.zeros(10 * RATE, dtype=np.float32)
+
+    assert find_chunks(audio, RATE) == [(0, len(audio), len(audio))]
+
+
+def test_boundaries_fall_in_pauses():
+    audio = speech_with_pauses(70, [(27.0, 27.5), (53.0, 53.5)])
+
+    chunks = find_chunks(audio, RATE, chunk_seconds=30, overlap_seconds=0.5)
+
+    boundaries = [boundary / RATE for _, boundary, _ in chunks[:-1]]
+    assert len(chunks) == 3
+    assert 27.0 <= boundaries[0] <= 27.5
+    assert 53.0 <= boundaries[1] <= 53.5
+
+
+def test_chunks_tile_the_audio_with_overlap():
+    audio = speech_with_pauses(95, [(20, 21), (44, 45)])
+
+    chunks = find_chunks(audio, RATE, chunk_seconds=30, overlap_seconds=0.5)
+
+    assert chunks[0][0] == 0
+    assert chunks[-1][1:] == (len(audio), len(audio))
+    for (_, boundary, end), (next_start, _, _) in zip(chunks, chunks[1:]):
+        assert next_start == boundary
+        assert end == boundary + RATE // 2
+    for start, boundary, _ in chunks:
+        assert 0 < boundary - start <= 30 * RATE
+
+
+def test_merge_overlap_drops_repeated_words():
+    assert merge_overlap("and then we went", "We went to the shop.") == (
+        "to the shop."
+    )
+    assert merge_overlap("it was late.", "Late, she said") == "she said"
+    assert merge_overlap("nothing shared", "here at all") == "here at all"
+    assert merge_overlap("", "fresh start") == "fresh start"
+
+
+def test_merge_overlap_prefers_the_longest_match():
+    assert merge_overlap("go go go", "go go go now") == "now"
+
+
+def test_stitch_segments_offsets_and_drops_overlap_repeats():
+    second = 30 * RATE
+    chunks = [(0, second, second + RATE // 2), (second, 50 * RATE, 50 * RATE)]
+    chunk_segments = [
+        (
+            1,
+            [
+                {"start": 0.0, "end": 2.0, "text": " we went to the shop."},
+                {"start": 2.0, "end": 4.0, "text": " It was closed."},
+            ],
+        ),
+        (
+            0,
+            [
+                {"start": 0.0, "end": 28.0, "text": " And then we went"},
+                # Starts inside the overlap, so the next chunk owns it
+                {"start": 30.1, "end": 30.5, "text": " to"},
+            ],
+        ),
+    ]
+
+    stitched = stitch_segments(chunk_segments, chunks)
+
+    assert stitched == [
+        {"start": 0.0, "end": 28.0, "text": "And then we went"},
+        {"start": 30.0, "end": 32.0, "text": "to the shop."},
+        {"start": 32.0, "end": 34.0, "text": "It was closed."},
+    ]
+
+
+def test_stitch_segments_clamps_ends_to_the_boundary():
+    chunks = [(0, 10 * RATE, 11 * RATE), (10 * RATE, 20 * RATE, 20 * RATE)]
+    chunk_segments = [(0, [{"start": 9.0, "end": 10.8, "text": "tail"}])]
+
+    assert stitch_segments(chunk_segments, chunks) == [
+        {"start": 9.0, "end": 10.0, "text": "tail"}
+    ]
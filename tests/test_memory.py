@@ -0,0 +1,127 @@
+import asyncio
+from modules.llm.memory import ConversationMemory, estimate_tokens
+
+
+def words(count: int) -> str:
+    """Text of roughly ``count`` tokens plus the message overhead"""
+    return "abc " * count
+
+
+def test_turns_within_budget_are_kept_in_order():
+    memory = ConversationMemory(max_history_tokens=1000)
+    memory.add_exchange("Hi", "Hello there")
+    memory.add_exchange("How are you?", "Fine")
+
+    assert memory.messages() == [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello there"},
+        {"role": "user", "content": "How are you?"},
+        {"role": "assistant", "content": "Fine"},
+    ]
+    assert memory._window_tokens == sum(
+        estimate_tokens(text) for text in ["Hi", "Hello there", "How are you?", "Fine"]
+    )
+
+
+def test_oldest_exchange_leaves_when_over_budget():
+    per_turn = estimate_tokens(words(20))
+    memory = ConversationMemory(max_history_tokens=per_turn * 3)
+    memory.add_exchange("first " + words(19), words(20))
+    memory.add_exchange("second " + words(19), words(20))
+
+    messages = memory.messages()
+    # Dropping the first user turn alone would open with an assistant turn
+    assert [m["role"] for m in messages] == ["user", "assistant"]
+    assert messages[0]["content"].startswith("second")
+    assert memory._window_tokens <= per_turn * 3
+    assert memory._window_tokens == sum(
+        estimate_tokens(m["content"]) for m in messages
+    )
+
+
+def test_a_single_oversized_turn_is_kept():
+    memory = ConversationMemory(max_history_tokens=10)
+    memory.add("user", words(100))
+
+    assert len(memory.messages()) == 1
+
+
+def test_evicted_turns_are_summarized_in_the_background():
+    prompts = []
+
+    async def summarizer(prompt: str) -> str:
+        prompts.append(prompt)
+        await asyncio.sleep(0)
+        return " They said hello. "
+
+    async def run():
+        memory = ConversationMemory(max_history_tokens=30, summarizer=summarizer)
+        memory.add_exchange("hello " + words(10), "hi " + words(10))
+        memory.add_exchange("next " + words(10), "ok " + words(10))
+        # The request is not held up while the summary is written
+        assert memory.summary == ""
+        await memory._summarizing
+        return memory
+
+    memory = asyncio.run(run())
+
+    assert memory.summary == "They said hello."
+    assert len(prompts) == 1 and "user: hello" in prompts[0]
+    assert memory.system_prompt("Be brief.") == (
+        "Be brief.\n\nSummary of the earlier conversation:\nThey said hello."
+    )
+
+
+def test_failed_summary_keeps_the_previous_one():
+    async def summarizer(prompt: str) -> str:
+        raise RuntimeError("offline")
+
+    async def run():
+        memory = ConversationMemory(max_history_tokens=30, summarizer=summarizer)
+        memory._summary = "Earlier."
+        memory.add_exchange(words(10), words(10))
+        memory.add_exchange(words(10), words(10))
+        await memory._summarizing
+        return memory
+
+    assert asyncio.run(run()).summary == "Earlier."
+
+
+def test_without_summarizer_evicted_turns_are_dropped():
+    memory = ConversationMemory(max_history_tokens=30)
+    memory.add_exchange(words(10), words(10))
+    memory.add_exchange(words(10), words(10))
+
+    assert memory._evicted == [] and memory._summarizing is None
+    assert memory.system_prompt("Base") == "Base"
+
+
+def test_clear_cancels_a_summary_in_progress():
+    release = None
+
+    async def summarizer(prompt: str) -> str:
+        await release.wait()
+        return "Too late."
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        memory = ConversationMemory(max_history_tokens=30, summarizer=summarizer)
+        memory.add_exchange(words(10), words(10))
+        memory.add_exchange(words(10), words(10))
+        task = memory._summarizing
+        memory.clear()
+        release.set()
+        await asyncio.gather(task, return_exceptions=True)
+        return memory, task
+
+    memory, task = asyncio.run(run())
+
+    assert task.cancelled()
+    assert memory.messages() == [] and memory.summary == ""
+
+
+def test_disabled_config_gives_no_memory():
+    assert ConversationMemory.from_config({"enabled": False}) is None
+    assert ConversationMemory.from_config(None) is None
+    assert ConversationMemory.from_config({"enabled": True}) is not None
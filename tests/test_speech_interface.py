@@ -0,0 +1,47 @@
+import wave
+from array import array
+import pytest
+from core.interfaces.speech import SpeechToTextProvider, load_wav_frames
+
+
+def write_wav(path, samples, channels=1, sample_width=2):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sample_width)
+        wf.setframerate(8000)
+        wf.writeframes(array("h", samples).tobytes())
+
+
+class LengthProvider(SpeechToTextProvider):
+    """Transcribes a clip as its sample count and rate"""
+
+    def transcribe(self, audio_data, sample_rate=44100):
+        return f"{len(b''.join(audio_data)) // 2} samples at {sample_rate}"
+
+
+def test_stereo_is_downmixed_toward_zero(tmp_path):
+    write_wav(tmp_path / "stereo.wav", [100, 300, -3, -4, 32767, 32767], channels=2)
+
+    frames, sample_rate = load_wav_frames(str(tmp_path / "stereo.wav"))
+
+    assert sample_rate == 8000
+    assert array("h", frames[0]).tolist() == [200, -3, 32767]
+
+
+def test_only_16_bit_audio_is_accepted(tmp_path):
+    write_wav(tmp_path / "wide.wav", [0, 0], sample_width=4)
+
+    with pytest.raises(ValueError):
+        load_wav_frames(str(tmp_path / "wide.wav"))
+
+
+def test_default_batch_transcribes_each_file(tmp_path):
+    write_wav(tmp_path / "mono.wav", [1, 2, 3])
+    write_wav(tmp_path / "stereo.wav", [1, 2, 3, 4], channels=2)
+    paths = [str(tmp_path / name) for name in ["mono.wav", "missing.wav", "stereo.wav"]]
+
+    assert LengthProvider().transcribe_batch(paths) == [
+        "3 samples at 8000",
+        None,
+        "2 samples at 8000",
+    ]
@@ -0,0 +1,83 @@
+from modules.speech.text_chunking import split_for_synthesis
+
+
+def test_sentences_become_chunks():
+    text = "The first sentence is here. Is this the second one? Yes, it is!"
+
+    assert split_for_synthesis(text, min_chars=1) == [
+        "The first sentence is here.",
+        "Is this the second one?",
+        "Yes, it is!",
+    ]
+
+
+def test_closing_quotes_stay_with_their_sentence():
+    text = 'She said "stop right there." Then (after a while.) she left'
+
+    assert split_for_synthesis(text, min_chars=1) == [
+        'She said "stop right there."',
+        "Then (after a while.)",
+        "she left",
+    ]
+
+
+def test_whitespace_is_collapsed():
+    assert split_for_synthesis("  One   two\n\nthree.  ", min_chars=1) == [
+        "One two three."
+    ]
+    assert split_for_synthesis("   ") == []
+
+
+def test_short_fragments_join_the_next_chunk():
+    text = "Hi. Ok. This sentence is long enough on its own."
+
+    assert split_for_synthesis(text, min_chars=20) == [
+        "Hi. Ok. This sentence is long enough on its own."
+    ]
+
+
+def test_short_tail_joins_the_previous_chunk():
+    text = "This sentence is long enough on its own. Bye."
+
+    assert split_for_synthesis(text, min_chars=20) == [
+        "This sentence is long enough on its own. Bye."
+    ]
+
+
+def test_long_sentence_splits_at_clause_breaks():
+    text = "When the rain stopped, the streets were empty; nobody came out."
+
+    chunks = split_for_synthesis(text, max_chars=30, min_chars=1)
+
+    assert chunks == [
+        "When the rain stopped,",
+        "the streets were empty;",
+        "nobody came out.",
+    ]
+
+
+def test_clause_without_breaks_is_word_wrapped():
+    text = "one two three four five six seven eight nine ten eleven twelve."
+
+    chunks = split_for_synthesis(text, max_chars=20, min_chars=1)
+
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_unbroken_text_is_cut_at_the_limit():
+    chunks = split_for_synthesis("x" * 45, max_chars=20, min_chars=1)
+
+    assert chunks == ["x" * 20, "x" * 20, "x" * 5]
+
+
+def test_chunks_never_exceed_the_limit():
+    text = " ".join(
+        f"Sentence number {n} has a clause, then another clause; and more."
+        for n in range(20)
+    )
+
+    chunks = split_for_synthesis(text, max_chars=40, min_chars=15)
+
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
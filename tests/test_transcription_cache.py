@@ -0,0 +1,80 @@
+import sqlite3
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from modules.speech.transcription_cache import TranscriptionCache
+
+
+def sizes(path) -> dict:
+    with sqlite3.connect(path) as db:
+        return dict(db.execute("SELECT key, size FROM transcripts"))
+
+
+def test_key_covers_audio_model_and_options():
+    audio = np.linspace(-1, 1, 1600, dtype=np.float32)
+    key = TranscriptionCache.make_key(audio, "base.en", {"beam_size": 5})
+
+    assert key == TranscriptionCache.make_key(
+        audio.astype(np.float64), "base.en", {"beam_size": 5}
+    )
+    assert key != TranscriptionCache.make_key(audio, "tiny.en", {"beam_size": 5})
+    assert key != TranscriptionCache.make_key(audio, "base.en", {"beam_size": 1})
+    assert key != TranscriptionCache.make_key(audio[1:], "base.en", {"beam_size": 5})
+    assert TranscriptionCache.make_key(
+        audio, "base.en", {"a": 1, "b": 2}
+    ) == TranscriptionCache.make_key(audio, "base.en", {"b": 2, "a": 1})
+
+
+def test_disk_entries_outlive_the_memory_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TranscriptionCache(path, memory_entries=1)
+    cache.put("a", "first")
+    cache.put("b", "second")  # Pushes "a" out of memory
+
+    assert cache.get("a") == "first"
+    cache.close()
+
+    reopened = TranscriptionCache(path)
+    assert reopened.get("b") == "second"
+    assert reopened._total_bytes == sum(sizes(path).values())
+    reopened.close()
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TranscriptionCache(path, memory_entries=1, max_bytes=3 * 11)
+    for key in ["k1", "k2", "k3"]:
+        cache.put(key, "x" * 9)  # 11 bytes with the key
+    assert cache.get("k1") == "x" * 9  # Disk hit, k2 is now the oldest
+
+    cache.put("k4", "x" * 9)
+
+    assert sorted(sizes(path)) == ["k1", "k3", "k4"]
+    assert cache._total_bytes == 33
+    cache.close()
+
+
+def test_replacing_an_entry_keeps_the_running_total(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TranscriptionCache(path)
+    cache.put("k", "short")
+    cache.put("k", "a longer transcript")
+
+    assert cache._total_bytes == sum(sizes(path).values())
+    cache.close()
+
+
+def test_writes_from_another_process_are_picked_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(TranscriptionCache, "RESYNC_WRITES", 2)
+    path = str(tmp_path / "cache.sqlite3")
+    ours = TranscriptionCache(path, memory_entries=1)
+    theirs = TranscriptionCache(path, memory_entries=1)
+    theirs.put("theirs", "x" * 90)
+
+    ours.put("a", "x")
+    ours.put("b", "x")
+
+    assert ours._total_bytes == 100
+    ours.close()
+    theirs.close()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+from core.interfaces.speech import TextToSpeechProvider
+from modules.speech.tts_cache import CachedTTSProvider, TTSCache
+
+
+class RecordingProvider(TextToSpeechProvider):
+    """Batching provider that records what it was asked to synthesize"""
+
+    supports_batch = True
+
+    def __init__(self, voice: str = "alice"):
+        self.voice = voice
+        self.requests = []
+
+    def cache_identity(self, ref_audio: str = None) -> dict:
+        return {"voice": self.voice, "ref_audio": ref_audio}
+
+    async def synthesize(self, text: str, ref_audio: str = None) -> bytes:
+        self.requests.append(text)
+        return f"{self.voice}:{text}".encode()
+
+    async def synthesize_batch(self, texts, ref_audio=None):
+        self.requests.append(list(texts))
+        for text in texts:
+            yield f"{self.voice}:{text}".encode()
+
+
+def test_key_ignores_only_whitespace_and_composition():
+    key = TTSCache.make_key("f5", {"voice": "alice"}, "Café  au lait.")
+
+    assert key == TTSCache.make_key("f5", {"voice": "alice"}, " Café au lait. ")
+    assert key != TTSCache.make_key("f5", {"voice": "alice"}, "café au lait.")
+    assert key != TTSCache.make_key("f5", {"voice": "alice"}, "Café au lait!")
+    assert key != TTSCache.make_key("f5", {"voice": "bob"}, "Café au lait.")
+    assert key != TTSCache.make_key("local", {"voice": "alice"}, "Café au lait.")
+
+
+def test_voice_change_is_never_served_stale_audio():
+    provider = RecordingProvider()
+    cached = CachedTTSProvider(provider, "f5", TTSCache(directory=None))
+
+    async def run():
+        first = await cached.synthesize("Hello.")
+        again = await cached.synthesize("Hello.")
+        provider.voice = "bob"
+        return first, again, await cached.synthesize("Hello.")
+
+    assert asyncio.run(run()) == (b"alice:Hello.", b"alice:Hello.", b"bob:Hello.")
+    assert provider.requests == ["Hello.", "Hello."]
+
+
+def test_batch_only_synthesizes_misses_and_keeps_order(tmp_path):
+    provider = RecordingProvider()
+    cached = CachedTTSProvider(provider, "f5", TTSCache(str(tmp_path)))
+
+    async def run():
+        await cached.synthesize("Two.")
+        await cached.synthesize("Four.")
+        texts = ["One.", "Two.", "Three.", "Four."]
+        return [audio async for audio in cached.synthesize_batch(texts)]
+
+    assert asyncio.run(run()) == [
+        b"alice:One.",
+        b"alice:Two.",
+        b"alice:Three.",
+        b"alice:Four.",
+    ]
+    assert provider.requests == ["Two.", "Four.", ["One.", "Three."]]
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_disk_hit_after_restart(tmp_path):
+    TTSCache(str(tmp_path)).put("key", b"audio")
+
+    async def run():
+        return await TTSCache(str(tmp_path)).get_async("key")
+
+    assert asyncio.run(run()) == b"audio"
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = TTSCache(str(tmp_path), memory_entries=1, max_bytes=30)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.put(key, b"x" * 10)
+        os.utime(tmp_path / f"{key}.wav", (index, index))
+    os.utime(tmp_path / "a.wav", (10, 10))  # Used most recently
+
+    cache.put("d", b"x" * 10)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.wav", "c.wav", "d.wav"]
+    assert TTSCache(str(tmp_path))._total_bytes == 30
@@ -0,0 +1,194 @@
+import asyncio
+import pytest
+from core.interfaces.speech import TextToSpeechProvider
+from modules.speech.composite_tts_provider import CompositeTTSProvider
+from modules.speech.tts_routing import ProviderHealth, TTSRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def router(clock, **options) -> TTSRouter:
+    options = dict(failure_threshold=2, cooldown_seconds=30.0, **options)
+    return TTSRouter(["primary", "backup"], clock=clock, **options)
+
+
+def open_circuit(routing: TTSRouter, name: str = "primary"):
+    for _ in range(2):
+        routing.record_start(name)
+        routing.record_failure(name, RuntimeError("down"))
+
+
+def test_consecutive_failures_open_the_circuit(clock):
+    routing = router(clock)
+    routing.record_failure("primary", RuntimeError("down"))
+    assert routing.candidates("primary") == ["primary", "backup"]
+
+    routing.record_failure("primary", RuntimeError("down"))
+
+    assert routing.candidates("primary") == ["backup"]
+    assert routing.snapshot()["providers"]["primary"]["circuit_open"] is True
+
+
+def test_success_resets_the_failure_count(clock):
+    routing = router(clock)
+    routing.record_failure("primary", RuntimeError("down"))
+    routing.record_success("primary", 0.2)
+    routing.record_failure("primary", RuntimeError("down"))
+
+    assert routing.candidates("primary")[0] == "primary"
+
+
+def test_half_open_circuit_lets_one_trial_through(clock):
+    routing = router(clock)
+    open_circuit(routing)
+
+    clock.now += 29
+    assert routing.candidates("primary") == ["backup"]
+
+    clock.now += 1
+    assert routing.candidates("primary") == ["primary", "backup"]
+    routing.record_start("primary")
+    # A burst while the trial runs still goes elsewhere
+    assert routing.candidates("primary") == ["backup"]
+    assert routing.candidates("primary") == ["backup"]
+
+    routing.record_success("primary", 0.3)
+    assert routing.candidates("primary") == ["primary", "backup"]
+    assert routing.snapshot()["providers"]["primary"]["circuit_open"] is False
+
+
+def test_failed_trial_restarts_the_cooldown(clock):
+    routing = router(clock)
+    open_circuit(routing)
+    clock.now += 30
+    routing.record_start("primary")
+    routing.record_failure("primary", RuntimeError("still down"))
+
+    clock.now += 29
+    assert routing.candidates("primary") == ["backup"]
+    clock.now += 1
+    assert routing.candidates("primary")[0] == "primary"
+
+
+def test_lost_trial_is_given_up_after_a_cooldown(clock):
+    routing = router(clock)
+    open_circuit(routing)
+    clock.now += 30
+    routing.record_start("primary")  # Cancelled, never reports back
+
+    clock.now += 29
+    assert routing.candidates("primary") == ["backup"]
+    clock.now += 1
+    assert routing.candidates("primary")[0] == "primary"
+
+
+def test_all_open_circuits_still_return_every_provider(clock):
+    routing = router(clock)
+    open_circuit(routing, "primary")
+    open_circuit(routing, "backup")
+
+    assert routing.candidates("backup") == ["backup", "primary"]
+
+
+def test_fallback_order_follows_the_preferred_provider(clock):
+    routing = TTSRouter(["a", "b", "c"], fallback_order=["c", "a"], clock=clock)
+
+    assert routing.candidates("b") == ["b", "c", "a"]
+    assert routing.candidates("a") == ["a", "c", "b"]
+
+
+def test_latency_ewma_and_percentile():
+    health = ProviderHealth("p", smoothing=0.5)
+    for latency in [1.0, 2.0]:
+        health.record_success(latency)
+    assert health.ewma == pytest.approx(1.5)
+    assert health.percentile(0.95) is None  # Too few samples
+
+    for latency in [3.0, 4.0, 5.0]:
+        health.record_success(latency)
+    assert health.percentile(0.95) == 5.0
+    assert health.percentile(0.5) == 3.0
+
+
+def test_error_rate_covers_the_window():
+    health = ProviderHealth("p", window=4, failure_threshold=10)
+    health.record_success(0.1)
+    for _ in range(3):
+        health.record_failure(RuntimeError("down"))
+    assert health.error_rate == pytest.approx(0.75)
+
+    health.record_success(0.1)  # Pushes the first success out
+    assert health.error_rate == pytest.approx(0.75)
+
+
+def test_hedge_delay_uses_p95_with_a_floor(clock):
+    routing = router(clock, hedge_min_ms=800, hedge_default_ms=3000)
+    assert routing.hedge_delay("primary") == pytest.approx(3.0)
+
+    for latency in [0.1, 0.2, 0.3, 0.4, 0.5]:
+        routing.record_success("primary", latency)
+    assert routing.hedge_delay("primary") == pytest.approx(0.8)
+
+    for latency in [2.0] * 5:
+        routing.record_success("primary", latency)
+    assert routing.hedge_delay("primary") == pytest.approx(2.0)
+
+    assert router(clock, hedge=False).hedge_delay("primary") is None
+
+
+class TimedProvider(TextToSpeechProvider):
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.cancelled = False
+
+    async def synthesize(self, text: str, ref_audio: str = None) -> bytes:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError("synthesis failed")
+        return text.encode()
+
+
+def composite(primary, backup, **routing) -> CompositeTTSProvider:
+    return CompositeTTSProvider(
+        {"primary": primary, "backup": backup},
+        "primary",
+        routing=dict(enabled=True, **routing),
+    )
+
+
+def test_slow_provider_is_hedged_and_cancelled():
+    slow, fast = TimedProvider(5.0), TimedProvider(0.01)
+    tts = composite(slow, fast, hedge_default_ms=50, hedge_min_ms=0)
+
+    assert asyncio.run(tts.synthesize("hello")) == b"hello"
+
+    stats = tts.get_routing_stats()
+    assert stats["hedges"] == 1 and stats["hedges_won"] == 1
+    assert slow.cancelled
+
+
+def test_failure_fails_over_without_waiting_for_a_hedge():
+    broken, backup = TimedProvider(0.0, fail=True), TimedProvider(0.0)
+    tts = composite(broken, backup, hedge=False)
+
+    assert asyncio.run(tts.synthesize("hello")) == b"hello"
+
+    stats = tts.get_routing_stats()
+    assert stats["failovers"] == 1 and stats["hedges"] == 0
+    assert stats["providers"]["primary"]["error_rate"] == 1.0
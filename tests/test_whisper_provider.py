@@ -0,0 +1,94 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+whisper = pytest.importorskip("whisper")
+
+from modules.speech.whisper_provider import WhisperProvider
+
+
+def segment(text="hello", avg_logprob=-0.2, no_speech_prob=0.1, ratio=1.2, tokens=5):
+    return {
+        "text": text,
+        "avg_logprob": avg_logprob,
+        "no_speech_prob": no_speech_prob,
+        "compression_ratio": ratio,
+        "tokens": list(range(tokens)),
+    }
+
+
+class FakeModel:
+    def __init__(self, name, segments):
+        self.name = name
+        self.segments = segments
+        self.calls = 0
+
+    def transcribe(self, audio, fp16=False, **options):
+        self.calls += 1
+        text = " ".join(s["text"] for s in self.segments)
+        return {"text": f"{self.name}: {text}", "segments": self.segments}
+
+
+@pytest.fixture
+def models(monkeypatch):
+    models = {"base.en": FakeModel("base", [segment()])}
+    monkeypatch.setattr(whisper, "load_model", lambda name, device=None: models[name])
+    return models
+
+
+def cascade(models, draft_segments) -> WhisperProvider:
+    models["tiny.en"] = FakeModel("tiny", draft_segments)
+    return WhisperProvider(
+        {"model": "base.en", "device": "cpu", "cascade": {"enabled": True}}
+    )
+
+
+def decode(provider) -> str:
+    return provider._decode(np.zeros(16000, dtype=np.float32))["text"]
+
+
+def test_confident_draft_is_kept(models):
+    provider = cascade(models, [segment("hello")])
+
+    assert decode(provider) == "tiny: hello"
+    assert models["base.en"].calls == 0
+    assert provider._cascade_stats == {"draft": 1, "escalated": 0}
+
+
+@pytest.mark.parametrize(
+    "draft",
+    [
+        segment(avg_logprob=-1.5),
+        segment(no_speech_prob=0.9),
+        segment(ratio=3.0),
+        segment(text="  "),
+    ],
+    ids=["low logprob", "likely silence", "repetitive", "empty"],
+)
+def test_unsure_draft_escalates(models, draft):
+    provider = cascade(models, [draft])
+
+    assert decode(provider) == "base: hello"
+    assert models["base.en"].calls == 1
+    assert provider._cascade_stats == {"draft": 0, "escalated": 1}
+
+
+def test_logprob_is_weighted_by_token_count(models):
+    # Mean per segment is -0.95, but the long confident segment dominates
+    provider = cascade(
+        models,
+        [
+            segment("a long confident segment", avg_logprob=-0.3, tokens=20),
+            segment("uh", avg_logprob=-1.6, tokens=1),
+        ],
+    )
+
+    assert decode(provider).startswith("tiny:")
+
+
+def test_without_cascade_only_the_main_model_decodes(models):
+    models["tiny.en"] = FakeModel("tiny", [segment()])
+    provider = WhisperProvider({"model": "base.en", "device": "cpu"})
+
+    assert decode(provider) == "base: hello"
+    assert models["tiny.en"].calls == 0
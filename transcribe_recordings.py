@@ -0,0 +1,60 @@
+import argparse
+import sys
+import logging
+import traceback
+from config.settings import AppConfig
+from modules.speech.batch import transcribe_directory
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Transcribe recorded WAV files and write transcripts next to them"
+    )
+    parser.add_argument(
+        "directory", nargs="?", default="recordings", help="Directory of WAV files"
+    )
+    parser.add_argument(
+        "--config", default="app-settings.yaml", help="Application settings file"
+    )
+    parser.add_argument(
+        "--provider", help="STT provider type (default: speech.stt.provider_type)"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: one per core)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=16, help="Files per worker task"
+    )
+    parser.add_argument(
+        "--overwrite", action="store_true", help="Re-transcribe existing transcripts"
+    )
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    logger = logging.getLogger(__name__)
+    args = parse_args()
+
+    try:
+        config = AppConfig.load(args.config)
+        provider_type = args.provider or config.speech.stt.provider_type
+        stt_config = config.speech.stt.config.get(provider_type, {})
+
+        transcribe_directory(
+            args.directory,
+            provider_type,
+            stt_config,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            overwrite=args.overwrite,
+        )
+        return 0
+    except Exception as e:
+        logger.error(f"!!! Batch transcription failed: {str(e)}")
+        logger.error(f"Stack trace:\n{traceback.format_exc()}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,7 @@ from core.interfaces.audio import (
     AudioOutputProvider,
 )
 from core.interfaces.speech import (
+    AudioChunk,
     SpeechToTextProvider,
     TextToSpeechProvider,
 )
@@ -27,7 +28,6 @@ import asyncio
 from typing import Optional, AsyncIterator
 from PyQt6.QtWidgets import QApplication
 import traceback
-import io
 from .components.llm_controls import LLMControls
 from .components.assistant_controls import AssistantControls
 
@@ -38,6 +38,7 @@ class ChatWindow(QMainWindow):
         self._event_bus = EventBus.get_instance()
         self._settings = QSettings("AIAssistant", "Chat")
         self._setup_pending = True
+        self._pending_reply = None  # Reply text the pipeline's speech awaits
 
     def set_app(self, app):
         """Set application instance and complete setup"""
@@ -77,11 +78,11 @@ class ChatWindow(QMainWindow):
         self.audio_controls.recording_started.connect(self._on_recording_started)
         self.audio_controls.recording_stopped.connect(self._on_recording_stopped)
         self.audio_controls.transcription_ready.connect(self._on_transcription_ready)
+        self.audio_controls.transcription_failed.connect(self._on_transcription_failed)
         top_layout.addWidget(self.audio_controls)
 
         # Add TTS controls below audio controls
-        self.tts_controls = TTSControls()
-        self.tts_controls.tts_generated.connect(self._on_tts_generated)
+        self.tts_controls = TTSControls(fillers=self.app.fillers)
         top_layout.addWidget(self.tts_controls)
 
         # Add Full Pipeline button to top section
@@ -104,9 +105,9 @@ class ChatWindow(QMainWindow):
         self.input_area.recording_toggled.connect(
             self.audio_controls.record_button.setChecked
         )
-
-        # Connect LLM response to message view through our handler
-        self.llm_controls.response_ready.connect(self._on_llm_response)
+        self.audio_controls.interim_transcription.connect(
+            self.input_area.text_edit.setPlainText
+        )
 
         # Add widgets to splitter
         splitter.addWidget(top_widget)
@@ -132,14 +133,13 @@ class ChatWindow(QMainWindow):
         self.message_view.add_message(user_message)
 
         # Forward to LLM controls asynchronously
-        QTimer.singleShot(0, lambda: self.llm_controls.send_message(message))
+        QTimer.singleShot(
+            0, lambda: self.llm_controls.send_message(message, self._on_llm_response)
+        )
 
     def _on_llm_response(self, response: str):
         """Handle regular (non-pipeline) LLM response"""
         try:
-            # Disconnect to prevent duplicate responses
-            self.llm_controls.response_ready.disconnect(self._on_llm_response)
-
             # Add assistant message to view
             assistant_message = Message("Assistant", response)
             self.message_view.add_message(assistant_message)
@@ -282,24 +282,16 @@ class ChatWindow(QMainWindow):
             # Convert text to speech
             audio_data = await tts_provider.synthesize(text)
 
-            # Use AudioInputProvider here too
+            # Play on the audio provider's worker thread, not the event loop
             audio_provider = self.registry.get_provider(AudioInputProvider)
-            audio_provider.play_audio(io.BytesIO(audio_data))
 
-        except Exception as e:
-            print(f"!!! Error during TTS: {e}")
-            print(traceback.format_exc())
+            async def chunks():
+                yield AudioChunk.from_wav(audio_data)
+
+            await audio_provider.play_stream(chunks())
 
-    def _on_tts_generated(self, audio_data: bytes):
-        """Handle TTS generated audio"""
-        try:
-            # Use AudioInputProvider instead of AudioOutputProvider since that's what we registered
-            audio_provider = ProviderRegistry.get_instance().get_provider(
-                AudioInputProvider
-            )
-            audio_provider.play_audio(io.BytesIO(audio_data))
         except Exception as e:
-            print(f"!!! Error playing TTS audio: {e}")
+            print(f"!!! Error during TTS: {e}")
             print(traceback.format_exc())
 
     def _on_transcription_ready(self, text: str):
@@ -319,16 +311,20 @@ class ChatWindow(QMainWindow):
         user_message = Message(username, text)
         self.message_view.add_message(user_message)
 
-        # Send to LLM - ensure we're using a fresh connection
-        try:
-            self.llm_controls.response_ready.disconnect(self._on_llm_response)
-        except:
-            pass
-        self.llm_controls.response_ready.connect(self._on_llm_response)
-        self.llm_controls.send_message(text)
+        # Send to LLM; the reply comes back to this request's handler
+        self.llm_controls.send_message(text, self._on_llm_response)
+
+    def _on_transcription_failed(self, error: str):
+        """Stop waiting for a transcript that is not coming"""
+        print(f"!!! {error}")
+        self.input_area.setEnabled(True)
+        if self.pipeline_button.isChecked():
+            self._end_pipeline()
 
     def _on_assistant_changed(self, model: str, system_prompt: str):
         """Handle assistant selection"""
+        # A new assistant starts a new conversation, even on the same model
+        self.llm_controls.reset_conversation()
         if model:  # If an assistant was selected
             # Find the provider:model format
             for provider_name, provider in self.app._llm_providers.items():
@@ -353,7 +349,6 @@ class ChatWindow(QMainWindow):
                 try:
                     self.audio_controls.transcription_ready.disconnect()  # Disconnect all slots
                     self.audio_controls.recording_stopped.disconnect()  # Disconnect all slots
-                    self.llm_controls.response_ready.disconnect()  # Disconnect all slots
                 except:
                     pass
 
@@ -408,18 +403,6 @@ class ChatWindow(QMainWindow):
         except Exception as e:
             print(f">>> Transcription handler not connected: {e}")
 
-        try:
-            print(">>> Disconnecting pipeline LLM handler")
-            self.llm_controls.response_ready.disconnect(self._on_pipeline_llm_response)
-        except Exception as e:
-            print(f">>> LLM handler not connected: {e}")
-
-        try:
-            print(">>> Disconnecting pipeline TTS handler")
-            self.tts_controls.tts_generated.disconnect(self._on_pipeline_tts_complete)
-        except Exception as e:
-            print(f">>> TTS handler not connected: {e}")
-
     def _on_pipeline_recording_stopped(self):
         """Handle recording stop in pipeline"""
         print(">>> Step 3: Recording stopped, waiting for transcription")
@@ -454,28 +437,34 @@ class ChatWindow(QMainWindow):
         # Process events to update UI immediately
         QApplication.processEvents()
 
-        # Clean up any existing LLM response connection
-        try:
-            self.llm_controls.response_ready.disconnect(self._on_pipeline_llm_response)
-        except:
-            pass
+        # Start speaking now: a filler covers the wait for the reply
+        reply = self._start_reply_speech()
 
-        # Send to LLM
+        # Send to LLM; the reply goes to this run's speech, not a later one's
         print(">>> Step 5: Sending to LLM for response")
-        self.llm_controls.response_ready.connect(self._on_pipeline_llm_response)
-        self.llm_controls.send_message(text)
+        self.llm_controls.send_message(
+            text, lambda response: self._on_pipeline_llm_response(response, reply)
+        )
+
+    def _on_pipeline_llm_response(self, response: str, reply: Optional[asyncio.Future]):
+        """Handle LLM response in pipeline
 
-    def _on_pipeline_llm_response(self, response: str):
-        """Handle LLM response in pipeline"""
+        Args:
+            response: Response or error text of the pipeline's request
+            reply: Future the speech of the same pipeline run awaits
+        """
         print(f"\n>>> Step 6: Got LLM response")
 
-        # Disconnect LLM handler immediately
-        self.llm_controls.response_ready.disconnect(self._on_pipeline_llm_response)
+        # The pipeline may have been stopped while the LLM was replying
+        if reply is None or reply.done():
+            print(">>> Pipeline already ended, not speaking the reply")
+            return
 
         # Check if response is an error message
         if response.startswith("Error:") or "error" in response.lower():
             print("!!! LLM returned an error, stopping pipeline")
-            self._end_pipeline()
+            # Stops the filler; the speech task then ends the pipeline
+            reply.cancel()
             return
 
         # Immediately show assistant message in chat
@@ -485,29 +474,32 @@ class ChatWindow(QMainWindow):
         # Process events to update UI immediately
         QApplication.processEvents()
 
-        # Clean up any existing TTS connection
-        try:
-            self.tts_controls.tts_generated.disconnect(self._on_pipeline_tts_complete)
-        except:
-            pass
-
-        print(">>> Step 7: Sending to TTS for speech synthesis")
-        self.tts_controls.tts_generated.connect(self._on_pipeline_tts_complete)
+        print(">>> Step 7: Streaming TTS speech synthesis")
+        reply.set_result(response)
 
+    def _start_reply_speech(self) -> Optional[asyncio.Future]:
+        """Begin playback before the LLM replies; returns the future for its text"""
+        self._pending_reply = None
         try:
             loop = asyncio.get_event_loop()
+            self._pending_reply = loop.create_future()
+            # Playback overlaps synthesis; the task ends when speech has played
             synthesis_task = loop.create_task(
-                self.tts_controls.synthesize_text(response)
+                self.tts_controls.speak_reply(self._pending_reply)
             )
 
-            def handle_synthesis_error(task):
+            def handle_synthesis_done(task):
                 try:
                     task.result()
+                    print(">>> Pipeline completed successfully")
                 except Exception as e:
                     print(f"!!! Error in TTS synthesis task: {e}")
-                    self._end_pipeline()
+                finally:
+                    if self.pipeline_button.isChecked():
+                        self._end_pipeline()
 
-            synthesis_task.add_done_callback(handle_synthesis_error)
+            synthesis_task.add_done_callback(handle_synthesis_done)
+            return self._pending_reply
 
         except Exception as e:
             print(f"!!! Error starting TTS synthesis: {e}")
@@ -516,6 +508,8 @@ class ChatWindow(QMainWindow):
     def _end_pipeline(self):
         """Clean up and end the pipeline"""
         print("\n=== Ending Pipeline Mode ===")
+        if self._pending_reply and not self._pending_reply.done():
+            self._pending_reply.cancel()  # Stops any filler still playing
         self.pipeline_button.setChecked(False)
         self.pipeline_button.setText("🎙️ Record → Text → LLM → Speech")
 
@@ -534,22 +528,6 @@ class ChatWindow(QMainWindow):
             self._on_recording_stopped, type=Qt.ConnectionType.UniqueConnection
         )
 
-    def _on_pipeline_tts_complete(self, audio_data: bytes):
-        """Handle TTS completion in pipeline"""
-        try:
-            if not audio_data:
-                print("!!! No audio data received from TTS")
-                self._end_pipeline()
-                return
-
-            print(">>> Pipeline completed successfully")
-
-        except Exception as e:
-            print(f"!!! Error in TTS completion handler: {e}")
-        finally:
-            # End the pipeline after TTS completes
-            self._end_pipeline()
-
 
 # TODO: Audio Integration Status
 # - Basic audio playback working for recordings
@@ -10,9 +10,13 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from core.interfaces.audio import AudioInputProvider, AudioConfig
-from core.interfaces.speech import SpeechToTextProvider
+from core.interfaces.speech import (
+    SpeechToTextProvider,
+    StreamingSpeechToTextProvider,
+)
 from utils.registry import ProviderRegistry
 import numpy as np
+import asyncio
 import traceback
 import os
 from datetime import datetime
@@ -27,6 +31,8 @@ class AudioControls(QWidget):
     recording_started = pyqtSignal()
     recording_stopped = pyqtSignal()
     transcription_ready = pyqtSignal(str)
+    transcription_failed = pyqtSignal(str)  # Emits the error message
+    interim_transcription = pyqtSignal(str)  # Running text from streaming STT
     input_device_changed = pyqtSignal(int)
     output_device_changed = pyqtSignal(int)
 
@@ -36,6 +42,9 @@ class AudioControls(QWidget):
             AudioInputProvider
         )
         self._recording = False
+        self._streaming_stt = None
+        self._frames_streamed = 0
+        self._sample_rate = None  # Rate of the current recording
         self._setup_ui()
         self._load_devices()
         self._recordings_dir = "recordings"
@@ -272,6 +281,8 @@ class AudioControls(QWidget):
                 print(f">>> Audio config: {config}")
 
                 self._provider.start_stream(config)
+                self._sample_rate = config.sample_rate
+                self._start_streaming_transcription(config.sample_rate)
                 self._level_timer.start()
                 self._recording = True
                 self.recording_started.emit()
@@ -291,9 +302,8 @@ class AudioControls(QWidget):
             self._recording = False
 
             # Disable all controls during processing
-            self.record_button.setEnabled(False)
-            self.play_button.setEnabled(False)
-            self.test_sound_button.setEnabled(False)
+            self._set_controls_enabled(False)
+            finishing = None
 
             try:
                 # Stop the stream and wait for processing
@@ -312,11 +322,22 @@ class AudioControls(QWidget):
                 speech_provider = ProviderRegistry.get_instance().get_provider(
                     SpeechToTextProvider
                 )
-                if speech_provider and self._provider._recorded_frames:
+                if self._streaming_stt is not None:
+                    # Audio was sent while recording, only the tail is left
+                    self._stream_new_frames()
+                    streaming_stt, self._streaming_stt = self._streaming_stt, None
+                    # Await the final transcript without blocking the GUI thread
+                    finishing = asyncio.ensure_future(
+                        self._finish_streaming_transcription(streaming_stt)
+                    )
+                    return
+                elif speech_provider and self._provider._recorded_frames:
                     print(
                         f">>> Starting transcription with {len(self._provider._recorded_frames)} frames"
                     )
-                    text = speech_provider.transcribe(self._provider._recorded_frames)
+                    text = speech_provider.transcribe(
+                        self._provider._recorded_frames, sample_rate=self._sample_rate
+                    )
                     print(f">>> Transcribed Text: {text}")
                     self.transcription_ready.emit(text)
                 else:
@@ -331,11 +352,32 @@ class AudioControls(QWidget):
                 print(f"Error during recording stop/transcription: {e}")
                 print(traceback.format_exc())
             finally:
-                # Re-enable controls
-                self.record_button.setEnabled(True)
-                self.play_button.setEnabled(True)
-                self.test_sound_button.setEnabled(True)
-                self.record_button.setText("Start Recording")
+                if finishing is None:
+                    self._set_controls_enabled(True)
+
+    async def _finish_streaming_transcription(
+        self, streaming_stt: StreamingSpeechToTextProvider
+    ):
+        """Wait for the final transcript, then report it like a batch one"""
+        try:
+            text = await streaming_stt.finish_utterance_async()
+            print(f">>> Transcribed Text: {text}")
+            self.transcription_ready.emit(text)
+        except Exception as e:
+            error = f"Transcription failed: {e or type(e).__name__}"
+            print(f"!!! {error}")
+            self.transcription_failed.emit(error)
+        finally:
+            self.recording_stopped.emit()
+            self._set_controls_enabled(True)
+
+    def _set_controls_enabled(self, enabled: bool):
+        """Enable or disable the controls while a recording is processed"""
+        self.record_button.setEnabled(enabled)
+        self.play_button.setEnabled(enabled)
+        self.test_sound_button.setEnabled(enabled)
+        if enabled:
+            self.record_button.setText("Start Recording")
 
     def _on_play_clicked(self):
         print("\n=== Playing recorded audio ===")
@@ -359,12 +401,43 @@ class AudioControls(QWidget):
             self.play_button.setEnabled(True)
             self.record_button.setEnabled(True)
 
+    def _start_streaming_transcription(self, sample_rate: int):
+        """Begin an utterance if the STT provider transcribes while recording"""
+        self._streaming_stt = None
+        self._frames_streamed = 0
+        try:
+            speech_provider = ProviderRegistry.get_instance().get_provider(
+                SpeechToTextProvider
+            )
+        except KeyError:
+            return
+        if isinstance(speech_provider, StreamingSpeechToTextProvider):
+            print(">>> Streaming audio to STT provider while recording")
+            speech_provider.start_utterance(
+                sample_rate, on_transcript=self._on_streaming_transcript
+            )
+            self._streaming_stt = speech_provider
+
+    def _stream_new_frames(self):
+        """Send frames recorded since the last call to the streaming STT"""
+        if self._streaming_stt is None:
+            return
+        frames = self._provider._recorded_frames
+        for frame in frames[self._frames_streamed :]:
+            self._streaming_stt.send_audio(frame)
+        self._frames_streamed = len(frames)
+
+    def _on_streaming_transcript(self, text: str, is_final: bool):
+        # Called from the STT provider's thread; the signal is queued to the UI
+        self.interim_transcription.emit(text)
+
     def _update_audio_level(self):
         if not self._recording:
             return
 
         try:
             chunk = self._provider.read_chunk()
+            self._stream_new_frames()
             if not chunk:
                 return
 
@@ -10,15 +10,23 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, QTimer
 from core.interfaces.llm import LLMProvider
 from utils.registry import ProviderRegistry
+from modules.llm.memory import ConversationMemory
+from typing import Callable, Optional
+import asyncio
 
 
 class LLMControls(QWidget):
     model_changed = pyqtSignal(str)  # Emits model name when changed
-    response_ready = pyqtSignal(str)  # Emits response text
+    response_ready = pyqtSignal(str)  # Emits response text of every request
+    response_chunk = pyqtSignal(str)  # Emits each streamed piece of the response
 
     def __init__(self, parent=None):
         super().__init__(parent)
         print("\n=== Initializing LLM Controls ===")
+        # One request at a time; later messages wait their turn
+        self._request_lock = asyncio.Lock()
+        self._memory = None
+        self._memory_prompt = None  # System prompt the memory was built under
         self._setup_ui()
         # Delay model loading until window is fully initialized
         QTimer.singleShot(0, self._initialize_models)
@@ -35,6 +43,11 @@ class LLMControls(QWidget):
         model_layout.addWidget(self.model_combo, stretch=1)
         layout.addLayout(model_layout)
 
+        # Busy state and a preview of the response as it streams in
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #888;")
+        layout.addWidget(self.status_label)
+
         # System prompt
         self.system_prompt_edit = QTextEdit()
         self.system_prompt_edit.setPlaceholderText("Enter system prompt (optional)...")
@@ -48,6 +61,9 @@ class LLMControls(QWidget):
         if hasattr(window, "app"):
             print(">>> Found application instance")
             self._app = window.app
+            self._memory = ConversationMemory.from_config(
+                self._app.config.llm.memory, summarizer=self._summarize
+            )
             self._load_models()
         else:
             print("!!! Window not fully initialized, retrying in 100ms")
@@ -103,6 +119,7 @@ class LLMControls(QWidget):
 
             # Set the model
             provider.set_model(model_name)
+            self.reset_conversation()
             self.model_changed.emit(model_name)
 
             print(f"Switched to provider {provider_name} with model {model_name}")
@@ -113,15 +130,35 @@ class LLMControls(QWidget):
 
             traceback.print_exc()
 
-    def send_message(self, message: str):
-        """Send message to LLM and emit response"""
+    def reset_conversation(self):
+        """Forget the remembered turns and summary, e.g. for a new assistant"""
+        if self._memory:
+            print(">>> Clearing conversation memory")
+            self._memory.clear()
+        self._memory_prompt = None
+
+    def send_message(
+        self, message: str, on_response: Optional[Callable[[str], None]] = None
+    ):
+        """Send message to LLM and emit response
+
+        Returns immediately. The response streams in on the event loop,
+        emitting response_chunk per piece and response_ready when complete.
+        Requests queue behind one another and response_ready fires for each
+        of them, so callers that need the reply to this message should pass
+        on_response.
+
+        Args:
+            message: Message to send
+            on_response: Called with this request's response or error text
+        """
         try:
             # Get current provider and settings
             provider = self._get_current_provider()
             if not provider:
                 error_msg = "No LLM provider available"
                 print(f"!!! {error_msg}")
-                self.response_ready.emit(error_msg)
+                self._respond(error_msg, on_response)
                 return
 
             system_prompt = self.system_prompt_edit.toPlainText().strip()
@@ -130,28 +167,87 @@ class LLMControls(QWidget):
             if not message.strip():
                 error_msg = "Message cannot be empty"
                 print(f"!!! {error_msg}")
-                self.response_ready.emit(error_msg)
+                self._respond(error_msg, on_response)
                 return
 
-            try:
-                response = provider.generate_response(
-                    message, system_prompt=system_prompt
-                )
-                if response and response.strip():
-                    self.response_ready.emit(response)
-                else:
-                    error_msg = "Received empty response from LLM"
-                    print(f"!!! {error_msg}")
-                    self.response_ready.emit(error_msg)
-            except Exception as e:
-                error_msg = f"Error generating response: {str(e)}"
-                print(f"!!! {error_msg}")
-                self.response_ready.emit(error_msg)
+            asyncio.ensure_future(
+                self._generate(provider, message, system_prompt, on_response)
+            )
 
         except Exception as e:
             error_msg = f"Error in message handling: {str(e)}"
             print(f"!!! {error_msg}")
-            self.response_ready.emit(error_msg)
+            self._respond(error_msg, on_response)
+
+    def _respond(self, text: str, on_response: Optional[Callable[[str], None]]):
+        """Emit response_ready and hand the text to the request's own callback"""
+        self.response_ready.emit(text)
+        if on_response:
+            on_response(text)
+
+    async def _generate(
+        self,
+        provider: LLMProvider,
+        message: str,
+        system_prompt: str,
+        on_response: Optional[Callable[[str], None]] = None,
+    ):
+        """Stream a response on the event loop, keeping the UI responsive"""
+        async with self._request_lock:
+            self._set_busy(True)
+            parts = []
+            history = None
+            if self._memory:
+                # Turns and summary from another persona would leak into it
+                if system_prompt != self._memory_prompt:
+                    if self._memory_prompt is not None:
+                        self.reset_conversation()
+                    self._memory_prompt = system_prompt
+                history = self._memory.messages()
+                system_prompt = self._memory.system_prompt(system_prompt)
+            try:
+                async for delta in provider.generate_stream(
+                    message, system_prompt=system_prompt, history=history
+                ):
+                    parts.append(delta)
+                    self.response_chunk.emit(delta)
+                    self._show_preview("".join(parts))
+
+                response = "".join(parts)
+                if response.strip():
+                    if self._memory:
+                        self._memory.add_exchange(message, response)
+                    reply = response
+                else:
+                    reply = "Received empty response from LLM"
+                    print(f"!!! {reply}")
+            except Exception as e:
+                reply = f"Error generating response: {str(e)}"
+                print(f"!!! {reply}")
+            finally:
+                self._set_busy(False)
+        # Outside the lock, so a callback may send the next message right away
+        self._respond(reply, on_response)
+
+    async def _summarize(self, prompt: str) -> str:
+        """Answer a summary request with the current provider, off the Qt thread"""
+        provider = self._get_current_provider()
+        if not provider:
+            raise RuntimeError("No LLM provider available")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, provider.generate_response, prompt)
+
+    def _set_busy(self, busy: bool):
+        """Show that a request is in flight and hold model changes until done"""
+        self.model_combo.setEnabled(not busy)
+        self.status_label.setText("⏳ Thinking..." if busy else "")
+
+    def _show_preview(self, text: str):
+        """Show the tail of the partial response"""
+        preview = " ".join(text.split())
+        if len(preview) > 80:
+            preview = "..." + preview[-77:]
+        self.status_label.setText(f"✍️ {preview}")
 
     def _get_current_provider(self) -> LLMProvider:
         """Get the currently selected LLM provider"""
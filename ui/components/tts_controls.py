@@ -9,32 +9,41 @@ from PyQt6.QtWidgets import (
     QFileDialog,
 )
 from PyQt6.QtCore import pyqtSignal
-from core.interfaces.speech import TextToSpeechProvider
+from core.events import Event, EventBus, EventType
+from core.interfaces.audio import AudioInputProvider
+from core.interfaces.speech import AudioChunk, TextToSpeechProvider
 from utils.registry import ProviderRegistry
 from modules.speech.composite_tts_provider import CompositeTTSProvider
+from modules.speech.fillers import FillerLibrary
+from typing import Awaitable, Optional, Union
 import os
 import io
 import asyncio
 from qasync import asyncSlot
+import time
 import traceback
 
 
 # TODO: TTS Integration Status
 # - Basic UI and async handling is working
-# - F5-TTS provider is registered but not generating audio
-# - Need to verify F5-TTS CLI installation and dependencies
-# - May need to add progress indication during generation
 # - Consider adding volume control for TTS output
 # - Consider adding voice selection/management features
 
 
 class TTSControls(QWidget):
-    tts_generated = pyqtSignal(bytes)  # Emitted when TTS generates audio
-
-    def __init__(self, reference_dir: str = "reference_audio", parent=None):
+    tts_generated = pyqtSignal(bytes)  # Emitted with each piece of audio played
+
+    def __init__(
+        self,
+        reference_dir: str = "reference_audio",
+        parent=None,
+        fillers: Optional[FillerLibrary] = None,
+    ):
         super().__init__(parent)
         print("\n=== Initializing TTS Controls ===")
         self._reference_dir = reference_dir
+        self._fillers = fillers
+        self._current_tasks = set()  # Syntheses the Stop button cancels
         self._setup_ui()
         self._load_reference_files()
 
@@ -49,6 +58,14 @@ class TTSControls(QWidget):
             print(f">>> Available TTS providers: {available}")
             print(f">>> Active TTS provider: {active}")
 
+        EventBus.get_instance().subscribe(
+            EventType.SYNTHESIS_PROGRESS, self._on_synthesis_progress
+        )
+
+        # Have filler clips ready for the selected voice
+        self.ref_combo.currentIndexChanged.connect(self._prepare_fillers)
+        self._prepare_fillers()
+
         print(">>> TTS Controls initialized")
 
     def _get_provider(self) -> TextToSpeechProvider:
@@ -98,8 +115,14 @@ class TTSControls(QWidget):
         )
         # Connect directly to the async method - remove the wrapper
         self.generate_button.clicked.connect(self._on_generate_clicked)
+        self.stop_button = QPushButton("⏹ Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self._on_stop_clicked)
+        self.progress_label = QLabel("")
+        button_layout.addWidget(self.progress_label)
         button_layout.addStretch()
         button_layout.addWidget(self.generate_button)
+        button_layout.addWidget(self.stop_button)
 
         layout.addLayout(ref_layout)
         layout.addWidget(self.text_edit)
@@ -163,21 +186,32 @@ class TTSControls(QWidget):
             try:
                 # Generate audio
                 print(">>> Calling TTS provider synthesize method")
-                audio_data = await self._get_provider().synthesize(text, ref_audio)
-                print(">>> TTS generation completed, emitting result")
-                self.tts_generated.emit(audio_data)
+                await self._run_cancellable(
+                    self._synthesize_and_emit(self._get_provider(), text, ref_audio)
+                )
+                print(">>> TTS generation completed")
             finally:
                 # Re-enable controls
                 print(">>> Re-enabling controls")
                 self.generate_button.setEnabled(True)
                 self.text_edit.setEnabled(True)
 
+        except asyncio.CancelledError:
+            print(">>> TTS generation stopped")
         except Exception as e:
             print(f"!!! Error generating TTS: {e}")
             print(traceback.format_exc())
 
-    async def synthesize_text(self, text: str):
-        """Convert text to speech using the selected TTS provider"""
+    async def synthesize_text(self, text: str, stream: bool = False):
+        """Convert text to speech using the selected TTS provider
+
+        Args:
+            text: Text to speak
+            stream: Stream PCM from the provider as it is synthesized instead
+                of playing and emitting whole sentences
+
+        Returns once playback has finished.
+        """
         try:
             print(">>> Starting TTS synthesis")
             tts_provider = self._get_provider()
@@ -186,30 +220,167 @@ class TTSControls(QWidget):
                 print("!!! No TTS provider found")
                 return
 
-            # Get currently selected reference audio
-            ref_audio = self.ref_combo.currentData()
+            ref_audio = self._current_ref_audio()
             if not ref_audio:
-                print("!!! No reference audio selected, using first available")
-                # Try to use first available reference audio
-                if self.ref_combo.count() > 0:
-                    ref_audio = self.ref_combo.itemData(0)
-                else:
-                    print("!!! No reference audio files available")
-                    return
+                return
 
             print(f">>> Using reference audio: {ref_audio}")
 
-            # Generate audio data with reference audio
-            audio_data = await tts_provider.synthesize(text, ref_audio)
+            if stream:
+                await self._run_cancellable(
+                    self._synthesize_and_play(tts_provider, text, ref_audio)
+                )
+            else:
+                # Generate and emit audio data with reference audio
+                await self._run_cancellable(
+                    self._synthesize_and_emit(tts_provider, text, ref_audio)
+                )
+            print(">>> TTS synthesis complete")
+
+        except asyncio.CancelledError:
+            print(">>> TTS synthesis stopped")
+        except Exception as e:
+            print(f"!!! Error during TTS synthesis: {e}")
+            print(traceback.format_exc())
+
+    async def speak_reply(self, reply: Awaitable[str]):
+        """Speak a reply that is still being generated
 
-            # Emit the generated audio data
-            print(">>> TTS synthesis complete, emitting audio data")
-            self.tts_generated.emit(audio_data)
+        A filler clip for the current voice plays right away, if one is
+        ready, and cross-fades into the reply once its audio starts. Returns
+        once playback has finished.
+        """
+        try:
+            ref_audio = self._current_ref_audio()
+            if not ref_audio:
+                await reply  # Nothing to speak with; finish once the reply is in
+                return
 
+            filler = self._fillers.pick(ref_audio) if self._fillers else None
+            if filler:
+                print(">>> Playing filler while the reply is prepared")
+            await self._run_cancellable(
+                self._synthesize_and_play(
+                    self._get_provider(), reply, ref_audio, filler
+                )
+            )
+            print(">>> Reply speech complete")
+
+        except asyncio.CancelledError:
+            print(">>> Reply speech stopped")
         except Exception as e:
-            print(f"!!! Error during TTS synthesis: {e}")
+            print(f"!!! Error speaking reply: {e}")
             print(traceback.format_exc())
 
+    def _current_ref_audio(self) -> Optional[str]:
+        """Selected reference audio, or the first available one"""
+        ref_audio = self.ref_combo.currentData()
+        if not ref_audio:
+            print("!!! No reference audio selected, using first available")
+            # Try to use first available reference audio
+            if self.ref_combo.count() > 0:
+                ref_audio = self.ref_combo.itemData(0)
+            else:
+                print("!!! No reference audio files available")
+        return ref_audio
+
+    def _prepare_fillers(self, *args):
+        """Synthesize filler clips for the current voice in the background"""
+        if self._fillers and self.ref_combo.count() > 0:
+            self._fillers.prepare(self._current_ref_audio())
+
+    async def _synthesize_and_emit(
+        self, tts_provider: TextToSpeechProvider, text: str, ref_audio: str
+    ):
+        """Play and emit audio sentence by sentence when the provider supports it
+
+        Playback runs on the audio provider's worker thread, so later
+        sentences keep synthesizing while earlier ones play.
+        """
+        audio_provider = ProviderRegistry.get_instance().get_provider(
+            AudioInputProvider
+        )
+
+        async def sentences():
+            if isinstance(tts_provider, CompositeTTSProvider):
+                pieces = tts_provider.synthesize_chunked(text, ref_audio)
+            else:
+                pieces = self._single(tts_provider.synthesize(text, ref_audio))
+            async for audio_data in pieces:
+                self.tts_generated.emit(audio_data)
+                yield AudioChunk.from_wav(audio_data)
+
+        await audio_provider.play_stream(sentences())
+
+    @staticmethod
+    async def _single(audio: Awaitable[bytes]):
+        yield await audio
+
+    async def _synthesize_and_play(
+        self,
+        tts_provider: TextToSpeechProvider,
+        text: Union[str, Awaitable[str]],
+        ref_audio: str,
+        filler=None,
+    ):
+        """Play streamed synthesis on the audio provider as chunks arrive
+
+        text may still be pending, in which case the filler covers the wait.
+        """
+        audio_provider = ProviderRegistry.get_instance().get_provider(
+            AudioInputProvider
+        )
+        start = time.perf_counter()
+
+        async def reply_chunks():
+            reply_text = text if isinstance(text, str) else await text
+            first = True
+            async for chunk in tts_provider.synthesize_stream(reply_text, ref_audio):
+                if first:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f">>> First reply audio after {elapsed:.0f}ms")
+                    first = False
+                yield chunk
+
+        chunks = reply_chunks()
+        if filler:
+            chunks = self._fillers.lead_into(filler, chunks)
+        await audio_provider.play_stream(chunks)
+
+    async def _run_cancellable(self, coroutine):
+        """Run a synthesis as a task the Stop button can cancel
+
+        Syntheses may overlap, e.g. a reply spoken while a manual one runs;
+        Stop stays enabled until the last of them finishes.
+        """
+        task = asyncio.ensure_future(coroutine)
+        self._current_tasks.add(task)
+        self.stop_button.setEnabled(True)
+        try:
+            return await task
+        finally:
+            self._current_tasks.discard(task)
+            if not self._current_tasks:
+                self.stop_button.setEnabled(False)
+                self.progress_label.setText("")
+
+    def _on_stop_clicked(self):
+        """Cancel every running synthesis; providers stop their work too"""
+        running = [task for task in self._current_tasks if not task.done()]
+        if running:
+            print(f">>> Stopping {len(running)} TTS synthesis task(s)")
+            for task in running:
+                task.cancel()
+
+    def _on_synthesis_progress(self, event: Event):
+        """Show provider progress while a synthesis is running"""
+        if not self._current_tasks:
+            return
+        data = event.data or {}
+        self.progress_label.setText(
+            f"{data.get('provider', 'TTS')}: {data.get('percent', 0)}%"
+        )
+
     def _on_tts_clicked(self):
         """Handle TTS button click - can be used for manual TTS triggering"""
         # Implementation for manual TTS button if needed
@@ -222,5 +393,6 @@ class TTSControls(QWidget):
             if isinstance(provider, CompositeTTSProvider):
                 provider.set_active_provider(provider_name)
                 print(f">>> Switched to TTS provider: {provider_name}")
+                self._prepare_fillers()
         except Exception as e:
             print(f"!!! Error changing TTS provider: {e}")
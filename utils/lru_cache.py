@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """Small thread-safe in-memory LRU cache
+
+    Entries are evicted least-recently-used first once either the entry
+    count or the total size (as measured by ``sizeof``) exceeds its limit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = lambda value: 1,
+    ):
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: dict = {}
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._total_size = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_size -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._total_size += size
+
+            while self._entries and (
+                len(self._entries) > self._max_entries
+                or (self._max_bytes is not None and self._total_size > self._max_bytes)
+            ):
+                evicted, _ = self._entries.popitem(last=False)
+                self._total_size -= self._sizes.pop(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)